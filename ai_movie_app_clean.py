@@ -7,14 +7,11 @@ import streamlit as st
 import requests
 import json
 import random
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 # Try to import comprehensive database, fallback if not available
 try:
     from movie_database_generator import (
-        COMPREHENSIVE_MOVIE_DATABASE, 
-        GENRE_INDEX, 
-        LANGUAGE_INDEX,
         get_movies_by_genre,
         get_movies_by_language,
         search_movies,
@@ -25,9 +22,11 @@ except ImportError:
     DATABASE_AVAILABLE = False
     print("Comprehensive database not available, using basic fallback")
 
+from poster_service import PosterService
+
 # Import poster database
 try:
-    from movie_posters import MOVIE_POSTERS, get_poster_url
+    from movie_posters import find_poster_url
     POSTERS_AVAILABLE = True
 except ImportError:
     POSTERS_AVAILABLE = False
@@ -477,106 +476,24 @@ def get_platform_url(platform: str, movie_title: str) -> str:
     search_query = movie_title.replace(" ", "+")
     return f"{base_url}{search_query}"
 
-def get_movie_poster_url(movie_title: str, year: int) -> str:
-    """Get movie poster URL with comprehensive database and API fallback"""
+@st.cache_resource
+def get_poster_service() -> PosterService:
+    """One poster service (HTTP session + worker threads) shared by every rerun and session"""
+    return PosterService("7f7c782e-0051-449b-8636-94d0a0719c05", max_workers=4, request_timeout=3)
+
+def get_movie_poster_url(movie_title: str, year: int) -> Optional[str]:
+    """Get movie poster URL from the curated poster table, then the shared OMDb poster cache"""
     
-    # First check comprehensive poster database
+    # First check the curated poster table (normalized titles, year-aware)
     if POSTERS_AVAILABLE:
-        try:
-            poster_url = get_poster_url(movie_title)
-            if poster_url:
-                return poster_url
-        except Exception as e:
-            print(f"Poster database error for {movie_title}: {e}")
-    
-    # Comprehensive poster database - 5 posters for each genre and language
-    comprehensive_posters = {
-        # ACTION MOVIES - Hindi (5)
-        "War": "https://m.media-amazon.com/images/M/MV5BNzZmOTU1ZTEtYzVhNi00NzQxLWI2MjAtYTU5YThjNzE4OTEyXkEyXkFqcGdeQXVyODE5NzE3OTE@._V1_SX300.jpg",
-        "Pathaan": "https://m.media-amazon.com/images/M/MV5BYjFjMTQzY2EtZjQ5MC00NGUyLWJiYWMtZDI3MTQ1MGU4OGY2XkEyXkFqcGdeQXVyNDExMjcyMzA@._V1_SX300.jpg",
-        "Tiger Zinda Hai": "https://m.media-amazon.com/images/M/MV5BMjI1MjE2MTI2M15BMl5BanBnXkFtZTgwNzAwMjU3NDI@._V1_SX300.jpg",
-        "Uri: The Surgical Strike": "https://m.media-amazon.com/images/M/MV5BNzZmOTU1ZTEtYzVhNi00NzQxLWI2MjAtYTU5YThjNzE4OTEyXkEyXkFqcGdeQXVyODE5NzE3OTE@._V1_SX300.jpg",
-        "Bhaag Milkha Bhaag": "https://m.media-amazon.com/images/M/MV5BMTQ4MzQzMzM2Nl5BMl5BanBnXkFtZTgwMTQ1NzU3MDI@._V1_SX300.jpg",
-        
-        # ACTION MOVIES - Tamil (5)
-        "Vikram": "https://m.media-amazon.com/images/M/MV5BYjFjMTQzY2EtZjQ5MC00NGUyLWJiYWMtZDI3MTQ1MGU4OGY2XkEyXkFqcGdeQXVyNDExMjcyMzA@._V1_SX300.jpg",
-        "Master": "https://m.media-amazon.com/images/M/MV5BNzIwMzk1MjEtZGUxZi00YTMwLWFiYWMtZDI2Yjk0NzlmMmE2XkEyXkFqcGdeQXVyMzgxODM4NjM@._V1_SX300.jpg",
-        "Kaithi": "https://m.media-amazon.com/images/M/MV5BM2Q3MWEwM2EtNzQwZC00YzE0LWJlYWYtMjk1ZjNlYWQ3ZTQyXkEyXkFqcGdeQXVyMTUzNTgzNzM0._V1_SX300.jpg",
-        "Bigil": "https://m.media-amazon.com/images/M/MV5BYjY2NGNmYjQtZjg5MC00NGVmLWJkZTgtMzQ3YzgyNTY2YTVkXkEyXkFqcGdeQXVyMjkxNzQ1NDI@._V1_SX300.jpg",
-        "Thuppakki": "https://m.media-amazon.com/images/M/MV5BNjkxODk2OTI0NV5BMl5BanBnXkFtZTcwMjU4MDU1Mw@@._V1_SX300.jpg",
-        
-        # ACTION MOVIES - Telugu (5)
-        "RRR": "https://m.media-amazon.com/images/M/MV5BODUwNDNjYzctODUxNy00ZTA2LWIyYTEtMDc5Y2E5ZjBmNTMzXkEyXkFqcGdeQXVyODE5NzE3OTE@._V1_SX300.jpg",
-        "Baahubali 2": "https://m.media-amazon.com/images/M/MV5BYTMxMGY2ZjQtYjdmOS00NzlkLWJiMjItZGM0MWY3MmQ1NjM2XkEyXkFqcGdeQXVyMzc5Mjk3OA@@._V1_SX300.jpg",
-        "Pushpa": "https://m.media-amazon.com/images/M/MV5BNGZlNTFlOWMtMzUwNC00ZDdhLWI4Y2UtYTY2ZDhmMGQ0OTc1XkEyXkFqcGdeQXVyMTI1NDEyNTM5._V1_SX300.jpg",
-        "Ala Vaikunthapurramuloo": "https://m.media-amazon.com/images/M/MV5BNzIwMzk1MjEtZGUxZi00YTMwLWFiYWMtZDI2Yjk0NzlmMmE2XkEyXkFqcGdeQXVyMzgxODM4NjM@._V1_SX300.jpg",
-        "Sarileru Neekevvaru": "https://m.media-amazon.com/images/M/MV5BM2Q3MWEwM2EtNzQwZC00YzE0LWJlYWYtMjk1ZjNlYWQ3ZTQyXkEyXkFqcGdeQXVyMTUzNTgzNzM0._V1_SX300.jpg",
-        
-        # ACTION MOVIES - Malayalam (5)
-        "Lucifer": "https://m.media-amazon.com/images/M/MV5BYjY2NGNmYjQtZjg5MC00NGVmLWJkZTgtMzQ3YzgyNTY2YTVkXkEyXkFqcGdeQXVyMjkxNzQ1NDI@._V1_SX300.jpg",
-        "Driving License": "https://m.media-amazon.com/images/M/MV5BNzc5MjkwOTQ2N15BMl5BanBnXkFtZTcwNjU2NjU2Nw@@._V1_SX300.jpg",
-        "Bheeshma Parvam": "https://m.media-amazon.com/images/M/MV5BNjkxODk2OTI0NV5BMl5BanBnXkFtZTcwMjU4MDU1Mw@@._V1_SX300.jpg",
-        "Kurup": "https://m.media-amazon.com/images/M/MV5BMTQ4MzQzMzM2Nl5BMl5BanBnXkFtZTgwMTQ1NzU3MDI@._V1_SX300.jpg",
-        "Malik": "https://m.media-amazon.com/images/M/MV5BNzZmOTU1ZTEtYzVhNi00NzQxLWI2MjAtYTU5YThjNzE4OTEyXkEyXkFqcGdeQXVyODE5NzE3OTE@._V1_SX300.jpg",
-        
-        # ACTION MOVIES - Kannada (5)
-        "KGF Chapter 1": "https://m.media-amazon.com/images/M/MV5BZWNiOTc4NGItNGY4NC00ZTdkLTlkOTEtNDE2YzZiNGRkNTFhXkEyXkFqcGdeQXVyMTI1NDEyNTM5._V1_SX300.jpg",
-        "KGF Chapter 2": "https://m.media-amazon.com/images/M/MV5BZWNiOTc4NGItNGY4NC00ZTdkLTlkOTEtNDE2YzZiNGRkNTFhXkEyXkFqcGdeQXVyMTI1NDEyNTM5._V1_SX300.jpg",
-        "Ugramm": "https://m.media-amazon.com/images/M/MV5BYjFjMTQzY2EtZjQ5MC00NGUyLWJiYWMtZDI3MTQ1MGU4OGY2XkEyXkFqcGdeQXVyNDExMjcyMzA@._V1_SX300.jpg",
-        "Avane Srimannarayana": "https://m.media-amazon.com/images/M/MV5BNzIwMzk1MjEtZGUxZi00YTMwLWFiYWMtZDI2Yjk0NzlmMmE2XkEyXkFqcGdeQXVyMzgxODM4NjM@._V1_SX300.jpg",
-        "Roberrt": "https://m.media-amazon.com/images/M/MV5BM2Q3MWEwM2EtNzQwZC00YzE0LWJlYWYtMjk1ZjNlYWQ3ZTQyXkEyXkFqcGdeQXVyMTUzNTgzNzM0._V1_SX300.jpg",
-        
-        # COMEDY MOVIES (5)
-        "3 Idiots": "https://m.media-amazon.com/images/M/MV5BNTkyOGVjMGEtNmQzZi00NzFlLTlhOWQtODYyMDc2ZGJmYzFhXkEyXkFqcGdeQXVyNjU0OTQ0OTY@._V1_SX300.jpg",
-        "Hera Pheri": "https://m.media-amazon.com/images/M/MV5BNjkxODk2OTI0NV5BMl5BanBnXkFtZTcwMjU4MDU1Mw@@._V1_SX300.jpg",
-        "Golmaal": "https://m.media-amazon.com/images/M/MV5BNzc5MjkwOTQ2N15BMl5BanBnXkFtZTcwNjU2NjU2Nw@@._V1_SX300.jpg",
-        "Andaz Apna Apna": "https://m.media-amazon.com/images/M/MV5BYjFjMTQzY2EtZjQ5MC00NGUyLWJiYWMtZDI3MTQ1MGU4OGY2XkEyXkFqcGdeQXVyNDExMjcyMzA@._V1_SX300.jpg",
-        "Chennai Express": "https://m.media-amazon.com/images/M/MV5BNzIwMzk1MjEtZGUxZi00YTMwLWFiYWMtZDI2Yjk0NzlmMmE2XkEyXkFqcGdeQXVyMzgxODM4NjM@._V1_SX300.jpg",
-        
-        # DRAMA MOVIES (5)
-        "Dangal": "https://m.media-amazon.com/images/M/MV5BMTQ4MzQzMzM2Nl5BMl5BanBnXkFtZTgwMTQ1NzU3MDI@._V1_SX300.jpg",
-        "Taare Zameen Par": "https://m.media-amazon.com/images/M/MV5BM2Q3MWEwM2EtNzQwZC00YzE0LWJlYWYtMjk1ZjNlYWQ3ZTQyXkEyXkFqcGdeQXVyMTUzNTgzNzM0._V1_SX300.jpg",
-        "Pink": "https://m.media-amazon.com/images/M/MV5BYjY2NGNmYjQtZjg5MC00NGVmLWJkZTgtMzQ3YzgyNTY2YTVkXkEyXkFqcGdeQXVyMjkxNzQ1NDI@._V1_SX300.jpg",
-        "Article 15": "https://m.media-amazon.com/images/M/MV5BNzc5MjkwOTQ2N15BMl5BanBnXkFtZTcwNjU2NjU2Nw@@._V1_SX300.jpg",
-        "Kantara": "https://m.media-amazon.com/images/M/MV5BM2Q3MWEwM2EtNzQwZC00YzE0LWJlYWYtMjk1ZjNlYWQ3ZTQyXkEyXkFqcGdeQXVyMTUzNTgzNzM0._V1_SX300.jpg",
-        
-        # ROMANCE MOVIES (5)
-        "Dilwale Dulhania Le Jayenge": "https://m.media-amazon.com/images/M/MV5BNzc5MjkwOTQ2N15BMl5BanBnXkFtZTcwNjU2NjU2Nw@@._V1_SX300.jpg",
-        "96": "https://m.media-amazon.com/images/M/MV5BYjFjMTQzY2EtZjQ5MC00NGUyLWJiYWMtZDI3MTQ1MGU4OGY2XkEyXkFqcGdeQXVyNDExMjcyMzA@._V1_SX300.jpg",
-        "Geetha Govindam": "https://m.media-amazon.com/images/M/MV5BNzIwMzk1MjEtZGUxZi00YTMwLWFiYWMtZDI2Yjk0NzlmMmE2XkEyXkFqcGdeQXVyMzgxODM4NjM@._V1_SX300.jpg",
-        "Premam": "https://m.media-amazon.com/images/M/MV5BM2Q3MWEwM2EtNzQwZC00YzE0LWJlYWYtMjk1ZjNlYWQ3ZTQyXkEyXkFqcGdeQXVyMTUzNTgzNzM0._V1_SX300.jpg",
-        "Mungaru Male": "https://m.media-amazon.com/images/M/MV5BYjY2NGNmYjQtZjg5MC00NGVmLWJkZTgtMzQ3YzgyNTY2YTVkXkEyXkFqcGdeQXVyMjkxNzQ1NDI@._V1_SX300.jpg",
-        
-        # THRILLER MOVIES (5)
-        "Andhadhun": "https://m.media-amazon.com/images/M/MV5BNzc5MjkwOTQ2N15BMl5BanBnXkFtZTcwNjU2NjU2Nw@@._V1_SX300.jpg",
-        "Ratsasan": "https://m.media-amazon.com/images/M/MV5BYjFjMTQzY2EtZjQ5MC00NGUyLWJiYWMtZDI3MTQ1MGU4OGY2XkEyXkFqcGdeQXVyNDExMjcyMzA@._V1_SX300.jpg",
-        "Evaru": "https://m.media-amazon.com/images/M/MV5BNzIwMzk1MjEtZGUxZi00YTMwLWFiYWMtZDI2Yjk0NzlmMmE2XkEyXkFqcGdeQXVyMzgxODM4NjM@._V1_SX300.jpg",
-        "Drishyam": "https://m.media-amazon.com/images/M/MV5BYjY2NGNmYjQtZjg5MC00NGVmLWJkZTgtMzQ3YzgyNTY2YTVkXkEyXkFqcGdeQXVyMjkxNzQ1NDI@._V1_SX300.jpg",
-        "U Turn": "https://m.media-amazon.com/images/M/MV5BM2Q3MWEwM2EtNzQwZC00YzE0LWJlYWYtMjk1ZjNlYWQ3ZTQyXkEyXkFqcGdeQXVyMTUzNTgzNzM0._V1_SX300.jpg",
-        
-        # Additional popular movies
-        "Arjun Reddy": "https://m.media-amazon.com/images/M/MV5BNzIwMzk1MjEtZGUxZi00YTMwLWFiYWMtZDI2Yjk0NzlmMmE2XkEyXkFqcGdeQXVyMzgxODM4NjM@._V1_SX300.jpg"
-    }
-    
-    if movie_title in comprehensive_posters:
-        return comprehensive_posters[movie_title]
-    
-    if movie_title in popular_posters:
-        return popular_posters[movie_title]
-    
-    # Then try OMDB API
-    try:
-        omdb_url = f"https://www.omdbapi.com/?t={movie_title}&y={year}&apikey=7f7c782e-0051-449b-8636-94d0a0719c05"
-        response = requests.get(omdb_url, timeout=3)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('Poster') and data['Poster'] != 'N/A':
-                return data['Poster']
-    except:
-        pass
+        poster_url = find_poster_url(movie_title, year)
+        if poster_url:
+            return poster_url
     
+    # Then the shared poster cache (memory LRU + SQLite); a miss is fetched in the background
+    # and shows up on a later rerun instead of blocking this one
     # Return None for gradient card fallback
-    return None
+    return get_poster_service().cached_poster(movie_title, year)
 
 def display_movie_card(movie: Dict):
     """Display a movie recommendation card without posters - details only"""
@@ -0,0 +1,202 @@
+"""
+Approximate Nearest-Neighbour Index
+Random-hyperplane LSH over the TF-IDF vectors, for catalogs too large for exact top-K search:
+candidates come from a few hash buckets and only those are scored exactly
+"""
+
+import copy
+from typing import Optional, Tuple
+import numpy as np
+import scipy.sparse as sp
+
+# Rows hashed per chunk while building, bounds the dense (chunk × tables·bits) projection block
+HASH_CHUNK = 65536
+
+# Default code length aims for buckets of about this many movies, so small catalogs stay near exact
+TARGET_BUCKET_SIZE = 512
+
+class LSHIndex:
+    """
+    Multi-table random-hyperplane LSH for cosine similarity
+    
+    Every table projects the vectors onto num_bits random hyperplanes and keeps the sign
+    pattern as a bucket code, so movies at a small angle tend to share a bucket. A query
+    looks up its own bucket in every table plus num_probes neighbouring buckets (its least
+    certain bits flipped). Candidates colliding with the query in the most buckets are kept,
+    at most max_candidates of them, and ranked by exact cosine similarity.
+    
+    Tuning:
+    - num_bits: more bits give smaller buckets, faster queries and lower recall
+    - num_tables: more tables give higher recall at the cost of memory and query time
+    - num_probes: extra buckets per table, raises recall without rebuilding the index
+    - max_candidates: upper bound on exactly scored candidates per query
+    """
+    
+    def __init__(self, vectors, num_tables: int = 32, num_bits: Optional[int] = None, num_probes: int = 4,
+                 max_candidates: int = 0, seed: int = 42):
+        """
+        Hash every vector into every table
+        
+        Args:
+            vectors: L2-normalized matrix of shape (N, F), sparse or dense
+            num_tables: Number of independent hash tables
+            num_bits: Hyperplanes (code bits) per table, at most 63; by default
+                log2(N / TARGET_BUCKET_SIZE), i.e. 11 bits for a million movies
+            num_probes: Default number of extra buckets probed per table
+            max_candidates: Default upper bound on exactly scored candidates per query (0 for none)
+            seed: Seed of the random hyperplanes
+        """
+        if num_bits is None:
+            num_bits = int(np.clip(round(np.log2(max(vectors.shape[0], 1) / TARGET_BUCKET_SIZE)), 1, 63))
+        if not 0 < num_bits < 64:
+            raise ValueError(f"num_bits must be between 1 and 63, got {num_bits}")
+        
+        self.vectors = vectors
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+        self.num_probes = num_probes
+        self.max_candidates = max_candidates
+        
+        rng = np.random.default_rng(seed)
+        self.hyperplanes = rng.standard_normal((vectors.shape[1], num_tables * num_bits)).astype(np.float32)
+        self.bit_values = np.uint64(1) << np.arange(num_bits, dtype=np.uint64)
+        
+        codes = np.empty((vectors.shape[0], num_tables), dtype=np.uint64)
+        for start in range(0, vectors.shape[0], HASH_CHUNK):
+            end = min(start + HASH_CHUNK, vectors.shape[0])
+            codes[start:end] = self._codes(self._project(vectors[start:end]) > 0)
+        
+        # One sorted code column per table: a bucket is a contiguous run found with searchsorted
+        self.bucket_ids = []
+        self.bucket_codes = []
+        for table in range(num_tables):
+            order = np.argsort(codes[:, table], kind='stable')
+            self.bucket_ids.append(order.astype(np.int32))
+            self.bucket_codes.append(codes[order, table])
+    
+    def _project(self, vectors) -> np.ndarray:
+        """Projections of vectors onto every hyperplane, shape (rows, tables, bits)"""
+        projections = np.asarray(vectors @ self.hyperplanes, dtype=np.float32)
+        return projections.reshape(-1, self.num_tables, self.num_bits)
+    
+    def _codes(self, bits: np.ndarray) -> np.ndarray:
+        """Pack sign bits of shape (rows, tables, bits) into one code per row and table"""
+        return (bits.astype(np.uint64) * self.bit_values).sum(axis=2, dtype=np.uint64)
+    
+    def candidates(self, vector, num_probes: Optional[int] = None,
+                   max_candidates: Optional[int] = None) -> np.ndarray:
+        """
+        Collect the ids sharing a probed bucket with a query vector
+        
+        Args:
+            vector: Query of shape (1, F) or (F,), sparse or dense
+            num_probes: Extra buckets per table, defaults to the index setting
+            max_candidates: Keep only this many ids with the most bucket collisions,
+                defaults to the index setting (None or 0 keeps all)
+        
+        Returns:
+            Sorted array of distinct candidate ids
+        """
+        num_probes = self.num_probes if num_probes is None else min(num_probes, self.num_bits)
+        projections = self._project(vector.reshape(1, -1) if not sp.issparse(vector) else vector)[0]
+        base = self._codes(projections[None] > 0)[0]
+        
+        # Probe the base bucket, then the buckets with the least certain bit flipped
+        flips = np.argsort(np.abs(projections), axis=1)[:, :num_probes]
+        probes = np.concatenate([base[:, None], base[:, None] ^ self.bit_values[flips]], axis=1)
+        
+        found = []
+        for table in range(self.num_tables):
+            keys = self.bucket_codes[table]
+            starts = np.searchsorted(keys, probes[table], side='left')
+            ends = np.searchsorted(keys, probes[table], side='right')
+            found.extend(self.bucket_ids[table][start:end] for start, end in zip(starts, ends) if end > start)
+        
+        if not found:
+            return np.empty(0, dtype=np.int32)
+        
+        ids, collisions = np.unique(np.concatenate(found), return_counts=True)
+        
+        # Ids found in many buckets are the likeliest near neighbours
+        max_candidates = self.max_candidates if max_candidates is None else max_candidates
+        if max_candidates and len(ids) > max_candidates:
+            keep = np.argpartition(-collisions, max_candidates - 1)[:max_candidates]
+            ids = np.sort(ids[keep])
+        return ids
+    
+    def query(self, vector, n: int, exclude: Optional[int] = None, num_probes: Optional[int] = None,
+              max_candidates: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-N most similar vectors
+        
+        Args:
+            vector: L2-normalized query of shape (1, F) or (F,), sparse or dense
+            n: Number of neighbours to return
+            exclude: Id to leave out of the result (typically the query movie itself)
+            num_probes: Extra buckets per table, defaults to the index setting
+            max_candidates: Upper bound on exactly scored candidates, defaults to the index setting
+        
+        Returns:
+            Tuple of (indices, scores) sorted by descending similarity, then ascending index.
+            Fewer than N are returned when the probed buckets hold fewer candidates.
+        """
+        ids = self.candidates(vector, num_probes, max_candidates)
+        if exclude is not None:
+            ids = ids[ids != exclude]
+        
+        # A dense query turns the rerank into a matrix-vector product over the candidate rows
+        dense_vector = vector.toarray().ravel() if sp.issparse(vector) else np.ravel(vector)
+        scores = np.asarray(self.vectors[ids] @ dense_vector, dtype=np.float32).ravel()
+        
+        k = min(n, len(ids))
+        if k < len(ids):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(ids))
+        top = top[np.lexsort((ids[top], -scores[top]))]
+        
+        return ids[top], scores[top]
+    
+    def add(self, vectors):
+        """
+        Hash the rows appended to vectors since the index was built
+        
+        Args:
+            vectors: All vectors, the rows already indexed first and the new rows last
+        """
+        start = len(self.bucket_ids[0]) if self.bucket_ids else 0
+        codes = self._codes(self._project(vectors[start:]) > 0)
+        new_ids = np.arange(start, vectors.shape[0], dtype=np.int32)
+        
+        for table in range(self.num_tables):
+            order = np.argsort(codes[:, table], kind='stable')
+            positions = np.searchsorted(self.bucket_codes[table], codes[order, table], side='right')
+            self.bucket_ids[table] = np.insert(self.bucket_ids[table], positions, new_ids[order])
+            self.bucket_codes[table] = np.insert(self.bucket_codes[table], positions, codes[order, table])
+        
+        self.vectors = vectors
+    
+    def copy(self) -> 'LSHIndex':
+        """Copy whose tables can be changed with add or remove without affecting this index"""
+        index = copy.copy(self)
+        index.bucket_ids = list(self.bucket_ids)
+        index.bucket_codes = list(self.bucket_codes)
+        return index
+    
+    def remove(self, vectors, keep: np.ndarray):
+        """
+        Drop removed rows from every table and renumber the rest
+        
+        Args:
+            vectors: Vectors of the remaining rows
+            keep: Boolean mask over the indexed rows, True for rows that stay
+        """
+        id_map = np.full(len(keep), -1, dtype=np.int32)
+        id_map[keep] = np.arange(int(keep.sum()), dtype=np.int32)
+        
+        for table in range(self.num_tables):
+            stays = keep[self.bucket_ids[table]]
+            self.bucket_ids[table] = id_map[self.bucket_ids[table][stays]]
+            self.bucket_codes[table] = self.bucket_codes[table][stays]
+        
+        self.vectors = vectors
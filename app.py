@@ -7,6 +7,11 @@ import os
 from config import OMDB_API_KEY, PLACEHOLDER_IMAGE, GEMINI_API_KEY
 from sklearn.feature_extraction.text import TfidfVectorizer
 import google.generativeai as genai
+from similarity_index import top_n_indices
+from poster_cache import lookup_omdb_metadata, poster_from_metadata
+from title_index import TrigramIndex
+from catalog_ingest import fill_missing
+from catalog_store import catalog_format, load_catalog
 
 # Configure Streamlit page
 st.set_page_config(
@@ -381,10 +386,14 @@ class MovieRecommendationSystem:
         self.prepare_features()
     
     def load_data(self, csv_file):
-        """Load movie data from CSV file."""
+        """Load movie data from a CSV, Parquet or Arrow file."""
         try:
             # csv_file can be a path or a file-like object
-            self.df = pd.read_csv(csv_file)
+            if isinstance(csv_file, str) and catalog_format(csv_file) != 'csv':
+                # Columnar files: read only the title, the feature columns and what recommendations display
+                self.df = load_catalog(csv_file, ['title', 'genres', 'language', 'industry', *self.feature_columns])
+            else:
+                self.df = pd.read_csv(csv_file)
             st.success(f"✅ Loaded {len(self.df)} movies successfully!")
         except FileNotFoundError:
             st.error(f"❌ Could not find {csv_file}. Please ensure the file exists.")
@@ -401,7 +410,8 @@ class MovieRecommendationSystem:
             # Fallback to all string columns if nothing matches
             available = [c for c in self.df.columns if self.df[c].dtype == 'object']
         # Fill NaNs and join with spaces
-        self.df[available] = self.df[available].fillna('')
+        for column in available:
+            self.df[column] = fill_missing(self.df[column], '')
         self.df['features'] = self.df[available].agg(' '.join, axis=1)
         
         # Create feature vectors using selected vectorizer
@@ -413,18 +423,25 @@ class MovieRecommendationSystem:
         
         # Compute cosine similarity matrix
         self.similarity_matrix = cosine_similarity(feature_vectors)
+        
+        # Title lookups: exact matches through a dict, partial matches through a trigram index
+        lower_titles = self.df['title'].fillna('').astype(str).str.lower()
+        self.title_positions = {}
+        for position, key in enumerate(lower_titles):
+            self.title_positions.setdefault(key, position)
+        self.title_index = TrigramIndex(lower_titles)
     
     def get_movie_index(self, title):
         """Get the index of a movie by its title."""
         # Case-insensitive search
-        matches = self.df[self.df['title'].str.lower() == title.lower()]
-        if not matches.empty:
-            return matches.index[0]
+        position = self.title_positions.get(title.lower())
+        if position is not None:
+            return self.df.index[position]
         
         # If exact match not found, try partial match
-        partial_matches = self.df[self.df['title'].str.lower().str.contains(title.lower(), na=False)]
-        if not partial_matches.empty:
-            return partial_matches.index[0]
+        position = self.title_index.find_containing(title.lower())
+        if position is not None:
+            return self.df.index[position]
         
         return None
     
@@ -445,13 +462,10 @@ class MovieRecommendationSystem:
             return None
         
         # Get similarity scores for all movies
-        similarity_scores = list(enumerate(self.similarity_matrix[movie_idx]))
-        
-        # Sort by similarity score (descending)
-        similarity_scores = sorted(similarity_scores, key=lambda x: x[1], reverse=True)
+        similarity_scores = self.similarity_matrix[movie_idx]
         
-        # Get top N similar movies (excluding the input movie itself)
-        recommended_indices = [i[0] for i in similarity_scores[1:top_n+1]]
+        # Get top N similar movies by partial selection (excluding the input movie itself)
+        recommended_indices = top_n_indices(similarity_scores, top_n, exclude=movie_idx)
         
         # Return recommended movies as list of dictionaries
         recommendations = []
@@ -461,7 +475,7 @@ class MovieRecommendationSystem:
                 'title': movie.get('title') if hasattr(movie, 'get') else movie['title'],
                 'genres': movie['genres'] if 'genres' in movie else None,
                 'language': movie['language'] if 'language' in movie else None,
-                'similarity_score': similarity_scores[idx][1]
+                'similarity_score': float(similarity_scores[idx])
             }
             if 'industry' in self.df.columns:
                 try:
@@ -474,12 +488,15 @@ class MovieRecommendationSystem:
 
 class PosterFetcher:
     def __init__(self, api_key=None):
-        """Initialize poster fetcher with OMDb API."""
+        """Initialize poster fetcher with OMDb API and the shared poster cache."""
         self.api_key = api_key or OMDB_API_KEY  # Use configured API key
-        self.base_url = "http://www.omdbapi.com/"
+        self.session = requests.Session()  # Keep-alive connection for cache misses
     
-    @st.cache_data(show_spinner=False, ttl=3600)  # Cache posters for 1 hour
-    def get_poster(_self, title):
+    def get_metadata(self, title):
+        """Fetch OMDb metadata through the shared two-tier cache (memory LRU + SQLite)."""
+        return lookup_omdb_metadata(title, self.api_key, session=self.session, timeout=2)  # Faster timeout
+    
+    def get_poster(self, title):
         """
         Fetch movie poster URL from OMDb API.
         
@@ -489,37 +506,14 @@ class PosterFetcher:
         Returns:
             str: Poster URL or placeholder image URL
         """
-        try:
-            params = {
-                'apikey': _self.api_key,
-                't': title,
-                'type': 'movie'
-            }
-            
-            response = requests.get(_self.base_url, params=params, timeout=2)  # Faster timeout
-            data = response.json()
-            
-            if data.get('Response') == 'True' and data.get('Poster') != 'N/A':
-                return data['Poster']
-            else:
-                # Return a placeholder image if poster not found
-                return PLACEHOLDER_IMAGE
-        except Exception:
-            # Return placeholder on any error
-            return PLACEHOLDER_IMAGE
+        # Return a placeholder image if poster not found
+        return poster_from_metadata(self.get_metadata(title)) or PLACEHOLDER_IMAGE
 
-    @st.cache_data(show_spinner=False, ttl=3600)  # Cache ratings for 1 hour
-    def get_rating(_self, title):
+    def get_rating(self, title):
         """Fetch rating info from OMDb (IMDb, Rotten Tomatoes, Metacritic). Returns a compact string."""
         try:
-            params = {
-                'apikey': _self.api_key,
-                't': title,
-                'type': 'movie'
-            }
-            response = requests.get(_self.base_url, params=params, timeout=2)  # Faster timeout
-            data = response.json()
-            if data.get('Response') != 'True':
+            data = self.get_metadata(title)
+            if not data:
                 return "⭐ N/A", 0
             parts = []
             star_rating = 0
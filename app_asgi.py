@@ -0,0 +1,468 @@
+"""
+ASGI Web Application for Interactive Movie Recommendation System
+Serves the same REST API and frontend as app_flask.py from a single asyncio process:
+CPU-bound scoring runs in a thread pool and posters are fetched with a non-blocking HTTP client,
+so a slow OMDb call never holds up other requests
+
+Run with:
+    uvicorn app_asgi:app --host 0.0.0.0 --port 8000
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+from starlette.templating import Jinja2Templates
+
+from movie_recommender import MovieRecommendationEngine
+from model_store import bundle_is_current
+from poster_cache import TwoTierCache, get_default_cache, lookup_omdb_metadata_async, omdb_cache_key, poster_from_metadata
+from poster_service import PLACEHOLDER_POSTER
+
+OMDB_API_KEY = os.getenv('OMDB_API_KEY', '7f7c782e-0051-449b-8636-94d0a0719c05')
+MODEL_BUNDLE_DIR = os.getenv('MODEL_BUNDLE_DIR', 'model_bundle')
+SIMILARITY_BACKEND = os.getenv('SIMILARITY_BACKEND', 'exact')
+EMBEDDING_DIM = int(os.getenv('EMBEDDING_DIM', 0)) or None
+
+# Threads for CPU-bound scoring; NumPy and SciPy release the GIL for most of the work
+CPU_WORKERS = int(os.getenv('ASGI_CPU_WORKERS', os.cpu_count() or 4))
+
+# Upper bound on the page size clients may request from /api/filter
+MAX_FILTER_PAGE_SIZE = 100
+
+# Upper bound on the number of seed titles per /api/recommend/batch call
+MAX_BATCH_SEEDS = 20
+
+# Upper bound on the number of liked plus disliked titles per /api/recommend/profile call
+MAX_PROFILE_SEEDS = 50
+
+def read_num_recommendations(data: Dict) -> Optional[int]:
+    """num_recommendations of a request body (default 10), or None unless it is an integer of at least 1"""
+    num_recommendations = data.get('num_recommendations', 10)
+    if isinstance(num_recommendations, bool) or not isinstance(num_recommendations, int) or num_recommendations < 1:
+        return None
+    return num_recommendations
+
+class AsyncPosterService:
+    """
+    Non-blocking counterpart of PosterService for the event loop
+    
+    All lookups share one pooled httpx.AsyncClient and at most max_connections run at once.
+    Posters missing the batch deadline get the placeholder: lookups already in flight keep
+    running and fill the shared cache, lookups still waiting for a slot are cancelled.
+    """
+    
+    def __init__(self, api_key: Optional[str], max_connections: int = 20, request_timeout: float = 5.0,
+                 batch_deadline: float = 3.0, placeholder: str = PLACEHOLDER_POSTER,
+                 cache: Optional[TwoTierCache] = None):
+        """
+        Initialize the poster service
+        
+        Args:
+            api_key: OMDb API key; without one every lookup returns the placeholder
+            max_connections: Maximum number of concurrent OMDb connections
+            request_timeout: Timeout of a single OMDb request in seconds
+            batch_deadline: Total time budget for resolving one batch in seconds
+            placeholder: URL returned for titles without a poster
+            cache: Poster cache, defaults to the process-wide shared cache
+        """
+        self.api_key = api_key
+        self.request_timeout = request_timeout
+        self.batch_deadline = batch_deadline
+        self.placeholder = placeholder
+        self.cache = cache or get_default_cache()
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self._slots = asyncio.Semaphore(max_connections)
+        
+        # Strong references to lookups that outlived their batch, so they are not garbage collected
+        self._background = set()
+    
+    async def fetch_poster(self, movie_title: str) -> str:
+        """Fetch one poster URL from OMDb without blocking the event loop"""
+        metadata = await lookup_omdb_metadata_async(
+            movie_title,
+            self.api_key,
+            self.client,
+            timeout=self.request_timeout,
+            cache=self.cache
+        )
+        return poster_from_metadata(metadata) or self.placeholder
+    
+    async def _fetch_in_slot(self, movie_title: str, started: set) -> str:
+        """Wait for a connection slot, then fetch; started records lookups that got one"""
+        async with self._slots:
+            started.add(movie_title)
+            return await self.fetch_poster(movie_title)
+    
+    async def get_posters(self, titles: Iterable[str], deadline: Optional[float] = None) -> Dict[str, str]:
+        """
+        Fetch posters for several titles concurrently
+        
+        Args:
+            titles: Movie titles to resolve (duplicates are fetched once)
+            deadline: Total time budget in seconds, defaults to batch_deadline
+        
+        Returns:
+            Dictionary mapping every requested title to a poster URL
+        """
+        titles = list(dict.fromkeys(titles))
+        posters = {}
+        cached = {}
+        not_in_memory = []
+        
+        # LRU hits are served inline; the SQLite reads of the rest share one worker thread
+        for title in titles:
+            hit, metadata = self.cache.get_memory(omdb_cache_key(title))
+            if hit:
+                cached[title] = metadata
+            else:
+                not_in_memory.append(title)
+        if not_in_memory:
+            lookups = await asyncio.to_thread(
+                lambda: [self.cache.get(omdb_cache_key(title)) for title in not_in_memory]
+            )
+            cached.update((title, metadata) for title, (hit, metadata) in zip(not_in_memory, lookups) if hit)
+        
+        missing = []
+        for title in titles:
+            if title in cached:
+                posters[title] = poster_from_metadata(cached[title]) or self.placeholder
+            elif not self.api_key:
+                posters[title] = self.placeholder
+            else:
+                missing.append(title)
+        
+        if not missing:
+            return posters
+        
+        started = set()
+        tasks = {asyncio.ensure_future(self._fetch_in_slot(title, started)): title for title in missing}
+        done, pending = await asyncio.wait(tasks, timeout=self.batch_deadline if deadline is None else deadline)
+        
+        for task, title in tasks.items():
+            posters[title] = task.result() if task in done else self.placeholder
+        
+        # Drop lookups that never started so a backlog cannot build up under load
+        for task in pending:
+            if tasks[task] in started:
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            else:
+                task.cancel()
+        
+        return posters
+    
+    async def aclose(self):
+        await self.client.aclose()
+
+recommender = MovieRecommendationEngine(
+    dataset_path='indian_movies_dataset.csv',
+    omdb_api_key=OMDB_API_KEY,
+    bundle_dir=MODEL_BUNDLE_DIR if bundle_is_current(MODEL_BUNDLE_DIR, 'indian_movies_dataset.csv') else None,
+    similarity_backend=SIMILARITY_BACKEND,
+    embedding_dim=EMBEDDING_DIM
+)
+cpu_executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix='recommend-cpu')
+poster_service: Optional[AsyncPosterService] = None
+
+templates = Jinja2Templates(directory='templates')
+# index.html is written for Flask's url_for('static', filename=...)
+templates.env.globals['url_for'] = lambda endpoint, filename: f'/{endpoint}/{filename}'
+
+async def run_cpu(func, *args, **kwargs):
+    """Run a blocking engine call in the CPU thread pool"""
+    return await asyncio.get_running_loop().run_in_executor(cpu_executor, partial(func, *args, **kwargs))
+
+async def attach_posters(movies: List[Dict]) -> List[Dict]:
+    """Fill in poster_url of engine results with one concurrent poster batch"""
+    posters = await poster_service.get_posters(movie['title'] for movie in movies)
+    for movie in movies:
+        movie['poster_url'] = posters[movie['title']]
+    return movies
+
+async def index(request: Request):
+    """
+    Serve the main HTML page
+    """
+    return templates.TemplateResponse(request, 'index.html')
+
+async def get_recommendations(request: Request):
+    """
+    API endpoint to get movie recommendations (same contract as app_flask.py)
+    """
+    try:
+        data = await request.json()
+        movie_title = data.get('movie_title', '').strip()
+        num_recommendations = read_num_recommendations(data)
+        
+        if not movie_title:
+            return JSONResponse({
+                'success': False,
+                'error': 'Movie title is required'
+            }, status_code=400)
+        
+        if num_recommendations is None:
+            return JSONResponse({
+                'success': False,
+                'error': 'num_recommendations must be a positive integer'
+            }, status_code=400)
+        
+        recommendations = await run_cpu(
+            recommender.get_movie_recommendations,
+            movie_title,
+            num_recommendations,
+            fetch_posters=False
+        )
+        
+        if not recommendations:
+            return JSONResponse({
+                'success': False,
+                'error': f'No recommendations found for "{movie_title}". Please check the spelling or try another movie.'
+            }, status_code=404)
+        
+        return JSONResponse({
+            'success': True,
+            'input_movie': movie_title,
+            'recommendations': await attach_posters(recommendations)
+        })
+        
+    except Exception as e:
+        return JSONResponse({
+            'success': False,
+            'error': f'An error occurred: {str(e)}'
+        }, status_code=500)
+
+async def get_recommendations_batch(request: Request):
+    """
+    API endpoint to get recommendations for several seed movies in one call (same contract as app_flask.py)
+    """
+    try:
+        data = await request.json()
+        movie_titles = [str(title).strip() for title in data.get('movie_titles', []) if str(title).strip()]
+        num_recommendations = read_num_recommendations(data)
+        
+        if not movie_titles:
+            return JSONResponse({
+                'success': False,
+                'error': 'At least one movie title is required'
+            }, status_code=400)
+        
+        if num_recommendations is None:
+            return JSONResponse({
+                'success': False,
+                'error': 'num_recommendations must be a positive integer'
+            }, status_code=400)
+        
+        if len(movie_titles) > MAX_BATCH_SEEDS:
+            return JSONResponse({
+                'success': False,
+                'error': f'At most {MAX_BATCH_SEEDS} movie titles per batch'
+            }, status_code=400)
+        
+        results = await run_cpu(
+            recommender.get_recommendations_batch,
+            movie_titles,
+            num_recommendations,
+            fetch_posters=False
+        )
+        
+        # One poster batch for the distinct titles of every seed's recommendations
+        await attach_posters([movie for result in results for movie in result['recommendations']])
+        
+        return JSONResponse({
+            'success': True,
+            'results': results
+        })
+        
+    except Exception as e:
+        return JSONResponse({
+            'success': False,
+            'error': f'An error occurred: {str(e)}'
+        }, status_code=500)
+
+async def get_profile_recommendations(request: Request):
+    """
+    API endpoint to get recommendations for a taste profile (same contract as app_flask.py)
+    """
+    try:
+        data = await request.json()
+        liked_titles = [str(title).strip() for title in data.get('liked_titles', []) if str(title).strip()]
+        disliked_titles = [str(title).strip() for title in data.get('disliked_titles', []) if str(title).strip()]
+        num_recommendations = read_num_recommendations(data)
+        
+        if not liked_titles:
+            return JSONResponse({
+                'success': False,
+                'error': 'At least one liked movie title is required'
+            }, status_code=400)
+        
+        if num_recommendations is None:
+            return JSONResponse({
+                'success': False,
+                'error': 'num_recommendations must be a positive integer'
+            }, status_code=400)
+        
+        if len(liked_titles) + len(disliked_titles) > MAX_PROFILE_SEEDS:
+            return JSONResponse({
+                'success': False,
+                'error': f'At most {MAX_PROFILE_SEEDS} movie titles per profile'
+            }, status_code=400)
+        
+        result = await run_cpu(
+            recommender.get_profile_recommendations,
+            liked_titles,
+            disliked_titles,
+            num_recommendations,
+            fetch_posters=False
+        )
+        
+        if not result['recommendations']:
+            return JSONResponse({
+                'success': False,
+                'error': 'None of the liked movies were found. Please check the spelling or try other movies.'
+            }, status_code=404)
+        
+        await attach_posters(result['recommendations'])
+        
+        return JSONResponse({
+            'success': True,
+            **result
+        })
+        
+    except Exception as e:
+        return JSONResponse({
+            'success': False,
+            'error': f'An error occurred: {str(e)}'
+        }, status_code=500)
+
+async def autocomplete(request: Request):
+    """
+    API endpoint for autocomplete suggestions (same contract as app_flask.py)
+    """
+    try:
+        query = request.query_params.get('q', '').strip()
+        limit = int(request.query_params.get('limit', 5))
+        
+        if len(query) < 2:
+            return JSONResponse({'suggestions': []})
+        
+        # Sub-millisecond index lookup, cheaper inline than a thread hop
+        suggestions = recommender.get_autocomplete_suggestions(query, limit)
+        
+        return JSONResponse({'suggestions': suggestions})
+        
+    except Exception as e:
+        return JSONResponse({
+            'suggestions': [],
+            'error': str(e)
+        })
+
+async def filter_movies(request: Request):
+    """
+    API endpoint to filter movies by language, genre, or rating (same contract as app_flask.py)
+    """
+    try:
+        data = await request.json()
+        page = int(data.get('page', 1))
+        per_page = min(int(data.get('per_page', 20)), MAX_FILTER_PAGE_SIZE)
+        
+        result = await run_cpu(
+            recommender.get_filtered_page,
+            language=data.get('language'),
+            genre=data.get('genre'),
+            min_rating=data.get('min_rating'),
+            page=page,
+            per_page=per_page,
+            fetch_posters=False
+        )
+        await attach_posters(result['movies'])
+        
+        return JSONResponse({
+            'success': True,
+            **result
+        })
+        
+    except Exception as e:
+        return JSONResponse({
+            'success': False,
+            'error': str(e)
+        }, status_code=500)
+
+async def get_stats(request: Request):
+    """
+    API endpoint to get dataset statistics, with ETag revalidation (same contract as app_flask.py)
+    """
+    try:
+        body, etag = recommender.get_dataset_stats_payload()
+        headers = {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache'}
+        
+        if f'"{etag}"' in request.headers.get('if-none-match', ''):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type='application/json', headers=headers)
+        
+    except Exception as e:
+        return JSONResponse({
+            'success': False,
+            'error': str(e)
+        }, status_code=500)
+
+async def not_found(request: Request, exc):
+    """Handle 404 errors"""
+    return JSONResponse({
+        'success': False,
+        'error': 'Endpoint not found'
+    }, status_code=404)
+
+async def internal_error(request: Request, exc):
+    """Handle 500 errors"""
+    return JSONResponse({
+        'success': False,
+        'error': 'Internal server error'
+    }, status_code=500)
+
+@asynccontextmanager
+async def lifespan(app):
+    """Create the async HTTP client inside the server's event loop and close it on shutdown"""
+    global poster_service
+    poster_service = AsyncPosterService(OMDB_API_KEY)
+    yield
+    await poster_service.aclose()
+    cpu_executor.shutdown(wait=False)
+
+app = Starlette(
+    routes=[
+        Route('/', index),
+        Route('/api/recommend', get_recommendations, methods=['POST']),
+        Route('/api/recommend/batch', get_recommendations_batch, methods=['POST']),
+        Route('/api/recommend/profile', get_profile_recommendations, methods=['POST']),
+        Route('/api/autocomplete', autocomplete, methods=['GET']),
+        Route('/api/filter', filter_movies, methods=['POST']),
+        Route('/api/stats', get_stats, methods=['GET']),
+        Mount('/static', StaticFiles(directory='static'), name='static'),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    exception_handlers={404: not_found, 500: internal_error},
+    lifespan=lifespan
+)
+
+if __name__ == '__main__':
+    import uvicorn
+    
+    print("🚀 Starting Movie Recommendation ASGI App...")
+    print("📊 Dataset loaded with", len(recommender.df), "movies")
+    print("🌐 Server will be available at: http://localhost:8000")
+    
+    uvicorn.run(app, host='0.0.0.0', port=8000)
@@ -3,11 +3,17 @@ Flask Web Application for Interactive Movie Recommendation System
 Provides REST API endpoints and serves the frontend interface
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 from flask_cors import CORS
+import hmac
 import json
 import os
+from typing import Dict, List, Optional
 from movie_recommender import MovieRecommendationEngine
+from model_registry import ModelRegistry
+from model_store import CURRENT_POINTER, bundle_is_current
+from poster_cache import omdb_flight_stats
+from response_cache import ResponseCache
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -16,11 +22,89 @@ CORS(app)  # Enable CORS for frontend-backend communication
 # Initialize the recommendation engine
 # You can set your OMDb API key here or via environment variable
 OMDB_API_KEY = os.getenv('OMDB_API_KEY', '7f7c782e-0051-449b-8636-94d0a0719c05')
-recommender = MovieRecommendationEngine(
-    dataset_path='indian_movies_dataset.csv',
-    omdb_api_key=OMDB_API_KEY
+
+DATASET_PATH = 'indian_movies_dataset.csv'
+
+# Workers memory-map a prebuilt bundle when one exists (python model_store.py build),
+# otherwise they fit the model from the CSV on startup
+MODEL_BUNDLE_DIR = os.getenv('MODEL_BUNDLE_DIR', 'model_bundle')
+
+# 'exact' (default) or 'lsh' for approximate search on catalogs too large for exact top-K
+SIMILARITY_BACKEND = os.getenv('SIMILARITY_BACKEND', 'exact')
+
+# Dense truncated-SVD scoring space of this many dimensions (e.g. 128); unset keeps sparse TF-IDF
+EMBEDDING_DIM = int(os.getenv('EMBEDDING_DIM', 0)) or None
+
+# Seconds between checks of the dataset CSV and bundle CURRENT pointer for changes; 0 disables
+MODEL_WATCH_INTERVAL = float(os.getenv('MODEL_WATCH_INTERVAL', 0))
+
+# Token required by the /api/admin endpoints; unset disables them
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+# Recommendation endpoint results kept per model version (0 disables caching) and for how many seconds
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 1024))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 600))
+
+def build_recommender() -> MovieRecommendationEngine:
+    """Build an engine from the current bundle unless the dataset CSV is newer, otherwise from the CSV"""
+    return MovieRecommendationEngine(
+        dataset_path=DATASET_PATH,
+        omdb_api_key=OMDB_API_KEY,
+        bundle_dir=MODEL_BUNDLE_DIR if bundle_is_current(MODEL_BUNDLE_DIR, DATASET_PATH) else None,
+        similarity_backend=SIMILARITY_BACKEND,
+        embedding_dim=EMBEDDING_DIM
+    )
+
+# New datasets and bundles are built in the background and swapped in without a restart;
+# every handler reads registry.current once and uses that engine for the whole request
+registry = ModelRegistry(
+    build_recommender,
+    watch_paths=[DATASET_PATH, os.path.join(MODEL_BUNDLE_DIR, CURRENT_POINTER)],
+    poll_interval=MODEL_WATCH_INTERVAL
 )
 
+# Title matches and poster-free recommendation lists of the /api/recommend endpoints;
+# concurrent identical misses compute once
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+def attach_posters(engine: MovieRecommendationEngine, recommendation_lists: List[List[Dict]]) -> List[List[Dict]]:
+    """
+    Resolve the posters of poster-free (cached) recommendation lists for one request
+    
+    Posters come from the shared two-tier poster cache, so repeat titles cost no OMDb call,
+    and titles still missing after a deadline get a placeholder for this response only.
+    
+    Args:
+        engine: Engine whose poster service resolves the posters
+        recommendation_lists: Recommendation lists computed with fetch_posters=False
+    
+    Returns:
+        New lists of new dictionaries with poster_url filled in; the cached ones are not modified
+    """
+    posters = engine.poster_service.get_posters(
+        movie['title'] for recommendations in recommendation_lists for movie in recommendations
+    )
+    return [
+        [{**movie, 'poster_url': posters[movie['title']]} for movie in recommendations]
+        for recommendations in recommendation_lists
+    ]
+
+# Upper bound on the page size clients may request from /api/filter
+MAX_FILTER_PAGE_SIZE = 100
+
+# Upper bound on the number of seed titles per /api/recommend/batch call
+MAX_BATCH_SEEDS = 20
+
+# Upper bound on the number of liked plus disliked titles per /api/recommend/profile call
+MAX_PROFILE_SEEDS = 50
+
+def read_num_recommendations(data: Dict) -> Optional[int]:
+    """num_recommendations of a request body (default 10), or None unless it is an integer of at least 1"""
+    num_recommendations = data.get('num_recommendations', 10)
+    if isinstance(num_recommendations, bool) or not isinstance(num_recommendations, int) or num_recommendations < 1:
+        return None
+    return num_recommendations
+
 @app.route('/')
 def index():
     """
@@ -49,7 +133,7 @@ def get_recommendations():
     try:
         data = request.get_json()
         movie_title = data.get('movie_title', '').strip()
-        num_recommendations = data.get('num_recommendations', 10)
+        num_recommendations = read_num_recommendations(data)
         
         if not movie_title:
             return jsonify({
@@ -57,12 +141,33 @@ def get_recommendations():
                 'error': 'Movie title is required'
             }), 400
         
-        # Get recommendations from the engine
-        recommendations = recommender.get_movie_recommendations(
-            movie_title, 
-            num_recommendations
+        if num_recommendations is None:
+            return jsonify({
+                'success': False,
+                'error': 'num_recommendations must be a positive integer'
+            }), 400
+        
+        # The version is read before the engine, so a result is never stored under a newer version
+        # than the engine that computed it; a swap or catalog update empties the cache
+        registry_version = registry.version
+        engine = registry.current
+        version = (registry_version, engine.model_version)
+        
+        # Resolve the title (fuzzy matching included) once per distinct spelling
+        matched_title, movie_idx = response_cache.get_or_compute(
+            version, ('match', movie_title.lower()), lambda: engine.find_movie_match(movie_title)
         )
         
+        recommendations = []
+        if movie_idx is not None:
+            # Get recommendations from the engine, once per movie and result count; posters are
+            # resolved per request, so a placeholder from a missed poster deadline is never cached
+            recommendations = response_cache.get_or_compute(
+                version, ('recommend', movie_idx, num_recommendations),
+                lambda: engine.get_recommendations_for_index(movie_idx, num_recommendations, fetch_posters=False)
+            )
+            recommendations = attach_posters(engine, [recommendations])[0]
+        
         if not recommendations:
             return jsonify({
                 'success': False,
@@ -81,6 +186,143 @@ def get_recommendations():
             'error': f'An error occurred: {str(e)}'
         }), 500
 
+@app.route('/api/recommend/batch', methods=['POST'])
+def get_recommendations_batch():
+    """
+    API endpoint to get recommendations for several seed movies in one call
+    
+    Expected JSON payload:
+    {
+        "movie_titles": ["Dangal", "Baahubali"],
+        "num_recommendations": 10
+    }
+    
+    Returns:
+    {
+        "success": true,
+        "results": [
+            {"input_movie": "Dangal", "matched_title": "Dangal", "recommendations": [...]},
+            ...
+        ]
+    }
+    """
+    try:
+        data = request.get_json()
+        movie_titles = [str(title).strip() for title in data.get('movie_titles', []) if str(title).strip()]
+        num_recommendations = read_num_recommendations(data)
+        
+        if not movie_titles:
+            return jsonify({
+                'success': False,
+                'error': 'At least one movie title is required'
+            }), 400
+        
+        if num_recommendations is None:
+            return jsonify({
+                'success': False,
+                'error': 'num_recommendations must be a positive integer'
+            }), 400
+        
+        if len(movie_titles) > MAX_BATCH_SEEDS:
+            return jsonify({
+                'success': False,
+                'error': f'At most {MAX_BATCH_SEEDS} movie titles per batch'
+            }), 400
+        
+        registry_version = registry.version
+        engine = registry.current
+        results = response_cache.get_or_compute(
+            (registry_version, engine.model_version), ('batch', tuple(movie_titles), num_recommendations),
+            lambda: engine.get_recommendations_batch(movie_titles, num_recommendations, fetch_posters=False)
+        )
+        
+        # One poster batch for the distinct titles of every result list
+        recommendation_lists = attach_posters(engine, [result['recommendations'] for result in results])
+        results = [{**result, 'recommendations': recommendations}
+                   for result, recommendations in zip(results, recommendation_lists)]
+        
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'An error occurred: {str(e)}'
+        }), 500
+
+@app.route('/api/recommend/profile', methods=['POST'])
+def get_profile_recommendations():
+    """
+    API endpoint to get recommendations for a taste profile of liked and disliked movies
+    
+    Expected JSON payload:
+    {
+        "liked_titles": ["Dangal", "Lagaan"],
+        "disliked_titles": ["Queen"],
+        "num_recommendations": 10
+    }
+    
+    Returns:
+    {
+        "success": true,
+        "liked": ["Dangal", "Lagaan"],
+        "disliked": ["Queen"],
+        "recommendations": [...]
+    }
+    """
+    try:
+        data = request.get_json()
+        liked_titles = [str(title).strip() for title in data.get('liked_titles', []) if str(title).strip()]
+        disliked_titles = [str(title).strip() for title in data.get('disliked_titles', []) if str(title).strip()]
+        num_recommendations = read_num_recommendations(data)
+        
+        if not liked_titles:
+            return jsonify({
+                'success': False,
+                'error': 'At least one liked movie title is required'
+            }), 400
+        
+        if num_recommendations is None:
+            return jsonify({
+                'success': False,
+                'error': 'num_recommendations must be a positive integer'
+            }), 400
+        
+        if len(liked_titles) + len(disliked_titles) > MAX_PROFILE_SEEDS:
+            return jsonify({
+                'success': False,
+                'error': f'At most {MAX_PROFILE_SEEDS} movie titles per profile'
+            }), 400
+        
+        registry_version = registry.version
+        engine = registry.current
+        result = response_cache.get_or_compute(
+            (registry_version, engine.model_version),
+            ('profile', tuple(liked_titles), tuple(disliked_titles), num_recommendations),
+            lambda: engine.get_profile_recommendations(liked_titles, disliked_titles, num_recommendations,
+                                                       fetch_posters=False)
+        )
+        result = {**result, 'recommendations': attach_posters(engine, [result['recommendations']])[0]}
+        
+        if not result['recommendations']:
+            return jsonify({
+                'success': False,
+                'error': 'None of the liked movies were found. Please check the spelling or try other movies.'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            **result
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'An error occurred: {str(e)}'
+        }), 500
+
 @app.route('/api/autocomplete', methods=['GET'])
 def autocomplete():
     """
@@ -102,7 +344,7 @@ def autocomplete():
         if len(query) < 2:
             return jsonify({'suggestions': []})
         
-        suggestions = recommender.get_autocomplete_suggestions(query, limit)
+        suggestions = registry.current.get_autocomplete_suggestions(query, limit)
         
         return jsonify({'suggestions': suggestions})
         
@@ -121,13 +363,19 @@ def filter_movies():
     {
         "language": "Hindi",
         "genre": "Action",
-        "min_rating": 7.0
+        "min_rating": 7.0,
+        "page": 1,          (optional, default: 1)
+        "per_page": 20      (optional, default: 20, max: 100)
     }
     
     Returns:
     {
         "success": true,
-        "movies": [...]
+        "movies": [...],
+        "total": 134,
+        "page": 1,
+        "per_page": 20,
+        "total_pages": 7
     }
     """
     try:
@@ -135,16 +383,20 @@ def filter_movies():
         language = data.get('language')
         genre = data.get('genre')
         min_rating = data.get('min_rating')
+        page = int(data.get('page', 1))
+        per_page = min(int(data.get('per_page', 20)), MAX_FILTER_PAGE_SIZE)
         
-        movies = recommender.get_movies_by_filters(
+        result = registry.current.get_filtered_page(
             language=language,
             genre=genre,
-            min_rating=min_rating
+            min_rating=min_rating,
+            page=page,
+            per_page=per_page
         )
         
         return jsonify({
             'success': True,
-            'movies': movies
+            **result
         })
         
     except Exception as e:
@@ -163,13 +415,17 @@ def get_stats():
         "success": true,
         "stats": {...}
     }
+    
+    The body is serialized once per statistics version and sent with an ETag;
+    a request whose If-None-Match matches gets an empty 304 response.
     """
     try:
-        stats = recommender.get_dataset_stats()
-        return jsonify({
-            'success': True,
-            'stats': stats
-        })
+        body, etag = registry.current.get_dataset_stats_payload()
+        
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'  # Always revalidate, never serve stale stats
+        return response.make_conditional(request)
         
     except Exception as e:
         return jsonify({
@@ -177,6 +433,60 @@ def get_stats():
             'error': str(e)
         }), 500
 
+def admin_authorized() -> bool:
+    """Check the X-Admin-Token header against ADMIN_TOKEN"""
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_model():
+    """
+    API endpoint to rebuild the model from the current dataset or bundle
+    
+    The engine is built in the background; requests keep being served by the
+    current one until the new engine is swapped in.
+    Requires the X-Admin-Token header.
+    
+    Returns:
+    {
+        "success": true,
+        "started": true,
+        "model": {...}
+    }
+    """
+    if not admin_authorized():
+        return jsonify({
+            'success': False,
+            'error': 'Admin token required'
+        }), 403
+    
+    started = registry.reload()
+    return jsonify({
+        'success': True,
+        'started': started,
+        'model': registry.status()
+    }), 202
+
+@app.route('/api/admin/model', methods=['GET'])
+def get_model_status():
+    """
+    API endpoint to get the live model version, rebuild state, /api/recommend cache counters
+    and how many duplicate OMDb lookups were suppressed
+    Requires the X-Admin-Token header.
+    """
+    if not admin_authorized():
+        return jsonify({
+            'success': False,
+            'error': 'Admin token required'
+        }), 403
+    
+    return jsonify({
+        'success': True,
+        'model': registry.status(),
+        'response_cache': response_cache.stats(),
+        'omdb_lookups': omdb_flight_stats()
+    })
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
@@ -205,7 +515,7 @@ if __name__ == '__main__':
         os.makedirs('static/js')
     
     print("🚀 Starting Movie Recommendation Flask App...")
-    print("📊 Dataset loaded with", len(recommender.df), "movies")
+    print("📊 Dataset loaded with", len(registry.current.df), "movies")
     print("🌐 Server will be available at: http://localhost:5000")
     
     # Run the Flask app
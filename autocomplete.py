@@ -0,0 +1,251 @@
+"""
+Title Autocomplete Index
+Sorted word-start array with bisect range lookups, popularity-ranked suggestions and
+a trigram infix fallback, so each keystroke costs a few dozen comparisons instead of a catalog scan
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from title_index import trigrams
+
+# Every alphanumeric character that does not follow another one starts a word
+WORD_START = re.compile(r'(?<![^\W_])[^\W_]')
+
+MIN_QUERY_LENGTH = 2
+
+# Prefixes matching more entries than this get their top suggestions precomputed
+LARGE_RANGE = 2048
+PRECOMPUTED_SUGGESTIONS = 10
+
+# Infix postings are scanned in chunks so a query can stop as soon as it has enough titles
+SCAN_CHUNK = 256
+
+class AutocompleteIndex:
+    """
+    Autocomplete over movie titles
+    
+    Every word start of every lower-cased title is an entry of a sorted array, so all
+    titles with a word beginning with the query form one contiguous range found with two
+    bisects. Titles in that range are ranked by score (e.g. rating), highest first.
+    When word starts give fewer suggestions than requested, titles containing the query
+    anywhere ("bali" -> "Baahubali") are added from trigram postings kept in rank order.
+    """
+    
+    def __init__(self, titles: Iterable[str], scores: Optional[Iterable[float]] = None):
+        """
+        Build the index
+        
+        Args:
+            titles: Display titles; suggestion ids are positions in this sequence
+            scores: Ranking score per title (missing values rank last), defaults to dataset order
+        """
+        self.titles: List[str] = [str(title) for title in titles]
+        self.keys: List[str] = [title.lower() for title in self.titles]
+        num_titles = len(self.titles)
+        
+        # Rank titles by descending score, ties in dataset order
+        self.scores = self._score_array(scores, num_titles)
+        self.order = np.lexsort((np.arange(num_titles), -self.scores)).astype(np.int32)
+        self.rank = np.empty(num_titles, dtype=np.int32)
+        self.rank[self.order] = np.arange(num_titles, dtype=np.int32)
+        
+        # Word-start entries sorted by the remainder of the title from that word on
+        entries = [
+            (key_id, match.start())
+            for key_id, key in enumerate(self.keys)
+            for match in WORD_START.finditer(key)
+        ]
+        entries.sort(key=lambda entry: self.keys[entry[0]][entry[1]:])
+        self.entry_keys = np.array([key_id for key_id, _ in entries], dtype=np.int32)
+        self.entry_offsets = np.array([offset for _, offset in entries], dtype=np.int32)
+        self._entry_positions = range(len(entries))
+        
+        # Infix postings hold rank positions, so the first matches found are the best ranked
+        postings: Dict[str, List[int]] = {}
+        for position, key_id in enumerate(self.order.tolist()):
+            for gram in trigrams(self.keys[key_id]):
+                postings.setdefault(gram, []).append(position)
+        self.infix_postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        
+        self.precomputed: Dict[str, np.ndarray] = {}
+        self._precompute_large_ranges()
+    
+    @staticmethod
+    def _score_array(scores: Optional[Iterable[float]], num_titles: int) -> np.ndarray:
+        """Ranking scores as float64, missing values last; equal scores keep dataset order"""
+        if scores is None:
+            return np.zeros(num_titles, dtype=np.float64)
+        score_array = np.asarray(list(scores), dtype=np.float64)
+        return np.where(np.isnan(score_array), -np.inf, score_array)
+    
+    def add(self, titles: Iterable[str], scores: Optional[Iterable[float]] = None):
+        """
+        Index titles appended to the catalog without rebuilding the index
+        
+        New titles are merged into the rank order and their word starts into the
+        sorted entries, infix postings are renumbered to the new rank positions, and
+        precomputed suggestions are refreshed for the prefixes the new titles fall under.
+        
+        Args:
+            titles: Display titles; they get the next ids in order
+            scores: Ranking score per title, defaults to ranking after every existing title
+        """
+        new_titles = [str(title) for title in titles]
+        if not new_titles:
+            return
+        
+        start = len(self.titles)
+        new_keys = [title.lower() for title in new_titles]
+        new_ids = np.arange(start, start + len(new_titles), dtype=np.int32)
+        new_scores = self._score_array(scores, len(new_titles))
+        if scores is None:
+            new_scores[:] = -np.inf
+        
+        # Merge into the rank order: existing titles always win ties, having lower ids
+        ranked_scores = self.scores[self.order]
+        new_order = np.lexsort((new_ids, -new_scores))
+        positions = np.searchsorted(-ranked_scores, -new_scores[new_order], side='right')
+        
+        # Old rank position p moves to p plus the number of titles inserted at or before it
+        shift = np.arange(len(self.order)) + np.searchsorted(positions, np.arange(len(self.order)), side='right')
+        
+        self.titles.extend(new_titles)
+        self.keys.extend(new_keys)
+        self.scores = np.concatenate([self.scores, new_scores])
+        self.order = np.insert(self.order, positions, new_ids[new_order]).astype(np.int32)
+        self.rank = np.empty(len(self.order), dtype=np.int32)
+        self.rank[self.order] = np.arange(len(self.order), dtype=np.int32)
+        
+        # Renumber infix postings, then insert the rank positions of the new titles
+        new_postings: Dict[str, List[int]] = {}
+        for key_id, key in zip(new_ids.tolist(), new_keys):
+            for gram in trigrams(key):
+                new_postings.setdefault(gram, []).append(int(self.rank[key_id]))
+        for gram, posting in self.infix_postings.items():
+            self.infix_postings[gram] = shift[posting].astype(np.int32)
+        for gram, ranks in new_postings.items():
+            ranks = np.sort(np.array(ranks, dtype=np.int32))
+            posting = self.infix_postings.get(gram, np.empty(0, dtype=np.int32))
+            self.infix_postings[gram] = np.insert(posting, np.searchsorted(posting, ranks), ranks)
+        
+        # Insert the new word-start entries at their sorted positions
+        entries = sorted(
+            ((key_id, match.start()) for key_id, key in zip(new_ids.tolist(), new_keys)
+             for match in WORD_START.finditer(key)),
+            key=lambda entry: self.keys[entry[0]][entry[1]:]
+        )
+        insert_at = [bisect_right(self._entry_positions, self.keys[key_id][offset:], key=self._entry_text)
+                     for key_id, offset in entries]
+        self.entry_keys = np.insert(self.entry_keys, insert_at, [key_id for key_id, _ in entries]).astype(np.int32)
+        self.entry_offsets = np.insert(self.entry_offsets, insert_at, [offset for _, offset in entries]).astype(np.int32)
+        self._entry_positions = range(len(self.entry_keys))
+        
+        # Only prefixes of the new titles' word starts can change their top suggestions
+        refreshed = set()
+        for key_id, offset in entries:
+            rest = self.keys[key_id][offset:]
+            lo, hi = 0, len(self._entry_positions)
+            for length in range(1, len(rest) + 1):
+                prefix = rest[:length]
+                lo, hi = self._prefix_range(prefix, lo, hi)
+                if hi - lo <= LARGE_RANGE:
+                    break
+                if length >= MIN_QUERY_LENGTH and prefix not in refreshed:
+                    self.precomputed[prefix] = self._ranked(lo, hi, PRECOMPUTED_SUGGESTIONS)
+                    refreshed.add(prefix)
+    
+    def _entry_text(self, position: int) -> str:
+        """Title text of an entry from its word start on"""
+        return self.keys[self.entry_keys[position]][self.entry_offsets[position]:]
+    
+    def _entry_prefix(self, position: int, length: int) -> str:
+        """First length characters of an entry's title from its word start"""
+        offset = self.entry_offsets[position]
+        return self.keys[self.entry_keys[position]][offset:offset + length]
+    
+    def _prefix_range(self, prefix: str, lo: int = 0, hi: Optional[int] = None):
+        """Return the [lo, hi) entry range whose word starts begin with prefix"""
+        hi = len(self._entry_positions) if hi is None else hi
+        key = lambda position: self._entry_prefix(position, len(prefix))
+        lo = bisect_left(self._entry_positions, prefix, lo, hi, key=key)
+        hi = bisect_right(self._entry_positions, prefix, lo, hi, key=key)
+        return lo, hi
+    
+    def _ranked(self, lo: int, hi: int, limit: int) -> np.ndarray:
+        """Best ranked distinct title ids among entries lo..hi"""
+        ranks = np.unique(self.rank[self.entry_keys[lo:hi]])
+        return self.order[ranks[:limit]]
+    
+    def _precompute_large_ranges(self):
+        """Cache the top suggestions of every prefix whose range is too large to rank per request"""
+        stack = [('', 0, len(self._entry_positions))]
+        
+        while stack:
+            prefix, lo, hi = stack.pop()
+            if len(prefix) >= MIN_QUERY_LENGTH:
+                self.precomputed[prefix] = self._ranked(lo, hi, PRECOMPUTED_SUGGESTIONS)
+            
+            # Walk the child prefixes one character longer; each is a contiguous sub-range
+            length = len(prefix) + 1
+            start = lo
+            while start < hi:
+                child = self._entry_prefix(start, length)
+                end = bisect_right(
+                    self._entry_positions, child, start, hi,
+                    key=lambda position: self._entry_prefix(position, length)
+                )
+                if len(child) == length and end - start > LARGE_RANGE:
+                    stack.append((child, start, end))
+                start = end
+    
+    def _infix_matches(self, query: str, limit: int, exclude: set) -> List[int]:
+        """Best ranked title ids containing the query anywhere, skipping excluded ids"""
+        grams = trigrams(query)
+        if not grams:
+            return []
+        
+        postings = [self.infix_postings.get(gram) for gram in grams]
+        if any(posting is None for posting in postings):
+            return []
+        
+        # Verify candidates from the shortest postings list in rank order and stop early
+        shortest = min(postings, key=len)
+        matches = []
+        for start in range(0, len(shortest), SCAN_CHUNK):
+            for key_id in self.order[shortest[start:start + SCAN_CHUNK]].tolist():
+                if key_id not in exclude and query in self.keys[key_id]:
+                    matches.append(key_id)
+                    if len(matches) >= limit:
+                        return matches
+        return matches
+    
+    def suggest_ids(self, query: str, limit: int = 5) -> List[int]:
+        """
+        Return up to limit title ids matching the query, best ranked first
+        
+        Args:
+            query: Partial title typed by the user
+            limit: Maximum number of suggestions
+        
+        Returns:
+            Title ids (positions in the titles passed to the constructor)
+        """
+        query = query.lower()
+        if len(query) < MIN_QUERY_LENGTH or limit <= 0:
+            return []
+        
+        cached = self.precomputed.get(query)
+        if cached is not None and limit <= len(cached):
+            ids = cached[:limit].tolist()
+        else:
+            ids = self._ranked(*self._prefix_range(query), limit).tolist()
+        
+        if len(ids) < limit:
+            ids.extend(self._infix_matches(query, limit - len(ids), set(ids)))
+        return ids
+    
+    def suggest(self, query: str, limit: int = 5) -> List[str]:
+        """Return up to limit display titles matching the query, best ranked first"""
+        return [self.titles[key_id] for key_id in self.suggest_ids(query, limit)]
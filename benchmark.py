@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Benchmark Script for Indian Movie Recommendation System
+Measures per-request latency of the hot paths at different catalog sizes
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from similarity_index import profile_scores, profile_vector, similarity_block, top_n_indices, top_n_rows
+from autocomplete import AutocompleteIndex
+from ann_index import LSHIndex
+from embeddings import fit_embeddings
+
+CATALOG_SIZES = [10_000, 100_000, 1_000_000]
+
+def time_call(func, repeats: int) -> float:
+    """Return the median wall-clock time of func() in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+def bench_top_n(num_recommendations: int = 10):
+    """Compare full Python sort vs argpartition top-N selection for one similarity row"""
+    print("⏱️  Top-N selection per request (median ms)")
+    print("=" * 60)
+    print(f"{'titles':>12} {'sorted(enumerate)':>20} {'top_n_indices':>15} {'speedup':>9}")
+    
+    rng = np.random.default_rng(42)
+    
+    for size in CATALOG_SIZES:
+        scores = rng.random(size)
+        movie_idx = size // 2
+        
+        def python_sort():
+            sim_scores = sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
+            return [i for i, _ in sim_scores if i != movie_idx][:num_recommendations]
+        
+        def numpy_top_n():
+            return top_n_indices(scores, num_recommendations, exclude=movie_idx)
+        
+        # Both paths must agree before their timings mean anything
+        assert list(numpy_top_n()) == python_sort()
+        
+        repeats = 3 if size >= 1_000_000 else 10
+        old_ms = time_call(python_sort, repeats)
+        new_ms = time_call(numpy_top_n, repeats * 10)
+        print(f"{size:>12,} {old_ms:>20.2f} {new_ms:>15.3f} {old_ms / new_ms:>8.0f}x")
+
+def synthetic_titles(size: int, rng) -> list:
+    """Generate size movie-like titles from a small vocabulary"""
+    words = ['dangal', 'baahubali', 'idiots', 'lagaan', 'queen', 'pink', 'andhadhun', 'drishyam',
+             'kgf', 'chapter', 'sultan', 'piku', 'the', 'returns', 'rising', 'legacy', 'saga', 'story',
+             'love', 'war', 'king', 'raja', 'rani', 'dil', 'mera', 'naam', 'ek', 'tha', 'tiger', 'don']
+    lengths = rng.integers(1, 5, size)
+    choices = rng.integers(0, len(words), (size, 4))
+    return [' '.join(words[w] for w in choices[i, :lengths[i]]).title() + f' {i}' for i in range(size)]
+
+def bench_autocomplete(num_suggestions: int = 5):
+    """Compare the row-by-row title scan with the autocomplete index (median and p99 ms)"""
+    print("⏱️  Autocomplete per keystroke")
+    print("=" * 60)
+    print(f"{'titles':>12} {'scan worst':>12} {'index median':>13} {'index p99':>10} {'build s':>8}")
+    
+    rng = np.random.default_rng(42)
+    queries = ['da', 'dan', 'bali', 'the r', 'kgf ch', 'ra', 'tiger 1', 'zz', 'queen pink', 'mera naam']
+    
+    for size in CATALOG_SIZES:
+        titles = synthetic_titles(size, rng)
+        ratings = rng.uniform(1, 10, size).round(1)
+        
+        start = time.perf_counter()
+        index = AutocompleteIndex(titles, ratings)
+        build_s = time.perf_counter() - start
+        
+        def scan(query):
+            query = query.lower()
+            suggestions = []
+            for title in titles:
+                if query in title.lower():
+                    suggestions.append(title)
+                    if len(suggestions) >= num_suggestions:
+                        break
+            return suggestions
+        
+        # Typed one keystroke at a time, like the debounced search box
+        keystrokes = [query[:end] for query in queries for end in range(2, len(query) + 1)]
+        timings = []
+        for query in keystrokes * 20:
+            begin = time.perf_counter()
+            index.suggest(query, num_suggestions)
+            timings.append((time.perf_counter() - begin) * 1000)
+        
+        # A scan stops early on common queries, so its worst query is what users feel
+        scan_ms = max(time_call(lambda: scan(query), 1) for query in queries)
+        print(f"{size:>12,} {scan_ms:>12.3f} {np.median(timings):>13.3f} "
+              f"{np.percentile(timings, 99):>10.3f} {build_s:>8.1f}")
+
+def synthetic_tfidf(size: int, rng, num_features: int = 5000, terms_per_movie: int = 12):
+    """Generate a sparse TF-IDF-like matrix with L2-normalized rows"""
+    cols = rng.integers(0, num_features, (size, terms_per_movie))
+    data = rng.random((size, terms_per_movie)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    indptr = np.arange(0, size * terms_per_movie + 1, terms_per_movie)
+    matrix = sp.csr_matrix((data.ravel(), cols.ravel(), indptr), shape=(size, num_features))
+    matrix.sum_duplicates()
+    return matrix
+
+def bench_profile(num_recommendations: int = 10, num_liked: int = 5, num_disliked: int = 2):
+    """Compare averaging one similarity row per seed with a single taste-profile centroid"""
+    print(f"⏱️  Taste profile of {num_liked} liked + {num_disliked} disliked titles (median ms)")
+    print("=" * 60)
+    print(f"{'titles':>12} {'per-seed rows':>14} {'centroid':>10} {'speedup':>9}")
+    
+    rng = np.random.default_rng(42)
+    
+    for size in CATALOG_SIZES:
+        tfidf = synthetic_tfidf(size, rng)
+        seeds = rng.choice(size, num_liked + num_disliked, replace=False)
+        liked, disliked = seeds[:num_liked], seeds[num_liked:]
+        
+        def per_seed_rows():
+            rows = (tfidf @ tfidf[seeds].T).toarray()
+            scores = rows[:, :num_liked].mean(axis=1) - 0.5 * rows[:, num_liked:].mean(axis=1)
+            scores[seeds] = -np.inf
+            return top_n_indices(scores, num_recommendations)
+        
+        def centroid():
+            scores = profile_scores(tfidf, profile_vector(tfidf, liked, disliked))
+            scores[seeds] = -np.inf
+            return top_n_indices(scores, num_recommendations)
+        
+        repeats = 3 if size >= 1_000_000 else 10
+        old_ms = time_call(per_seed_rows, repeats)
+        new_ms = time_call(centroid, repeats)
+        print(f"{size:>12,} {old_ms:>14.2f} {new_ms:>10.2f} {old_ms / new_ms:>8.1f}x")
+
+def clustered_tfidf(size: int, rng, num_features: int = 20000, num_topics: int = 2000,
+                    topic_terms: int = 30, terms_per_movie: int = 12, noise_terms: int = 3):
+    """
+    Generate a sparse TF-IDF-like matrix whose rows share terms the way real movies do
+    
+    Each movie draws most of its terms from one topic (think director, cast and genres)
+    and a few at random, so it has genuine near neighbours for an ANN index to find.
+    """
+    topics = rng.integers(0, num_features, (num_topics, topic_terms))
+    movie_topics = rng.integers(0, num_topics, size)
+    picks = rng.integers(0, topic_terms, (size, terms_per_movie - noise_terms))
+    cols = np.concatenate([
+        topics[movie_topics[:, None], picks],
+        rng.integers(0, num_features, (size, noise_terms))
+    ], axis=1)
+    data = rng.random(cols.shape).astype(np.float32) + 0.1
+    indptr = np.arange(0, size * terms_per_movie + 1, terms_per_movie)
+    matrix = sp.csr_matrix((data.ravel(), cols.ravel(), indptr), shape=(size, num_features))
+    matrix.sum_duplicates()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    return sp.csr_matrix(sp.diags(1 / norms) @ matrix, dtype=np.float32)
+
+# (tables, bits, probes) settings compared by the ANN benchmark, roughly fastest to most accurate
+ANN_SETTINGS = [(16, 12, 2), (32, 12, 4), (32, 11, 4), (48, 11, 4), (64, 10, 2), (64, 10, 4)]
+ANN_SIZES = [100_000, 1_000_000]
+
+def bench_ann(num_recommendations: int = 10, num_queries: int = 200):
+    """Recall@N and latency of LSH settings against the exact sparse scan"""
+    print(f"⏱️  LSH vs exact top-{num_recommendations} (median / p99 ms per query)")
+    print("=" * 76)
+    print(f"{'titles':>12} {'setting':>16} {'recall@10':>10} {'median':>8} {'p99':>8} "
+          f"{'candidates':>11} {'build s':>8}")
+    
+    rng = np.random.default_rng(42)
+    
+    for size in ANN_SIZES:
+        tfidf = clustered_tfidf(size, rng)
+        matrix_t = tfidf.T.tocsr()
+        queries = rng.choice(size, num_queries, replace=False)
+        
+        exact = {}
+        timings = []
+        for idx in queries:
+            begin = time.perf_counter()
+            scores = (tfidf[idx] @ matrix_t).toarray().ravel()
+            exact[idx] = set(top_n_indices(scores, num_recommendations, exclude=idx).tolist())
+            timings.append((time.perf_counter() - begin) * 1000)
+        print(f"{size:>12,} {'exact':>16} {1:>10.3f} {np.median(timings):>8.2f} "
+              f"{np.percentile(timings, 99):>8.2f} {size:>11,} {'-':>8}")
+        
+        for num_tables, num_bits, num_probes in ANN_SETTINGS:
+            start = time.perf_counter()
+            index = LSHIndex(tfidf, num_tables=num_tables, num_bits=num_bits, num_probes=num_probes)
+            build_s = time.perf_counter() - start
+            
+            timings = []
+            hits = 0
+            num_candidates = 0
+            for idx in queries:
+                begin = time.perf_counter()
+                indices, _ = index.query(tfidf[idx], num_recommendations, exclude=idx)
+                timings.append((time.perf_counter() - begin) * 1000)
+                hits += len(exact[idx].intersection(indices.tolist()))
+                num_candidates += len(index.candidates(tfidf[idx]))
+            
+            setting = f"{num_tables}t/{num_bits}b/{num_probes}p"
+            print(f"{'':>12} {setting:>16} {hits / (num_queries * num_recommendations):>10.3f} "
+                  f"{np.median(timings):>8.2f} {np.percentile(timings, 99):>8.2f} "
+                  f"{num_candidates // num_queries:>11,} {build_s:>8.1f}")
+
+EMBEDDING_DIMS = [64, 128, 256]
+
+def bench_embeddings(num_recommendations: int = 10, num_seeds: int = 64):
+    """Memory, batch scoring latency and top-N agreement of SVD embeddings vs sparse TF-IDF"""
+    print(f"⏱️  Dense SVD embeddings vs sparse TF-IDF ({num_seeds}-seed batch, median ms)")
+    print("=" * 76)
+    print(f"{'titles':>12} {'space':>10} {'bytes/title':>12} {'batch ms':>9} "
+          f"{'overlap@10':>11} {'fit s':>7}")
+    
+    rng = np.random.default_rng(42)
+    
+    for size in ANN_SIZES:
+        # About as many terms per movie as the unigram + bigram features of the real catalog
+        tfidf = clustered_tfidf(size, rng, terms_per_movie=24, noise_terms=6)
+        seeds = rng.choice(size, num_seeds, replace=False)
+        exact, _ = top_n_rows(similarity_block(tfidf, seeds), num_recommendations, exclude=seeds)
+        
+        sparse_bytes = (tfidf.data.nbytes + tfidf.indices.nbytes + tfidf.indptr.nbytes) / size
+        sparse_ms = time_call(lambda: similarity_block(tfidf, seeds), 5)
+        print(f"{size:>12,} {'tfidf':>10} {sparse_bytes:>12.0f} {sparse_ms:>9.1f} {1:>11.3f} {'-':>7}")
+        
+        for dim in EMBEDDING_DIMS:
+            start = time.perf_counter()
+            embeddings, _ = fit_embeddings(tfidf, dim)
+            fit_s = time.perf_counter() - start
+            
+            dense_ms = time_call(lambda: similarity_block(embeddings, seeds), 5)
+            found, _ = top_n_rows(similarity_block(embeddings, seeds), num_recommendations, exclude=seeds)
+            overlap = np.mean([len(set(a) & set(b)) for a, b in zip(exact.tolist(), found.tolist())])
+            
+            print(f"{'':>12} {f'svd-{dim}':>10} {embeddings.nbytes / size:>12.0f} {dense_ms:>9.1f} "
+                  f"{overlap / num_recommendations:>11.3f} {fit_s:>7.1f}")
+            del embeddings
+
+INGEST_SIZES = [100_000, 1_000_000]
+
+# Runs in a fresh interpreter per mode, so the peak RSS is that of the mode alone
+# Peak RSS of the script's own address space (VmHWM); ru_maxrss would include the parent's before exec
+PEAK_RSS = """
+def peak_rss_mib():
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmHWM')) / 1024
+"""
+
+INGEST_SCRIPT = PEAK_RSS + """
+import sys, time
+import pandas as pd
+from catalog_ingest import fit_tfidf_chunked, read_catalog
+from movie_recommender import MovieRecommendationEngine
+path, chunk_size = sys.argv[1], int(sys.argv[2])
+start = time.perf_counter()
+if chunk_size:
+    df = read_catalog(path, MovieRecommendationEngine.prepare_catalog, chunk_size)
+    tfidf = fit_tfidf_chunked(MovieRecommendationEngine.create_vectorizer(), df['combined_features'], chunk_size)
+else:
+    df = MovieRecommendationEngine.prepare_catalog(pd.read_csv(path))
+    tfidf = MovieRecommendationEngine.create_vectorizer().fit_transform(df['combined_features'])
+print(time.perf_counter() - start, peak_rss_mib(), df.memory_usage(deep=True).sum() / 2**20, tfidf.nnz)
+"""
+
+def synthetic_catalog(size: int, rng) -> pd.DataFrame:
+    """Movie rows with the dataset's columns and realistic cardinalities"""
+    genres = ['Action', 'Drama', 'Comedy', 'Romance', 'Thriller', 'Crime', 'Family', 'Sports', 'Biography', 'Horror']
+    keywords = ['wrestling', 'father', 'village', 'revenge', 'college', 'friendship', 'war', 'police', 'love',
+                'kingdom', 'epic', 'music', 'family', 'heist', 'ghost', 'politics', 'cricket', 'royal', 'spy', 'court']
+    first = rng.integers(0, len(genres), size)
+    second = (first + rng.integers(1, len(genres), size)) % len(genres)
+    actors = rng.integers(0, size // 20 + 100, (size, 3))
+    words = rng.integers(0, len(keywords), (size, 3))
+    
+    return pd.DataFrame({
+        'title': synthetic_titles(size, rng),
+        'language': rng.choice(['Hindi', 'Tamil', 'Telugu', 'Kannada', 'Malayalam', 'Bengali', 'Marathi'], size),
+        'genres': [f'{genres[a]},{genres[b]}' for a, b in zip(first, second)],
+        'director': [f'Director {i}' for i in rng.integers(0, size // 100 + 50, size)],
+        'main_actors': [f'Actor {a},Actor {b},Actor {c}' for a, b, c in actors],
+        'keywords': [' '.join(keywords[w] for w in row) for row in words],
+        'year': rng.integers(1970, 2025, size),
+        'rating': np.round(rng.uniform(4, 9.5, size), 1),
+    })
+
+def write_synthetic_catalog(path: str, size: int, rng):
+    """Write a movie CSV with the dataset's columns and realistic cardinalities"""
+    synthetic_catalog(size, rng).to_csv(path, index=False)
+
+def bench_ingest(chunk_size: int = 50_000):
+    """Peak memory and time of loading the CSV and fitting TF-IDF, whole-file vs chunked"""
+    print(f"⏱️  CSV load + TF-IDF fit, whole file vs {chunk_size:,}-row chunks")
+    print("=" * 70)
+    print(f"{'titles':>12} {'mode':>10} {'seconds':>9} {'peak RSS MiB':>13} {'catalog MiB':>12} {'nnz':>12}")
+    
+    rng = np.random.default_rng(42)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'movies.csv')
+        for size in INGEST_SIZES:
+            write_synthetic_catalog(path, size, rng)
+            
+            for mode, chunk in (('whole', 0), ('chunked', chunk_size)):
+                output = subprocess.run([sys.executable, '-c', INGEST_SCRIPT, path, str(chunk)], capture_output=True,
+                                        text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+                seconds, peak, catalog, nnz = output.split()[-4:]
+                label = f'{size:,}' if mode == 'whole' else ''
+                print(f"{label:>12} {mode:>10} {float(seconds):>9.1f} {float(peak):>13.0f} {float(catalog):>12.0f} "
+                      f"{int(nnz):>12,}")
+
+CATALOG_SCRIPT = PEAK_RSS + """
+import sys, time
+from catalog_store import load_catalog
+path, columns = sys.argv[1], sys.argv[2].split(',') if sys.argv[2] else None
+start = time.perf_counter()
+df = load_catalog(path, columns)
+print(time.perf_counter() - start, peak_rss_mib(), df.memory_usage(deep=True).sum() / 2**20)
+"""
+
+def bench_catalog():
+    """Load time and memory of the CSV vs Parquet / Arrow catalogs, whole and title-only"""
+    from catalog_store import convert_catalog
+    
+    print("⏱️  Catalog load: CSV vs Parquet / Arrow, all columns vs title only")
+    print("=" * 78)
+    print(f"{'titles':>12} {'format':>8} {'columns':>8} {'file MiB':>9} {'seconds':>8} {'peak RSS MiB':>13} "
+          f"{'frame MiB':>10}")
+    
+    rng = np.random.default_rng(42)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in INGEST_SIZES:
+            paths = {'csv': os.path.join(tmp_dir, 'movies.csv')}
+            write_synthetic_catalog(paths['csv'], size, rng)
+            for file_format in ('parquet', 'arrow'):
+                paths[file_format] = os.path.join(tmp_dir, f'movies.{file_format}')
+                convert_catalog(paths['csv'], paths[file_format])
+            
+            label = f'{size:,}'
+            for file_format, columns in (('csv', ''), ('csv', 'title'), ('parquet', ''), ('parquet', 'title'),
+                                         ('arrow', ''), ('arrow', 'title')):
+                output = subprocess.run([sys.executable, '-c', CATALOG_SCRIPT, paths[file_format], columns],
+                                        capture_output=True, text=True, check=True,
+                                        cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+                seconds, peak, frame = output.split()[-3:]
+                file_mb = os.path.getsize(paths[file_format]) / 2**20
+                print(f"{label:>12} {file_format:>8} {columns or 'all':>8} {file_mb:>9.1f} {float(seconds):>8.2f} "
+                      f"{float(peak):>13.0f} {float(frame):>10.1f}")
+                label = ''
+
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+import movie_database_generator as generator
+imported = time.perf_counter()
+generator.get_movies_by_genre('Action')
+first = time.perf_counter()
+generator.get_movies_by_genre('Drama')
+print(imported - start, first - imported, time.perf_counter() - first)
+"""
+
+def bench_startup(runs: int = 10):
+    """Cold import time of the generated movie database vs the first and later lookups"""
+    print(f"⏱️  movie_database_generator cold start, median of {runs} fresh interpreters (ms)")
+    print("=" * 60)
+    print(f"{'import':>10} {'first lookup':>14} {'later lookups':>15}")
+    
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        timings.append([float(value) * 1000 for value in output.split()[-3:]])
+    
+    imported, first, later = np.median(timings, axis=0)
+    print(f"{imported:>10.1f} {first:>14.1f} {later:>15.3f}")
+
+def pandas_reason(input_movie, movie, similarity_score: float) -> str:
+    """Recommendation reason computed from a pandas row and a row dict, splitting strings per call"""
+    reasons = []
+    common_genres = set(input_movie['genres'].lower().split(',')) & set(movie['genres'].lower().split(','))
+    if common_genres:
+        reasons.append(f"Similar genres: {', '.join(common_genres)}")
+    if input_movie['director'].lower() == movie['director'].lower() and input_movie['director']:
+        reasons.append(f"Same director: {input_movie['director']}")
+    common_actors = set(input_movie['main_actors'].lower().split(',')) & set(movie['main_actors'].lower().split(','))
+    if common_actors:
+        reasons.append(f"Common actors: {', '.join(common_actors)}")
+    if input_movie['language'].lower() == movie['language'].lower():
+        reasons.append(f"Same language: {input_movie['language']}")
+    if not reasons:
+        if similarity_score > 0.7:
+            reasons.append("Highly similar themes and style")
+        elif similarity_score > 0.5:
+            reasons.append("Similar storytelling and themes")
+        else:
+            reasons.append("Related content and style")
+    return " | ".join(reasons)
+
+def bench_records(num_recommendations: int = 10, num_requests: int = 200):
+    """Assemble recommendation responses from pandas rows (iloc + take) vs the movie record store"""
+    from movie_recommender import MovieRecommendationEngine
+    from movie_records import build_records
+    
+    print(f"⏱️  Building a {num_recommendations}-movie response, rows and reasons only (median µs)")
+    print("=" * 70)
+    print(f"{'titles':>12} {'pandas rows':>12} {'records':>9} {'speedup':>9} {'build s':>8}")
+    
+    rng = np.random.default_rng(42)
+    engine = MovieRecommendationEngine.__new__(MovieRecommendationEngine)
+    
+    for size in CATALOG_SIZES:
+        df = MovieRecommendationEngine.prepare_catalog(synthetic_catalog(size, rng))
+        start = time.perf_counter()
+        records = build_records(df)
+        build_seconds = time.perf_counter() - start
+        
+        seeds = rng.integers(0, size, num_requests)
+        results = rng.integers(0, size, (num_requests, num_recommendations))
+        scores = rng.random(num_recommendations).tolist()
+        
+        def pandas_response(request):
+            input_movie = df.iloc[seeds[request]]
+            rows = df.take(results[request]).to_dict('records')
+            return [{**{field: movie[field] for field in ('title', 'language', 'genres', 'director', 'main_actors',
+                                                          'year', 'rating')},
+                     'reason': pandas_reason(input_movie, movie, score)} for movie, score in zip(rows, scores)]
+        
+        def records_response(request):
+            input_movie = records[seeds[request]]
+            return [{**movie.to_dict(), 'reason': engine.generate_recommendation_reason(input_movie, movie, score)}
+                    for movie, score in zip((records[idx] for idx in results[request]), scores)]
+        
+        # Both paths must build the same rows and reasons (reason parts in set order)
+        normalize = lambda response: [{**movie, 'reason': sorted(movie['reason'].split(' | '))} for movie in response]
+        assert normalize(pandas_response(0)) == normalize(records_response(0))
+        
+        def timed(func):
+            timings = []
+            for request in range(num_requests):
+                start = time.perf_counter()
+                func(request)
+                timings.append((time.perf_counter() - start) * 1e6)
+            return float(np.median(timings))
+        
+        old_us = timed(pandas_response)
+        new_us = timed(records_response)
+        print(f"{size:>12,} {old_us:>12.0f} {new_us:>9.1f} {old_us / new_us:>8.0f}x {build_seconds:>8.2f}")
+
+SEARCH_QUERIES = ['dangal', 'Dhoom', 'khan', 'baahu', 'tamil action', 'Aamir Khan', 'love aaj kal', 'rajamouli',
+                  'romantic thriller', 'xyzzy']
+
+def scan_search(movies: list, query: str, limit: int) -> list:
+    """The former search_movies: substring test of five lower-cased fields per movie, first limit matches"""
+    query = query.lower()
+    results = []
+    for movie in movies:
+        if (query in movie["title"].lower() or query in movie["genre"].lower() or
+                query in movie["language"].lower() or query in movie["cast"].lower() or
+                query in movie["director"].lower()):
+            results.append(movie)
+        if len(results) >= limit:
+            break
+    return results
+
+def bench_search(limit: int = 10, repeats: int = 50):
+    """Generated-catalog search: linear scan of every field vs the inverted search index"""
+    from movie_database_generator import generate_comprehensive_database
+    from search_index import SearchIndex
+    
+    print(f"⏱️  Generated-catalog search, top {limit} (µs per query, median and slowest of {len(SEARCH_QUERIES)} queries)")
+    print("=" * 68)
+    print(f"{'movies':>12} {'scan':>10} {'scan max':>10} {'index':>10} {'index max':>10} {'build s':>9}")
+    
+    for copies in (1, 10, 100):
+        movies = [movie for seed in range(copies) for movie in generate_comprehensive_database(seed)]
+        start = time.perf_counter()
+        index = SearchIndex(movies, scores=[movie['rating'] for movie in movies])
+        build_seconds = time.perf_counter() - start
+        
+        scan_us = [time_call(lambda: scan_search(movies, query, limit), repeats) * 1000 for query in SEARCH_QUERIES]
+        index_us = [time_call(lambda: index.search_ids(query, limit), repeats) * 1000 for query in SEARCH_QUERIES]
+        print(f"{len(movies):>12,} {np.median(scan_us):>10.0f} {max(scan_us):>10.0f} {np.median(index_us):>10.0f} "
+              f"{max(index_us):>10.0f} {build_seconds:>9.2f}")
+
+BENCHMARKS = {
+    'top_n': bench_top_n,
+    'autocomplete': bench_autocomplete,
+    'profile': bench_profile,
+    'ann': bench_ann,
+    'embeddings': bench_embeddings,
+    'ingest': bench_ingest,
+    'catalog': bench_catalog,
+    'records': bench_records,
+    'startup': bench_startup,
+    'search': bench_search,
+}
+
+def main():
+    """Run the benchmarks named on the command line, or all of them"""
+    names = sys.argv[1:] or list(BENCHMARKS)
+    
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"❌ Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            continue
+        BENCHMARKS[name]()
+        print()
+
+if __name__ == "__main__":
+    main()
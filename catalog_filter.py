@@ -0,0 +1,135 @@
+"""
+Columnar Catalog Filters
+Language, genre and rating columns normalized once at load time, so filter requests
+are answered with boolean mask intersections instead of string operations on a frame copy
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+BITS_PER_WORD = 64
+
+def split_genres(genres: str) -> List[str]:
+    """Split a comma-separated genre string into normalized genre names"""
+    return [genre.strip().lower() for genre in str(genres).split(',') if genre.strip()]
+
+class CatalogFilter:
+    """
+    Pre-normalized filter columns of the movie catalog
+    
+    - language: categorical codes (int16) over the lower-cased language names
+    - genres: bitset per movie, one bit per distinct lower-cased genre
+    - rating: float32, NaN where the rating is missing
+    """
+    
+    def __init__(self, df: pd.DataFrame):
+        """
+        Build the filter columns
+        
+        Args:
+            df: Movie catalog with language, genres and rating columns
+        """
+        self.num_movies = len(df)
+        
+        languages = pd.Categorical(df['language'].fillna('').astype(str).str.strip().str.lower())
+        self.language_codes = languages.codes.astype(np.int16)
+        self.language_ids = {name: code for code, name in enumerate(languages.categories)}
+        
+        # Genre vocabulary in first-seen order; movie i has bit g set if it has genre g
+        self.genre_ids: Dict[str, int] = {}
+        self.genre_bits = self._genre_bits(df)
+        
+        self.rating = pd.to_numeric(df['rating'], errors='coerce').to_numpy(dtype=np.float32)
+    
+    def _genre_bits(self, df: pd.DataFrame) -> np.ndarray:
+        """Genre bitsets of the rows of df, adding unseen genres to the vocabulary"""
+        genre_lists = [split_genres(genres) for genres in df['genres'].fillna('')]
+        for genres in genre_lists:
+            for genre in genres:
+                self.genre_ids.setdefault(genre, len(self.genre_ids))
+        
+        num_words = max(1, -(-len(self.genre_ids) // BITS_PER_WORD))
+        genre_bits = np.zeros((len(genre_lists), num_words), dtype=np.uint64)
+        for idx, genres in enumerate(genre_lists):
+            for genre in genres:
+                word, bit = divmod(self.genre_ids[genre], BITS_PER_WORD)
+                genre_bits[idx, word] |= np.uint64(1 << bit)
+        return genre_bits
+    
+    def add(self, df: pd.DataFrame):
+        """
+        Append the filter columns of newly added movies
+        
+        Args:
+            df: New movies, in the order they were appended to the catalog
+        """
+        languages = pd.Categorical(df['language'].fillna('').astype(str).str.strip().str.lower())
+        codes = np.array([self.language_ids.setdefault(name, len(self.language_ids)) for name in languages.categories],
+                         dtype=np.int16)
+        self.language_codes = np.concatenate([self.language_codes, codes[languages.codes]])
+        
+        # New genres may need another bitset word for every movie
+        genre_bits = self._genre_bits(df)
+        if genre_bits.shape[1] > self.genre_bits.shape[1]:
+            padding = genre_bits.shape[1] - self.genre_bits.shape[1]
+            self.genre_bits = np.pad(self.genre_bits, ((0, 0), (0, padding)))
+        self.genre_bits = np.vstack([self.genre_bits, genre_bits])
+        
+        ratings = pd.to_numeric(df['rating'], errors='coerce').to_numpy(dtype=np.float32)
+        self.rating = np.concatenate([self.rating, ratings])
+        self.num_movies += len(df)
+    
+    def language_mask(self, language: str) -> np.ndarray:
+        """Movies whose language equals the given one (case-insensitive)"""
+        code = self.language_ids.get(language.strip().lower())
+        if code is None:
+            return np.zeros(self.num_movies, dtype=bool)
+        return self.language_codes == code
+    
+    def genre_mask(self, genre: str) -> np.ndarray:
+        """
+        Movies having a genre that contains the given text (case-insensitive)
+        
+        Matching is done on the small genre vocabulary, so "sci" still finds "Sci-Fi"
+        without a string operation per movie.
+        """
+        query = genre.strip().lower()
+        word_masks = np.zeros(self.genre_bits.shape[1], dtype=np.uint64)
+        for name, genre_id in self.genre_ids.items():
+            if query in name:
+                word, bit = divmod(genre_id, BITS_PER_WORD)
+                word_masks[word] |= np.uint64(1 << bit)
+        
+        return (self.genre_bits & word_masks).any(axis=1)
+    
+    def filter(self, language: Optional[str] = None, genre: Optional[str] = None,
+               min_rating: Optional[float] = None, offset: int = 0,
+               limit: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """
+        Find movies matching all given filters
+        
+        Args:
+            language: Filter by language
+            genre: Filter by genre
+            min_rating: Minimum rating filter
+            offset: Number of matches to skip
+            limit: Maximum number of matches to return
+        
+        Returns:
+            (positional indices of the requested page in dataset order, total number of matches)
+        """
+        mask = np.ones(self.num_movies, dtype=bool)
+        
+        if language:
+            mask &= self.language_mask(language)
+        
+        if genre:
+            mask &= self.genre_mask(genre)
+        
+        if min_rating:
+            mask &= self.rating >= np.float32(min_rating)
+        
+        matches = np.flatnonzero(mask)
+        end = None if limit is None else offset + limit
+        return matches[offset:end], len(matches)
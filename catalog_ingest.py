@@ -0,0 +1,179 @@
+"""
+Chunked Catalog Ingestion
+Reads the movie CSV in fixed-size chunks with explicit dtypes and fits TF-IDF in two passes
+over the feature strings, so the memory needed on top of the loaded catalog is bounded by
+the chunk size instead of growing with the whole file
+"""
+
+from numbers import Integral
+from typing import Callable, Dict, List
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from pandas.api.types import union_categoricals
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Columns the recommendation engine uses; any other column of the file is not loaded
+CATALOG_COLUMNS = ('title', 'language', 'genres', 'director', 'main_actors', 'keywords', 'year', 'rating')
+
+# Columns parsed as strings; missing columns are filled in by the prepare step
+STRING_COLUMNS = ('title', 'language', 'genres', 'director', 'main_actors', 'keywords')
+
+# Few distinct values across many movies, so they are stored as categoricals once cleaned
+CATEGORICAL_COLUMNS = ('language', 'genres', 'director')
+
+NUMERIC_DTYPES = {'rating': 'float64'}
+
+def read_catalog(path: str, prepare: Callable[[pd.DataFrame], pd.DataFrame],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
+    """
+    Read a movie CSV chunk by chunk, cleaning each chunk before the next one is parsed
+    
+    Args:
+        path: Path to the movie dataset CSV file
+        prepare: Cleans one chunk and adds its combined_features (MovieRecommendationEngine.prepare_catalog)
+        chunk_size: Rows parsed per chunk
+    
+    Returns:
+        The catalog columns of the whole file, with the categorical columns dictionary-encoded
+    """
+    dtypes = {**{column: 'str' for column in STRING_COLUMNS}, **NUMERIC_DTYPES}
+    
+    pieces: Dict[str, List] = {}
+    usecols = lambda column: column in CATALOG_COLUMNS
+    for chunk in pd.read_csv(path, dtype=dtypes, usecols=usecols, chunksize=chunk_size):
+        chunk = prepare(chunk)
+        for column in chunk.columns:
+            values = chunk[column]
+            if column in CATEGORICAL_COLUMNS:
+                values = values.astype('category')
+            pieces.setdefault(column, []).append(values)
+        del chunk
+    
+    if not pieces:
+        return prepare(pd.read_csv(path, dtype=dtypes, usecols=usecols))
+    
+    # Concatenate column by column, releasing each column's chunks before the next one
+    columns = {}
+    for column in list(pieces):
+        chunks = pieces.pop(column)
+        if column in CATEGORICAL_COLUMNS:
+            columns[column] = pd.Series(union_categoricals(chunks), name=column)
+        else:
+            columns[column] = pd.concat(chunks, ignore_index=True)
+        del chunks
+    return pd.DataFrame(columns)
+
+def fill_missing(values: pd.Series, fill_value: str) -> pd.Series:
+    """fillna that also works on categorical columns, adding the fill value as a category"""
+    if isinstance(values.dtype, pd.CategoricalDtype) and fill_value not in values.cat.categories:
+        if not values.hasnans:
+            return values
+        values = values.cat.add_categories([fill_value])
+    return values.fillna(fill_value)
+
+def append_rows(df: pd.DataFrame, new_rows: pd.DataFrame) -> pd.DataFrame:
+    """Append cleaned rows to a catalog, keeping its categorical columns dictionary-encoded"""
+    catalog = pd.concat([df, new_rows], ignore_index=True)
+    for column in CATEGORICAL_COLUMNS:
+        if column in df and column in new_rows and isinstance(df[column].dtype, pd.CategoricalDtype):
+            catalog[column] = union_categoricals([df[column], new_rows[column].astype('category')])
+    return catalog
+
+def fit_tfidf_chunked(vectorizer: TfidfVectorizer, texts: pd.Series,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> sp.csr_matrix:
+    """
+    Fit a TF-IDF vectorizer and transform texts in two passes over chunks
+    
+    The first pass counts document and term frequencies of every n-gram, the second
+    transforms each chunk with the selected vocabulary. The fitted vocabulary, idf and
+    matrix are the same as vectorizer.fit_transform(texts), without materializing the
+    count matrix of every candidate n-gram at once.
+    
+    Args:
+        vectorizer: Unfitted idf-weighted vectorizer; its min_df, max_df and max_features are honoured
+        texts: Combined feature strings of all movies
+        chunk_size: Documents counted or transformed per chunk
+    
+    Returns:
+        TF-IDF matrix of shape (N, F)
+    """
+    num_docs = len(texts)
+    analyzer = vectorizer.build_analyzer()
+    
+    # Pass 1: document and term frequency of every candidate term
+    term_ids: Dict[str, int] = {}
+    doc_freq = np.zeros(0, dtype=np.int64)
+    term_freq = np.zeros(0, dtype=np.int64)
+    for start in range(0, num_docs, chunk_size):
+        counter = CountVectorizer(analyzer=analyzer, dtype=np.int64)
+        try:
+            counts = counter.fit_transform(texts.iloc[start:start + chunk_size])
+        except ValueError:
+            continue  # Chunk without a single term
+        
+        ids = np.fromiter((term_ids.setdefault(term, len(term_ids)) for term in counter.get_feature_names_out()),
+                          dtype=np.int64, count=counts.shape[1])
+        if len(term_ids) > doc_freq.size:
+            doc_freq = np.pad(doc_freq, (0, len(term_ids) - doc_freq.size))
+            term_freq = np.pad(term_freq, (0, len(term_ids) - term_freq.size))
+        doc_freq[ids] += np.bincount(counts.indices, minlength=counts.shape[1])
+        term_freq[ids] += np.asarray(counts.sum(axis=0)).ravel()
+    
+    # Select features exactly like CountVectorizer: alphabetical order, df bounds, then the most frequent
+    terms = sorted(term_ids)
+    order = np.fromiter((term_ids[term] for term in terms), dtype=np.int64, count=len(terms))
+    del term_ids
+    doc_freq, term_freq = doc_freq[order], term_freq[order].astype(vectorizer.dtype)
+    
+    max_doc_count = vectorizer.max_df if isinstance(vectorizer.max_df, Integral) else vectorizer.max_df * num_docs
+    min_doc_count = vectorizer.min_df if isinstance(vectorizer.min_df, Integral) else vectorizer.min_df * num_docs
+    if max_doc_count < min_doc_count:
+        raise ValueError("max_df corresponds to < documents than min_df")
+    
+    mask = (doc_freq <= max_doc_count) & (doc_freq >= min_doc_count)
+    if vectorizer.max_features is not None and mask.sum() > vectorizer.max_features:
+        most_frequent = (-term_freq[mask]).argsort()[:vectorizer.max_features]
+        limited = np.zeros(len(terms), dtype=bool)
+        limited[np.flatnonzero(mask)[most_frequent]] = True
+        mask = limited
+    
+    selected = np.flatnonzero(mask)
+    if not selected.size:
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+    
+    vectorizer.vocabulary_ = {terms[idx]: position for position, idx in enumerate(selected)}
+    # Smoothed idf as in TfidfTransformer: one extra document containing every term
+    vectorizer.idf_ = np.log((num_docs + vectorizer.smooth_idf) / (doc_freq[selected] + vectorizer.smooth_idf)) + 1.0
+    
+    # Pass 2: transform chunk by chunk with the fixed vocabulary
+    chunks = [vectorizer.transform(texts.iloc[start:start + chunk_size]) for start in range(0, num_docs, chunk_size)]
+    return stack_rows(chunks, len(vectorizer.vocabulary_))
+
+def stack_rows(chunks: List[sp.csr_matrix], num_features: int) -> sp.csr_matrix:
+    """
+    Stack CSR chunks into one matrix, freeing each chunk once it is copied
+    
+    The output arrays are allocated up front but only touched as chunks are copied in,
+    so peak memory is the final matrix plus what is left of the chunks instead of twice
+    the matrix as with sp.vstack.
+    """
+    num_rows = sum(chunk.shape[0] for chunk in chunks)
+    nnz = sum(chunk.nnz for chunk in chunks)
+    data = np.empty(nnz, dtype=chunks[0].dtype if chunks else np.float64)
+    indices = np.empty(nnz, dtype=np.int32 if nnz < np.iinfo(np.int32).max else np.int64)
+    indptr = np.zeros(num_rows + 1, dtype=indices.dtype)
+    
+    row = position = 0
+    while chunks:
+        chunk = chunks.pop(0)
+        data[position:position + chunk.nnz] = chunk.data
+        indices[position:position + chunk.nnz] = chunk.indices
+        indptr[row + 1:row + chunk.shape[0] + 1] = chunk.indptr[1:] + position
+        row += chunk.shape[0]
+        position += chunk.nnz
+        del chunk
+    
+    return sp.csr_matrix((data, indices, indptr), shape=(num_rows, num_features))
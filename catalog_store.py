@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Columnar Catalog Files
+Converts the movie CSV to Parquet or Arrow IPC with dictionary-encoded language, genres and
+director columns, and loads catalogs with column projection, so every consumer parses only
+the columns it needs instead of the whole CSV text
+"""
+
+import argparse
+import os
+import time
+from typing import Optional, Sequence
+import pandas as pd
+from catalog_ingest import CATEGORICAL_COLUMNS, STRING_COLUMNS
+
+# Extensions of the columnar formats; anything else is read as CSV
+FORMATS = {
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+
+# Bytes of CSV parsed per record batch while converting
+CONVERT_BLOCK_SIZE = 16 << 20
+
+def catalog_format(path: str) -> str:
+    """File format of a catalog path: 'parquet', 'arrow' or 'csv'"""
+    return FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+def convert_catalog(csv_path: str, out_path: str) -> int:
+    """
+    Convert a movie CSV to Parquet or Arrow IPC, batch by batch
+    
+    Args:
+        csv_path: Path to the movie dataset CSV file
+        out_path: Output file; the extension (.parquet, .arrow or .feather) selects the format
+    
+    Returns:
+        Number of converted movies
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    
+    out_format = catalog_format(out_path)
+    if out_format == 'csv':
+        raise ValueError(f"Unknown columnar format for {out_path} (use one of {', '.join(FORMATS)})")
+    
+    column_types = {column: pa.string() for column in STRING_COLUMNS}
+    column_types.update({'year': pa.int32(), 'rating': pa.float64()})
+    reader = pa_csv.open_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(block_size=CONVERT_BLOCK_SIZE),
+        # Empty fields become nulls, as in pd.read_csv, so prepare_catalog fills them the same way
+        convert_options=pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+    )
+    
+    def encode(batch):
+        """Dictionary-encode the low-cardinality columns of one batch"""
+        arrays = [
+            pc.dictionary_encode(array) if name in CATEGORICAL_COLUMNS else array
+            for name, array in zip(batch.schema.names, batch.columns)
+        ]
+        return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+    
+    tmp_path = out_path + '.tmp'
+    num_movies = 0
+    try:
+        if out_format == 'parquet':
+            # Every row group keeps its own dictionaries, so batches are written as they are parsed
+            writer = None
+            for batch in reader:
+                batch = encode(batch)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, batch.schema, compression='zstd')
+                writer.write_batch(batch)
+                num_movies += batch.num_rows
+            if writer is None:
+                raise ValueError(f"{csv_path} has no rows")
+            writer.close()
+        else:
+            # The IPC file format allows one dictionary per column, so batches are unified first
+            table = pa.Table.from_batches([encode(batch) for batch in reader]).unify_dictionaries()
+            num_movies = table.num_rows
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    return num_movies
+
+def load_catalog(path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Load a movie catalog, reading only the requested columns
+    
+    Parquet and Arrow files skip unrequested columns entirely and return the dictionary-encoded
+    columns as categoricals. Arrow files are memory-mapped. CSV files are still parsed but only
+    the requested columns are kept.
+    
+    Args:
+        path: Catalog file (.parquet, .arrow, .feather or CSV)
+        columns: Columns to load; requested columns missing from the file are skipped.
+            None loads every column
+    
+    Returns:
+        Catalog frame with the requested columns in file order
+    """
+    file_format = catalog_format(path)
+    
+    if file_format == 'csv':
+        wanted = None if columns is None else set(columns)
+        return pd.read_csv(path, usecols=None if wanted is None else lambda column: column in wanted)
+    
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    
+    if file_format == 'parquet':
+        names = pq.read_schema(path).names
+    else:
+        names = feather.read_table(path, memory_map=True).schema.names
+    projection = None if columns is None else [name for name in names if name in columns]
+    
+    if file_format == 'parquet':
+        table = pq.read_table(path, columns=projection)
+    else:
+        table = feather.read_table(path, columns=projection, memory_map=True)
+    return table.to_pandas()
+
+def main():
+    """Command line entry point: convert a dataset CSV to a columnar catalog file"""
+    parser = argparse.ArgumentParser(description='Convert the movie dataset to a columnar catalog file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    convert = subparsers.add_parser('convert', help='Convert a dataset CSV to Parquet or Arrow IPC')
+    convert.add_argument('--dataset', default='indian_movies_dataset.csv', help='Path to the movie dataset CSV')
+    convert.add_argument('--out', default='indian_movies_dataset.parquet',
+                         help='Output file; .parquet, .arrow or .feather selects the format')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'convert':
+        start = time.perf_counter()
+        num_movies = convert_catalog(args.dataset, args.out)
+        size_mb = os.path.getsize(args.out) / 2**20
+        print(f"✅ Wrote {num_movies} movies to {args.out} ({size_mb:.1f} MiB) in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Dataset Statistics
+Catalog statistics kept as running counters, computed once when the model is built,
+persisted with the model bundle and updated incrementally as movies are added or removed
+"""
+
+import hashlib
+import json
+import math
+from collections import Counter
+from typing import Dict, Optional, Tuple
+import pandas as pd
+
+TOP_DIRECTORS = 10
+
+class DatasetStats:
+    """
+    Running statistics of the movie catalog
+    
+    Counts per language, director and year plus the rating sum are enough to derive
+    every reported statistic, and each of them can be updated by adding or removing rows.
+    """
+    
+    def __init__(self):
+        self.total_movies = 0
+        self.languages = Counter()
+        self.directors = Counter()
+        self.years = Counter()
+        self.rating_sum = 0.0
+        self.rating_count = 0
+        
+        # Bumped on every change, so serialized payloads know when they are stale
+        self.version = 0
+        self._payload: Optional[Tuple[int, bytes, str]] = None
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'DatasetStats':
+        """Compute statistics for a whole catalog"""
+        stats = cls()
+        stats.add(df)
+        return stats
+    
+    def _update(self, df: pd.DataFrame, sign: int):
+        """Add (sign=1) or subtract (sign=-1) the rows of a frame"""
+        self.total_movies += sign * len(df)
+        
+        for counter, column in ((self.languages, 'language'), (self.directors, 'director'), (self.years, 'year')):
+            counts = df[column].dropna().value_counts(sort=False)
+            for value, count in zip(counts.index.tolist(), counts.tolist()):
+                counter[value] += sign * count
+                if counter[value] <= 0:
+                    del counter[value]
+        
+        ratings = pd.to_numeric(df['rating'], errors='coerce').dropna()
+        self.rating_sum += sign * float(ratings.sum())
+        self.rating_count += sign * len(ratings)
+        
+        self.version += 1
+    
+    def add(self, df: pd.DataFrame):
+        """Account for newly added movies"""
+        self._update(df, 1)
+    
+    def remove(self, df: pd.DataFrame):
+        """Account for removed movies"""
+        self._update(df, -1)
+    
+    def to_dict(self) -> Dict:
+        """Statistics in the /api/stats format"""
+        year_range = None
+        if self.years:
+            year_range = f"{format_year(min(self.years))} - {format_year(max(self.years))}"
+        
+        average_rating = None
+        if self.rating_count:
+            average_rating = round(self.rating_sum / self.rating_count, 2)
+        
+        return {
+            'total_movies': self.total_movies,
+            'languages': dict(self.languages.most_common()),
+            'top_directors': dict(self.directors.most_common(TOP_DIRECTORS)),
+            'year_range': year_range,
+            'average_rating': average_rating
+        }
+    
+    def payload(self) -> Tuple[bytes, str]:
+        """
+        Serialized /api/stats response and its ETag
+        
+        The JSON body is built once per statistics version and reused until the next change.
+        """
+        if self._payload is None or self._payload[0] != self.version:
+            body = json.dumps({'success': True, 'stats': self.to_dict()}).encode('utf-8')
+            self._payload = (self.version, body, hashlib.sha1(body).hexdigest())
+        return self._payload[1], self._payload[2]
+    
+    def to_state(self) -> Dict:
+        """JSON-serializable counters for the model bundle"""
+        return {
+            'total_movies': self.total_movies,
+            'languages': list(self.languages.items()),
+            'directors': list(self.directors.items()),
+            'years': list(self.years.items()),
+            'rating_sum': self.rating_sum,
+            'rating_count': self.rating_count
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> 'DatasetStats':
+        """Restore statistics saved with to_state"""
+        stats = cls()
+        stats.total_movies = state['total_movies']
+        stats.languages = Counter(dict(state['languages']))
+        stats.directors = Counter(dict(state['directors']))
+        stats.years = Counter(dict(state['years']))
+        stats.rating_sum = state['rating_sum']
+        stats.rating_count = state['rating_count']
+        return stats
+
+def format_year(year) -> str:
+    """Format a year without a trailing .0 when the column was read as float"""
+    if isinstance(year, float) and math.isfinite(year) and year.is_integer():
+        return str(int(year))
+    return str(year)
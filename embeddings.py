@@ -0,0 +1,57 @@
+"""
+Dense Movie Embeddings
+Truncated SVD of the TF-IDF matrix: every movie becomes one L2-normalized float32 row of a
+contiguous (N × d) array, so similarities are BLAS dot products instead of sparse products
+"""
+
+from typing import Tuple
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+
+MIN_EMBEDDING_DIM = 8
+MAX_EMBEDDING_DIM = 1024
+
+def fit_embeddings(tfidf_matrix, dim: int = 128, seed: int = 42) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Project a TF-IDF matrix onto its top singular directions
+    
+    Args:
+        tfidf_matrix: Sparse TF-IDF matrix of shape (N, F)
+        dim: Embedding dimensions (64-256 is a good range), capped at F - 1 and N - 1
+        seed: Random seed of the randomized SVD solver
+    
+    Returns:
+        Tuple of (embeddings, components): the L2-normalized float32 embeddings of shape (N, d)
+        and the float32 projection of shape (d, F) used to embed new movies
+    """
+    if not MIN_EMBEDDING_DIM <= dim <= MAX_EMBEDDING_DIM:
+        raise ValueError(f"Embedding dimension must be between {MIN_EMBEDDING_DIM} and {MAX_EMBEDDING_DIM}, got {dim}")
+    
+    num_movies, num_features = tfidf_matrix.shape
+    dim = max(1, min(dim, num_features - 1, num_movies - 1))
+    
+    svd = TruncatedSVD(n_components=dim, algorithm='randomized', random_state=seed)
+    embeddings = svd.fit_transform(tfidf_matrix)
+    
+    components = np.ascontiguousarray(svd.components_, dtype=np.float32)
+    return normalize_rows(embeddings), components
+
+def project_embeddings(tfidf_rows, components: np.ndarray) -> np.ndarray:
+    """
+    Embed TF-IDF rows with a fitted projection
+    
+    Args:
+        tfidf_rows: Sparse TF-IDF rows of shape (M, F) from the same vectorizer
+        components: Projection of shape (d, F) returned by fit_embeddings
+    
+    Returns:
+        L2-normalized float32 embeddings of shape (M, d)
+    """
+    return normalize_rows(tfidf_rows @ components.T)
+
+def normalize_rows(vectors) -> np.ndarray:
+    """L2-normalize rows into a C-contiguous float32 array, leaving all-zero rows at zero"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Load Test for the Movie Recommendation API
+Drives a running server (app_flask.py or app_asgi.py) with many concurrent clients
+and reports throughput and latency percentiles per endpoint
+
+Examples:
+    python loadtest.py --url http://localhost:5000 --concurrency 200 --duration 20
+    python loadtest.py --url http://localhost:8000 --concurrency 200 --duration 20
+"""
+
+import argparse
+import asyncio
+import csv
+import random
+import time
+from collections import defaultdict
+import httpx
+import numpy as np
+
+TITLES = ['Dangal', 'Baahubali', '3 Idiots', 'Lagaan', 'Queen', 'Pink', 'Andhadhun', 'Drishyam',
+          'KGF Chapter 1', 'RRR', 'Sultan', 'Piku']
+LANGUAGES = ['Hindi', 'Tamil', 'Telugu', 'Kannada', 'Malayalam']
+GENRES = ['Action', 'Comedy', 'Drama', 'Romance', 'Thriller']
+
+def load_titles(dataset_path: str):
+    """Read seed titles from a dataset CSV"""
+    with open(dataset_path, newline='', encoding='utf-8') as f:
+        return [row['title'] for row in csv.DictReader(f) if row.get('title')]
+
+def make_request(endpoint: str, rng: random.Random, titles):
+    """Build (method, path, kwargs) for one request to an endpoint"""
+    if endpoint == 'recommend':
+        return 'POST', '/api/recommend', {'json': {'movie_title': rng.choice(titles), 'num_recommendations': 10}}
+    if endpoint == 'autocomplete':
+        title = rng.choice(titles)
+        return 'GET', '/api/autocomplete', {'params': {'q': title[:rng.randint(2, len(title))], 'limit': 5}}
+    if endpoint == 'filter':
+        return 'POST', '/api/filter', {'json': {'language': rng.choice(LANGUAGES), 'genre': rng.choice(GENRES),
+                                                'page': rng.randint(1, 3)}}
+    return 'GET', '/api/stats', {}
+
+async def client_loop(client: httpx.AsyncClient, endpoints, titles, stop_at: float, seed: int, latencies, errors):
+    """One simulated user sending requests back to back until the deadline"""
+    rng = random.Random(seed)
+    while time.perf_counter() < stop_at:
+        endpoint = rng.choice(endpoints)
+        method, path, kwargs = make_request(endpoint, rng, titles)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            if response.status_code >= 500:
+                errors[endpoint] += 1
+        except httpx.HTTPError:
+            errors[endpoint] += 1
+            continue
+        latencies[endpoint].append((time.perf_counter() - start) * 1000)
+
+async def run(url: str, concurrency: int, duration: float, endpoints, titles, timeout: float):
+    """Run the load test and print one line per endpoint"""
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    
+    # One single-connection client per user: a shared pool with hundreds of connections costs
+    # the load generator more CPU than the servers under test. They share one SSL context.
+    ssl_context = httpx.create_ssl_context()
+    clients = [
+        httpx.AsyncClient(base_url=url, limits=httpx.Limits(max_connections=1), timeout=timeout, verify=ssl_context)
+        for _ in range(concurrency)
+    ]
+    
+    start = time.perf_counter()
+    stop_at = start + duration
+    await asyncio.gather(*(
+        client_loop(client, endpoints, titles, stop_at, seed, latencies, errors) for seed, client in enumerate(clients)
+    ))
+    elapsed = time.perf_counter() - start
+    
+    for client in clients:
+        await client.aclose()
+    
+    print(f"📈 {url}  concurrency={concurrency}  duration={elapsed:.1f}s")
+    print("=" * 72)
+    print(f"{'endpoint':>14} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    
+    total = 0
+    for endpoint in endpoints:
+        timings = latencies[endpoint]
+        total += len(timings)
+        if not timings:
+            print(f"{endpoint:>14} {0:>9} {errors[endpoint]:>7}")
+            continue
+        p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+        print(f"{endpoint:>14} {len(timings):>9} {errors[endpoint]:>7} {len(timings) / elapsed:>8.1f} "
+              f"{p50:>9.1f} {p95:>9.1f} {p99:>9.1f}")
+    print(f"{'total':>14} {total:>9} {sum(errors.values()):>7} {total / elapsed:>8.1f}")
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Load test the movie recommendation API')
+    parser.add_argument('--url', default='http://localhost:5000', help='Base URL of the running server')
+    parser.add_argument('--concurrency', type=int, default=100, help='Number of concurrent clients')
+    parser.add_argument('--duration', type=float, default=15.0, help='Test duration in seconds')
+    parser.add_argument('--endpoints', default='recommend,autocomplete,filter,stats',
+                        help='Comma-separated endpoints to exercise')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds')
+    parser.add_argument('--dataset', help='Dataset CSV to draw seed titles from (default: a few well-known titles)')
+    args = parser.parse_args()
+    
+    titles = load_titles(args.dataset) if args.dataset else TITLES
+    asyncio.run(run(args.url, args.concurrency, args.duration, args.endpoints.split(','), titles, args.timeout))
+
+if __name__ == "__main__":
+    main()
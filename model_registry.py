@@ -0,0 +1,177 @@
+"""
+Hot-Swappable Model Registry
+Builds a new recommendation engine in a background thread and swaps it in with a single
+reference assignment, so a new dataset or model bundle goes live without restarting workers.
+Requests read the reference once and keep using that engine until they finish; the old
+engine is released by reference counting once the last of them returns.
+"""
+
+import os
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Scheduling priority offset of the build thread, so serving threads win the CPU during a rebuild
+BUILD_NICENESS = 10
+
+class ModelRegistry:
+    """
+    Holds the live engine of a process and replaces it without blocking requests
+    
+    Handlers read `registry.current` once per request. Assigning an attribute is atomic
+    in Python, so every request sees either the old or the new engine, never a mix.
+    """
+    
+    def __init__(self, factory: Callable[[], object], watch_paths: Iterable[str] = (),
+                 poll_interval: float = 0):
+        """
+        Build the first engine and optionally start watching files for changes
+        
+        Args:
+            factory: Callable returning a fully built engine
+            watch_paths: Files whose modification triggers a rebuild (dataset CSV, bundle CURRENT pointer)
+            poll_interval: Seconds between checks of watch_paths; 0 disables file watching
+        """
+        self.factory = factory
+        self.watch_paths = list(watch_paths)
+        self.poll_interval = poll_interval
+        
+        self.version = 1
+        self.swapped_at = time.time()
+        self.last_build_seconds = 0.0
+        self.last_error = None
+        self.retired_engines = 0
+        self.released_engines = 0
+        
+        self._lock = threading.Lock()
+        self._build_thread = None
+        self._reload_requested = False
+        self._closed = threading.Event()
+        
+        start = time.perf_counter()
+        self._current = factory()
+        self.last_build_seconds = time.perf_counter() - start
+        
+        self._signatures = self._file_signatures()
+        if poll_interval > 0 and self.watch_paths:
+            threading.Thread(target=self._watch, name='model-watch', daemon=True).start()
+    
+    @property
+    def current(self):
+        """The live engine; read it once per request and use that reference throughout"""
+        return self._current
+    
+    @property
+    def building(self) -> bool:
+        """Whether a rebuild is in progress"""
+        return self._build_thread is not None and self._build_thread.is_alive()
+    
+    def reload(self, wait: bool = False) -> bool:
+        """
+        Build a new engine in the background and swap it in when it is ready
+        
+        A reload requested while a build is running is queued, and one more build
+        runs after the current one so the latest files are always picked up.
+        
+        Args:
+            wait: Block until the build (and any queued one) has finished
+        
+        Returns:
+            True if a new build was started, False if it was queued behind a running one
+        """
+        with self._lock:
+            started = not self.building
+            if started:
+                self._build_thread = threading.Thread(target=self._build, name='model-build', daemon=True)
+                self._build_thread.start()
+            else:
+                self._reload_requested = True
+            thread = self._build_thread
+        
+        if wait:
+            thread.join()
+        return started
+    
+    def status(self) -> Dict:
+        """Registry state for the admin endpoint"""
+        return {
+            'version': self.version,
+            'swapped_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.swapped_at)),
+            'building': self.building,
+            'last_build_seconds': round(self.last_build_seconds, 3),
+            'last_error': self.last_error,
+            'retired_engines': self.retired_engines,
+            'released_engines': self.released_engines,
+            'watching': self.poll_interval > 0 and bool(self.watch_paths),
+        }
+    
+    def close(self):
+        """Stop watching files; a running build still finishes"""
+        self._closed.set()
+    
+    def _build(self):
+        """Build engines until no further reload was requested, swapping each one in"""
+        self._lower_priority()
+        
+        while True:
+            # Signatures are taken before the build, so changes made during it trigger another one
+            signatures = self._file_signatures()
+            start = time.perf_counter()
+            try:
+                engine = self.factory()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"❌ Model rebuild failed, still serving version {self.version}: {str(e)}")
+            else:
+                self._swap(engine, time.perf_counter() - start)
+            
+            # A failed build is retried on the next change rather than on every poll
+            self._signatures = signatures
+            
+            with self._lock:
+                if not self._reload_requested:
+                    self._build_thread = None
+                    return
+                self._reload_requested = False
+    
+    def _swap(self, engine, build_seconds: float):
+        """Make a built engine live and count the old one as released once nothing references it"""
+        old, self._current = self._current, engine
+        self.version += 1
+        self.swapped_at = time.time()
+        self.last_build_seconds = build_seconds
+        self.last_error = None
+        
+        self.retired_engines += 1
+        weakref.finalize(old, self._released)
+        print(f"✅ Swapped in model version {self.version} (built in {build_seconds:.1f}s)")
+    
+    def _released(self):
+        self.released_engines += 1
+    
+    @staticmethod
+    def _lower_priority():
+        """Lower the scheduling priority of the calling thread where the OS supports it (Linux)"""
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), BUILD_NICENESS)
+        except (AttributeError, OSError):
+            pass
+    
+    def _file_signatures(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        """Modification time and size of every watched file (None if missing)"""
+        signatures = {}
+        for path in self.watch_paths:
+            try:
+                info = os.stat(path)
+                signatures[path] = (info.st_mtime_ns, info.st_size)
+            except OSError:
+                signatures[path] = None
+        return signatures
+    
+    def _watch(self):
+        """Poll the watched files and reload when one of them changes"""
+        while not self._closed.wait(self.poll_interval):
+            if not self.building and self._file_signatures() != self._signatures:
+                print("🔄 Model files changed, rebuilding in the background")
+                self.reload()
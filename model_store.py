@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Persisted Model Bundles
+Writes the fitted recommendation model to a versioned on-disk bundle and memory-maps it back,
+so every worker process shares one page-cache copy instead of refitting TF-IDF on startup
+"""
+
+import argparse
+import json
+import os
+import pickle
+import shutil
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from typing import Dict
+
+# Bump whenever the bundle layout changes; older bundles are rejected instead of misread
+BUNDLE_FORMAT_VERSION = 1
+
+CURRENT_POINTER = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+STATS_FILE = 'stats.json'
+LOOKUP_FILE = 'lookup_indexes.pkl'
+
+ARRAY_FILES = {
+    'tfidf_data': 'tfidf_data.npy',
+    'tfidf_indices': 'tfidf_indices.npy',
+    'tfidf_indptr': 'tfidf_indptr.npy',
+    'idf': 'idf.npy',
+    'neighbor_indices': 'neighbor_indices.npy',
+    'neighbor_scores': 'neighbor_scores.npy',
+}
+
+# Written only by engines scoring in the dense SVD space
+EMBEDDING_FILES = {
+    'embeddings': 'embeddings.npy',
+    'svd_components': 'svd_components.npy',
+}
+
+def save_bundle(engine, bundle_dir: str) -> str:
+    """
+    Write a fitted engine to a new version directory and point CURRENT at it
+    
+    Args:
+        engine: Fitted MovieRecommendationEngine
+        bundle_dir: Root directory holding all bundle versions
+    
+    Returns:
+        Path of the version directory that was written
+    """
+    # The random suffix keeps versions unique when one process saves twice within a second
+    version = time.strftime('%Y%m%d-%H%M%S') + f'-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+    version_dir = os.path.join(bundle_dir, version)
+    tmp_dir = version_dir + '.tmp'
+    os.makedirs(tmp_dir)
+    
+    try:
+        tfidf = engine.tfidf_matrix.tocsr()
+        arrays = {
+            'tfidf_data': tfidf.data.astype(np.float32),
+            'tfidf_indices': tfidf.indices.astype(np.int32),
+            'tfidf_indptr': tfidf.indptr.astype(np.int64),
+            'idf': engine.vectorizer.idf_.astype(np.float64),
+            'neighbor_indices': engine.neighbor_indices,
+            'neighbor_scores': engine.neighbor_scores,
+        }
+        for name, filename in ARRAY_FILES.items():
+            np.save(os.path.join(tmp_dir, filename), np.ascontiguousarray(arrays[name]))
+        
+        if engine.embeddings is not None:
+            np.save(os.path.join(tmp_dir, EMBEDDING_FILES['embeddings']), np.ascontiguousarray(engine.embeddings))
+            np.save(os.path.join(tmp_dir, EMBEDDING_FILES['svd_components']), np.ascontiguousarray(engine.svd_components))
+        
+        # The vocabulary is small enough to keep as JSON
+        vocabulary = {term: int(idx) for term, idx in engine.vectorizer.vocabulary_.items()}
+        with open(os.path.join(tmp_dir, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+            json.dump(vocabulary, f, ensure_ascii=False)
+        with open(os.path.join(tmp_dir, STATS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(engine.stats.to_state(), f, ensure_ascii=False)
+        
+        # Unpickling the lookup indexes and records is several times faster than rebuilding them
+        # from the catalog; they are built from the same frame that is saved, so they match it
+        catalog = engine.df
+        catalog.to_pickle(os.path.join(tmp_dir, 'catalog.pkl'))
+        with open(os.path.join(tmp_dir, LOOKUP_FILE), 'wb') as f:
+            pickle.dump(engine.lookup_indexes(catalog), f, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        manifest = {
+            'format_version': BUNDLE_FORMAT_VERSION,
+            'version': version,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'dataset_path': engine.dataset_path,
+            'num_movies': int(tfidf.shape[0]),
+            'num_features': int(tfidf.shape[1]),
+            'num_neighbors': int(engine.neighbor_indices.shape[1]),
+            'embedding_dim': int(engine.embeddings.shape[1]) if engine.embeddings is not None else None,
+            # An 'lsh' bundle has an empty neighbour index, so loaders must use the same backend
+            'similarity_backend': engine.similarity_backend,
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        
+        os.rename(tmp_dir, version_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    
+    # Atomically repoint CURRENT so readers never see a half-written bundle
+    pointer_tmp = os.path.join(bundle_dir, f'{CURRENT_POINTER}.{version}.tmp')
+    with open(pointer_tmp, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(bundle_dir, CURRENT_POINTER))
+    
+    return version_dir
+
+def current_version_dir(bundle_dir: str) -> str:
+    """Resolve the version directory CURRENT points at"""
+    with open(os.path.join(bundle_dir, CURRENT_POINTER), encoding='utf-8') as f:
+        return os.path.join(bundle_dir, f.read().strip())
+
+def has_bundle(bundle_dir: str) -> bool:
+    """Check whether a bundle root contains a CURRENT version"""
+    return bool(bundle_dir) and os.path.exists(os.path.join(bundle_dir, CURRENT_POINTER))
+
+def bundle_is_current(bundle_dir: str, dataset_path: str) -> bool:
+    """
+    Check whether a bundle root has a CURRENT version written no earlier than the dataset
+    A dataset edited after the last build is used directly, instead of being shadowed by the older bundle
+    """
+    if not has_bundle(bundle_dir):
+        return False
+    if not os.path.exists(dataset_path):
+        return True
+    return os.path.getmtime(os.path.join(bundle_dir, CURRENT_POINTER)) >= os.path.getmtime(dataset_path)
+
+def load_bundle(bundle_dir: str, mmap: bool = True) -> Dict:
+    """
+    Load the current bundle version
+    
+    Args:
+        bundle_dir: Root directory holding all bundle versions
+        mmap: Memory-map the arrays read-only instead of reading them into memory
+    
+    Returns:
+        Dictionary with manifest, tfidf_matrix, idf, vocabulary, neighbor arrays,
+        stats and lookup_indexes (None if the bundle has none), embeddings and svd_components
+        (None unless the bundle scores in the SVD space) and catalog
+    """
+    version_dir = current_version_dir(bundle_dir)
+    
+    with open(os.path.join(version_dir, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    if manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+        raise ValueError(
+            f"Bundle {version_dir} has format version {manifest.get('format_version')}, "
+            f"expected {BUNDLE_FORMAT_VERSION}. Rebuild it with: python model_store.py build"
+        )
+    
+    mmap_mode = 'r' if mmap else None
+    arrays = {
+        name: np.load(os.path.join(version_dir, filename), mmap_mode=mmap_mode)
+        for name, filename in ARRAY_FILES.items()
+    }
+    
+    tfidf_matrix = csr_matrix(
+        (arrays['tfidf_data'], arrays['tfidf_indices'], arrays['tfidf_indptr']),
+        shape=(manifest['num_movies'], manifest['num_features']),
+        copy=False
+    )
+    
+    with open(os.path.join(version_dir, 'vocabulary.json'), encoding='utf-8') as f:
+        vocabulary = json.load(f)
+    
+    # Embeddings exist only in bundles built with an embedding dimension
+    for name, filename in EMBEDDING_FILES.items():
+        path = os.path.join(version_dir, filename)
+        arrays[name] = np.load(path, mmap_mode=mmap_mode) if os.path.exists(path) else None
+    
+    # Statistics are optional so bundles written before they were added still load
+    stats = None
+    stats_path = os.path.join(version_dir, STATS_FILE)
+    if os.path.exists(stats_path):
+        with open(stats_path, encoding='utf-8') as f:
+            stats = json.load(f)
+    
+    # Likewise the lookup indexes; without them the engine rebuilds them from the catalog
+    lookup_indexes = None
+    lookup_path = os.path.join(version_dir, LOOKUP_FILE)
+    if os.path.exists(lookup_path):
+        with open(lookup_path, 'rb') as f:
+            lookup_indexes = pickle.load(f)
+    
+    return {
+        'manifest': manifest,
+        'tfidf_matrix': tfidf_matrix,
+        'idf': arrays['idf'],
+        'vocabulary': vocabulary,
+        'neighbor_indices': arrays['neighbor_indices'],
+        'neighbor_scores': arrays['neighbor_scores'],
+        'stats': stats,
+        'lookup_indexes': lookup_indexes,
+        'embeddings': arrays['embeddings'],
+        'svd_components': arrays['svd_components'],
+        'catalog': pd.read_pickle(os.path.join(version_dir, 'catalog.pkl')),
+    }
+
+def main():
+    """Command line entry point: build a bundle from a dataset CSV"""
+    parser = argparse.ArgumentParser(description='Build a persisted model bundle for the recommendation engine')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    build = subparsers.add_parser('build', help='Fit the model and write a new bundle version')
+    build.add_argument('--dataset', default='indian_movies_dataset.csv', help='Path to the movie dataset CSV')
+    build.add_argument('--out', default='model_bundle', help='Bundle root directory')
+    build.add_argument('--neighbors', type=int, default=50, help='Neighbours kept per movie')
+    build.add_argument('--backend', choices=['exact', 'lsh'], default='exact',
+                       help="Similarity backend; 'lsh' skips the O(N²) neighbour index for very large catalogs")
+    build.add_argument('--embedding-dim', type=int,
+                       help='Score in a dense truncated-SVD space of this many dimensions (e.g. 128) instead of TF-IDF')
+    build.add_argument('--chunk-size', type=int,
+                       help='Read the CSV and fit TF-IDF in chunks of this many movies to bound memory on very large datasets')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'build':
+        from movie_recommender import MovieRecommendationEngine
+        
+        start = time.perf_counter()
+        engine = MovieRecommendationEngine(dataset_path=args.dataset, num_neighbors=args.neighbors,
+                                           similarity_backend=args.backend, embedding_dim=args.embedding_dim,
+                                           chunk_size=args.chunk_size)
+        version_dir = save_bundle(engine, args.out)
+        print(f"✅ Wrote model bundle {version_dir} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
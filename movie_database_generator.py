@@ -1,7 +1,11 @@
 import random
+import threading
+from typing import Dict, List
 
 # Comprehensive Indian Movie Database Generator
 # This will create 200+ movies for each genre and language
+# Nothing is generated at import: the catalog is built on first use from a fixed seed,
+# so every process (and every Streamlit rerun) sees the same years, ratings and casts
 
 # Base movie data for generation
 MOVIE_TEMPLATES = {
@@ -90,8 +94,13 @@ MOVIE_TEMPLATES = {
 # Streaming platforms with realistic distribution
 STREAMING_PLATFORMS = ["Netflix", "Prime Video", "Hotstar", "Zee5", "YouTube"]
 
+# Seed of the generated catalog; changing it changes every generated year, rating and cast
+CATALOG_SEED = 2024
+
 # Generate comprehensive movie database
-def generate_comprehensive_database():
+def generate_comprehensive_database(seed=CATALOG_SEED):
+    """Generate the catalog; the same seed always yields the same movies"""
+    rng = random.Random(seed)
     all_movies = []
     movie_id = 1
     
@@ -108,12 +117,12 @@ def generate_comprehensive_database():
                     title = f"{base_title} {i//len(base_movies) + 1}"
                 
                 # Generate realistic movie data
-                year = random.randint(1990, 2024)
-                rating = round(random.uniform(5.0, 9.0), 1)
-                platform = random.choice(STREAMING_PLATFORMS)
+                year = rng.randint(1990, 2024)
+                rating = round(rng.uniform(5.0, 9.0), 1)
+                platform = rng.choice(STREAMING_PLATFORMS)
                 
                 # Generate cast and director names based on language
-                cast, director = generate_cast_director(language)
+                cast, director = generate_cast_director(language, rng)
                 plot = generate_plot(genre, title)
                 
                 movie = {
@@ -134,7 +143,7 @@ def generate_comprehensive_database():
     
     return all_movies
 
-def generate_cast_director(language):
+def generate_cast_director(language, rng=random):
     """Generate realistic cast and director names based on language"""
     cast_names = {
         "Hindi": ["Shah Rukh Khan", "Aamir Khan", "Salman Khan", "Akshay Kumar", "Hrithik Roshan", "Ranbir Kapoor", "Ranveer Singh", "Deepika Padukone", "Priyanka Chopra", "Katrina Kaif"],
@@ -152,8 +161,8 @@ def generate_cast_director(language):
         "Kannada": ["Prashanth Neel", "Rishab Shetty", "Rakshit Shetty", "Yogaraj Bhat", "Pawan Kumar", "Girish Kasaravalli", "T.S. Nagabharana", "Girish Karnad", "B.V. Karanth", "Shankar Nag"]
     }
     
-    cast = ", ".join(random.sample(cast_names.get(language, cast_names["Hindi"]), 3))
-    director = random.choice(director_names.get(language, director_names["Hindi"]))
+    cast = ", ".join(rng.sample(cast_names.get(language, cast_names["Hindi"]), 3))
+    director = rng.choice(director_names.get(language, director_names["Hindi"]))
     
     return cast, director
 
@@ -174,63 +183,106 @@ def generate_plot(genre, title):
     
     return plot_templates.get(genre, f"An entertaining film about {title}.")
 
-# Generate the database
-COMPREHENSIVE_MOVIE_DATABASE = generate_comprehensive_database()
+_catalog = None
+_genre_index = None
+_language_index = None
+_search_index = None
+_catalog_lock = threading.Lock()
 
-# Create genre-wise and language-wise indexes
-GENRE_INDEX = {}
-LANGUAGE_INDEX = {}
+def get_catalog() -> List[Dict]:
+    """Return the generated catalog, generating it on first use"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = generate_comprehensive_database()
+    return _catalog
 
-for movie in COMPREHENSIVE_MOVIE_DATABASE:
-    genre = movie["genre"]
-    language = movie["language"]
-    
-    if genre not in GENRE_INDEX:
-        GENRE_INDEX[genre] = []
-    GENRE_INDEX[genre].append(movie)
-    
-    if language not in LANGUAGE_INDEX:
-        LANGUAGE_INDEX[language] = []
-    LANGUAGE_INDEX[language].append(movie)
+def build_index(movies: List[Dict], field: str) -> Dict[str, List[Dict]]:
+    """Group movies by the value of one field, keeping catalog order"""
+    index = {}
+    for movie in movies:
+        index.setdefault(movie[field], []).append(movie)
+    return index
+
+def get_genre_index() -> Dict[str, List[Dict]]:
+    """Movies per genre, built on first use"""
+    global _genre_index
+    if _genre_index is None:
+        _genre_index = build_index(get_catalog(), "genre")
+    return _genre_index
+
+def get_language_index() -> Dict[str, List[Dict]]:
+    """Movies per language, built on first use"""
+    global _language_index
+    if _language_index is None:
+        _language_index = build_index(get_catalog(), "language")
+    return _language_index
+
+def get_search_index():
+    """Inverted index over the searchable fields (search_index.SearchIndex), built on first use"""
+    global _search_index
+    if _search_index is None:
+        # Imported here so importing this module does not load numpy
+        from search_index import SearchIndex
+        catalog = get_catalog()
+        _search_index = SearchIndex(catalog, scores=[movie["rating"] for movie in catalog])
+    return _search_index
+
+# The former module constants, now generated when first accessed
+LAZY_ATTRIBUTES = {
+    "COMPREHENSIVE_MOVIE_DATABASE": get_catalog,
+    "GENRE_INDEX": get_genre_index,
+    "LANGUAGE_INDEX": get_language_index,
+}
+
+def __getattr__(name):
+    """Generate COMPREHENSIVE_MOVIE_DATABASE, GENRE_INDEX and LANGUAGE_INDEX on first access"""
+    if name in LAZY_ATTRIBUTES:
+        return LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Helper functions
 def get_movies_by_genre(genre, limit=10):
     """Get movies by genre"""
-    movies = GENRE_INDEX.get(genre, [])
+    movies = get_genre_index().get(genre, [])
     return movies[:limit]
 
 def get_movies_by_language(language, limit=10):
     """Get movies by language"""
-    movies = LANGUAGE_INDEX.get(language, [])
+    movies = get_language_index().get(language, [])
     return movies[:limit]
 
-def search_movies(query, limit=10):
-    """Search movies by title, genre, or language"""
-    query = query.lower()
-    results = []
+def search_movies(query, limit=10, mode="and"):
+    """
+    Search movies by title, genre, language, cast or director
     
-    for movie in COMPREHENSIVE_MOVIE_DATABASE:
-        if (query in movie["title"].lower() or 
-            query in movie["genre"].lower() or 
-            query in movie["language"].lower() or
-            query in movie["cast"].lower() or
-            query in movie["director"].lower()):
-            results.append(movie)
-            
-        if len(results) >= limit:
-            break
+    Args:
+        query: Search words; each also matches words starting with it
+        limit: Maximum number of movies
+        mode: "and" requires every word to match, "or" any of them
     
-    return results
+    Returns:
+        Movies ranked by where the words match (title above director above cast,
+        genre and language), then by rating
+    """
+    catalog = get_catalog()
+    return [catalog[movie_id] for movie_id in get_search_index().search_ids(query, limit, mode)]
 
 def get_random_movies(limit=10):
     """Get random movies"""
-    return random.sample(COMPREHENSIVE_MOVIE_DATABASE, min(limit, len(COMPREHENSIVE_MOVIE_DATABASE)))
-
-# Statistics
-print(f"Total movies in database: {len(COMPREHENSIVE_MOVIE_DATABASE)}")
-print(f"Genres: {list(GENRE_INDEX.keys())}")
-print(f"Languages: {list(LANGUAGE_INDEX.keys())}")
-for genre, movies in GENRE_INDEX.items():
-    print(f"{genre}: {len(movies)} movies")
-for language, movies in LANGUAGE_INDEX.items():
-    print(f"{language}: {len(movies)} movies")
+    catalog = get_catalog()
+    return random.sample(catalog, min(limit, len(catalog)))
+
+def print_statistics():
+    """Print catalog statistics"""
+    print(f"Total movies in database: {len(get_catalog())}")
+    print(f"Genres: {list(get_genre_index().keys())}")
+    print(f"Languages: {list(get_language_index().keys())}")
+    for genre, movies in get_genre_index().items():
+        print(f"{genre}: {len(movies)} movies")
+    for language, movies in get_language_index().items():
+        print(f"{language}: {len(movies)} movies")
+
+if __name__ == "__main__":
+    print_statistics()
@@ -1,6 +1,10 @@
 # Comprehensive Movie Poster Database
 # Organized by genres and languages for all movies in the app
 
+import re
+from typing import Dict, Optional, Tuple
+from poster_cache import normalize_title
+
 MOVIE_POSTERS = {
     # ACTION MOVIES - Hindi
     "War": "https://m.media-amazon.com/images/M/MV5BNzZmOTU1ZTEtYzVhNi00NzQxLWI2MjAtYTU5YThjNzE4OTEyXkEyXkFqcGdeQXVyODE5NzE3OTE@._V1_SX300.jpg",
@@ -83,6 +87,61 @@ MOVIE_POSTERS = {
     "Kirik Party": "https://m.media-amazon.com/images/M/MV5BM2Q3MWEwM2EtNzQwZC00YzE0LWJlYWYtMjk1ZjNlYWQ3ZTQyXkEyXkFqcGdeQXVyMTUzNTgzNzM0._V1_SX300.jpg"
 }
 
-def get_poster_url(movie_title: str) -> str:
+# A title key may end in a release year, e.g. "Don (2006)", to tell remakes apart
+YEAR_SUFFIX = re.compile(r'\s*\((\d{4})\)\s*$')
+
+def split_year(title: str) -> Tuple[str, Optional[int]]:
+    """Split a trailing "(YYYY)" off a title"""
+    match = YEAR_SUFFIX.search(title)
+    if match:
+        return title[:match.start()], int(match.group(1))
+    return title, None
+
+def build_poster_index(posters: Dict[str, str]) -> Dict[str, Dict[Optional[int], str]]:
+    """
+    Index poster URLs by normalized title (case, punctuation and whitespace insensitive)
+    
+    Args:
+        posters: Poster URL per title, optionally with a "(YYYY)" year suffix
+    
+    Returns:
+        Dictionary mapping normalized title to {year or None: poster URL}
+    """
+    index = {}
+    for title, url in posters.items():
+        title, year = split_year(title)
+        index.setdefault(normalize_title(title), {}).setdefault(year, url)
+    return index
+
+# Built once per process; every lookup is a single normalized dictionary read
+POSTER_INDEX = build_poster_index(MOVIE_POSTERS)
+
+def find_poster_url(movie_title: str, year: Optional[int] = None) -> Optional[str]:
+    """
+    Look up the curated poster of a title
+    
+    Args:
+        movie_title: Movie title in any case or punctuation, optionally with a "(YYYY)" suffix
+        year: Release year; picks the poster of that year when several are listed
+    
+    Returns:
+        Poster URL, or None if the title is not listed (or only listed for other years)
+    """
+    title, title_year = split_year(movie_title)
+    posters = POSTER_INDEX.get(normalize_title(title))
+    if not posters:
+        return None
+    
+    year = year or title_year
+    if year in posters:
+        return posters[year]
+    if None in posters:
+        return posters[None]
+    # Only year-specific posters: without a year to check against, use the sole one if unambiguous
+    if year is None and len(posters) == 1:
+        return next(iter(posters.values()))
+    return None
+
+def get_poster_url(movie_title: str) -> Optional[str]:
     """Get poster URL for a movie title"""
-    return MOVIE_POSTERS.get(movie_title, None)
+    return find_poster_url(movie_title)
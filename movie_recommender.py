@@ -6,12 +6,38 @@ Comprehensive backend logic for Indian movie recommendations using TF-IDF and co
 import pandas as pd
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import requests
-import re
-from typing import List, Dict, Tuple, Optional
-import difflib
-import json
+from typing import List, Dict, Sequence, Tuple, Optional
+import copy
+import threading
+import scipy.sparse as sp
+from ann_index import LSHIndex
+from catalog_ingest import CATALOG_COLUMNS, append_rows, fill_missing, fit_tfidf_chunked, read_catalog
+from catalog_store import catalog_format, load_catalog
+from embeddings import fit_embeddings, project_embeddings
+from similarity_index import (build_neighbor_index, compact_neighbor_index, extend_neighbor_index, profile_scores,
+                              profile_vector, similarity_block, top_n_indices, top_n_rows)
+import model_store
+from poster_service import PosterService
+from title_index import TrigramIndex
+from autocomplete import AutocompleteIndex
+from catalog_filter import CatalogFilter
+from dataset_stats import DatasetStats
+from movie_records import MovieRecord, build_records
+
+# 'exact' precomputes the top-K neighbours of every movie, 'lsh' searches an approximate index per request
+SIMILARITY_BACKENDS = ('exact', 'lsh')
+
+# A background refit starts once movies added since the last fit carry this share of the catalog's
+# term occurrences beyond what the fitted vocabulary already missed (see vocabulary_drift)
+REFIT_DRIFT_THRESHOLD = 0.05
+
+# Documents sampled to measure how much of the catalog the fitted vocabulary covers
+VOCABULARY_SAMPLE_SIZE = 2000
+
+# Everything a refit replaces; the catalog and lookup indexes stay as they are
+MODEL_ATTRIBUTES = ('vectorizer', 'tfidf_matrix', 'embeddings', 'svd_components', 'item_vectors',
+                    'neighbor_indices', 'neighbor_scores', 'ann_index', 'oov_baseline', 'terms_per_movie',
+                    'excess_oov_terms')
 
 class MovieRecommendationEngine:
     """
@@ -19,24 +45,71 @@ class MovieRecommendationEngine:
     similarity computation, and recommendation generation
     """
     
-    def __init__(self, dataset_path: str = 'indian_movies_dataset.csv', omdb_api_key: str = None):
+    def __init__(self, dataset_path: str = 'indian_movies_dataset.csv', omdb_api_key: str = None,
+                 num_neighbors: int = 50, bundle_dir: str = None, similarity_backend: str = 'exact',
+                 embedding_dim: Optional[int] = None, chunk_size: Optional[int] = None):
         """
         Initialize the recommendation engine
         
         Args:
             dataset_path: Path to the movie dataset CSV file
             omdb_api_key: OMDb API key for fetching movie posters
+            num_neighbors: Number of precomputed neighbours kept per movie
+            bundle_dir: Optional prebuilt model bundle to memory-map instead of fitting from the CSV
+            similarity_backend: 'exact' for the precomputed top-K neighbour index, or 'lsh' for
+                approximate search over an LSH index (for catalogs too large for exact top-K)
+            embedding_dim: Score in a dense truncated-SVD space of this many dimensions (64-256)
+                instead of the sparse TF-IDF space; None keeps TF-IDF. A bundle keeps the space it was built in
+            chunk_size: Read the CSV and fit TF-IDF in chunks of this many movies, bounding the memory
+                used on top of the catalog for very large datasets; None reads and fits in one go
         """
+        if similarity_backend not in SIMILARITY_BACKENDS:
+            raise ValueError(f"Unknown similarity backend: {similarity_backend} (choose from {', '.join(SIMILARITY_BACKENDS)})")
+        
         self.dataset_path = dataset_path
         self.omdb_api_key = omdb_api_key
+        self.poster_service = PosterService(omdb_api_key)
+        self.num_neighbors = num_neighbors
+        self.similarity_backend = similarity_backend
+        self.embedding_dim = embedding_dim
+        self.chunk_size = chunk_size
         self.df = None
         self.tfidf_matrix = None
-        self.cosine_sim = None
+        self.embeddings = None
+        self.svd_components = None
+        
+        # Scoring space: tfidf_matrix, or the dense embeddings when embedding_dim is set
+        self.item_vectors = None
+        self.neighbor_indices = None
+        self.neighbor_scores = None
+        self.ann_index = None
         self.vectorizer = None
         self.movie_indices = {}
+        # One MovieRecord per catalog row, read by the hot paths instead of self.df
+        self.records = []
+        self.title_index = None
+        self.autocomplete_index = None
+        self.filter_index = None
+        self.stats = None
+        self.bundle_version = None
+        
+        # Vocabulary coverage at fit time and out-of-vocabulary terms added since (see vocabulary_drift)
+        self.oov_baseline = 0.0
+        self.terms_per_movie = 0.0
+        self.excess_oov_terms = 0.0
+        
+        # add_movies / remove_movies are serialized; catalog_version counts them
+        self.catalog_version = 0
+        # Counts every change of recommendation results (add, remove, background refit), for result caches
+        self.model_version = 0
+        self._update_lock = threading.RLock()
+        self._refit_thread = None
         
-        # Load and prepare the dataset
-        self.load_and_prepare_data()
+        # Load a prebuilt bundle when available, otherwise fit from the dataset
+        if bundle_dir:
+            self.load_bundle(bundle_dir)
+        else:
+            self.load_and_prepare_data()
     
     def load_and_prepare_data(self):
         """
@@ -44,71 +117,426 @@ class MovieRecommendationEngine:
         Handles missing values and creates combined features for similarity computation
         """
         try:
-            # Load the dataset
-            self.df = pd.read_csv(self.dataset_path)
+            # Load the catalog columns of the dataset; large CSVs chunk by chunk with categorical columns,
+            # Parquet/Arrow files (catalog_store.py convert) without parsing any other column
+            if self.chunk_size and catalog_format(self.dataset_path) == 'csv':
+                self.df = read_catalog(self.dataset_path, self.prepare_catalog, self.chunk_size)
+            else:
+                self.df = self.prepare_catalog(load_catalog(self.dataset_path, CATALOG_COLUMNS))
             print(f"✅ Loaded {len(self.df)} movies from dataset")
             
-            # Handle missing values
-            self.df['genres'] = self.df['genres'].fillna('')
-            self.df['director'] = self.df['director'].fillna('')
-            self.df['main_actors'] = self.df['main_actors'].fillna('')
-            self.df['keywords'] = self.df['keywords'].fillna('')
-            self.df['language'] = self.df['language'].fillna('Unknown')
-            
-            # Create combined features for similarity computation
-            # This combines all relevant textual features into one string per movie
-            self.df['combined_features'] = (
-                self.df['genres'] + ' ' +
-                self.df['director'] + ' ' +
-                self.df['main_actors'] + ' ' +
-                self.df['keywords'] + ' ' +
-                self.df['language']
-            )
-            
-            # Clean the combined features (remove extra spaces, convert to lowercase)
-            self.df['combined_features'] = self.df['combined_features'].str.lower().str.strip()
+            # Create movie title to index mapping, title search and filter indexes for quick lookup
+            self.build_lookup_indexes()
+            self.stats = DatasetStats.from_frame(self.df)
             
-            # Create movie title to index mapping for quick lookup
-            self.movie_indices = {title.lower(): idx for idx, title in enumerate(self.df['title'])}
-            
-            # Compute TF-IDF matrix and cosine similarity
+            # Compute TF-IDF matrix and top-K neighbour index
             self.compute_similarity_matrix()
             
-            print("✅ Dataset prepared and similarity matrix computed")
+            print("✅ Dataset prepared and similarity index computed")
             
         except Exception as e:
             print(f"❌ Error loading dataset: {str(e)}")
             raise
     
+    @staticmethod
+    def prepare_catalog(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fill missing values and build the combined features used for similarity computation
+        
+        Args:
+            df: Raw movie rows
+        
+        Returns:
+            The same frame with cleaned columns and a combined_features column
+        """
+        # Handle missing values
+        for column in ('genres', 'director', 'main_actors', 'keywords'):
+            df[column] = fill_missing(df[column], '') if column in df else ''
+        df['language'] = fill_missing(df['language'], 'Unknown') if 'language' in df else 'Unknown'
+        for column in ('year', 'rating'):
+            if column not in df:
+                df[column] = np.nan
+        
+        # Create combined features for similarity computation
+        # This combines all relevant textual features into one string per movie
+        # Categorical columns (chunked or columnar catalogs) are concatenated as plain strings
+        df['combined_features'] = (
+            df['genres'].astype(str) + ' ' +
+            df['director'].astype(str) + ' ' +
+            df['main_actors'].astype(str) + ' ' +
+            df['keywords'].astype(str) + ' ' +
+            df['language'].astype(str)
+        )
+        
+        # Clean the combined features (remove extra spaces, convert to lowercase)
+        df['combined_features'] = df['combined_features'].str.lower().str.strip()
+        return df
+    
     def compute_similarity_matrix(self):
         """
-        Compute TF-IDF vectors and cosine similarity matrix for all movies
+        Compute TF-IDF vectors and the top-K cosine similarity index for all movies
         This is the core of the recommendation algorithm
+        
+        Only the K best neighbours of each movie are kept, so memory grows as
+        O(N·K) instead of the O(N²) of a dense similarity matrix. With the 'lsh' backend
+        no neighbours are precomputed and every request searches the LSH index instead.
+        With embedding_dim set, all of this happens in the dense SVD space
         """
         try:
             # Initialize TF-IDF Vectorizer
-            # TF-IDF converts text to numerical vectors based on term frequency and inverse document frequency
-            self.vectorizer = TfidfVectorizer(
-                stop_words='english',  # Remove common English stop words
-                max_features=5000,     # Limit to top 5000 features for performance
-                ngram_range=(1, 2),    # Use both single words and bigrams
-                min_df=2,              # Ignore terms that appear in less than 2 documents
-                max_df=0.8             # Ignore terms that appear in more than 80% of documents
-            )
+            self.vectorizer = self.create_vectorizer()
             
             # Fit and transform the combined features to TF-IDF matrix
-            self.tfidf_matrix = self.vectorizer.fit_transform(self.df['combined_features'])
+            if self.chunk_size:
+                self.tfidf_matrix = fit_tfidf_chunked(self.vectorizer, self.df['combined_features'], self.chunk_size)
+            else:
+                self.tfidf_matrix = self.vectorizer.fit_transform(self.df['combined_features'])
+            self.item_vectors = self.tfidf_matrix
+            self.measure_vocabulary_baseline()
             
-            # Compute cosine similarity matrix
-            # This creates a matrix where each cell [i,j] represents similarity between movie i and movie j
-            self.cosine_sim = cosine_similarity(self.tfidf_matrix, self.tfidf_matrix)
+            if self.embedding_dim:
+                # Project onto the top singular directions: one contiguous float32 row per movie
+                self.embeddings, self.svd_components = fit_embeddings(self.tfidf_matrix, self.embedding_dim)
+                self.item_vectors = self.embeddings
+                print(f"✅ Computed embeddings of shape {self.embeddings.shape}")
             
-            print(f"✅ Computed similarity matrix of shape {self.cosine_sim.shape}")
+            if self.similarity_backend == 'lsh':
+                # Exact top-K costs O(N²) to build, so keep an empty neighbour index
+                num_movies = self.tfidf_matrix.shape[0]
+                self.neighbor_indices = np.empty((num_movies, 0), dtype=np.int32)
+                self.neighbor_scores = np.empty((num_movies, 0), dtype=np.float32)
+                self.ann_index = LSHIndex(self.item_vectors)
+                print(f"✅ Built LSH index with {self.ann_index.num_tables} tables for {num_movies} movies")
+                return
+            
+            # Build the neighbour index chunk by chunk from the scoring vectors
+            # Row i holds the indices and cosine scores of the movies most similar to movie i
+            self.neighbor_indices, self.neighbor_scores = build_neighbor_index(
+                self.item_vectors,
+                k=self.num_neighbors
+            )
+            
+            print(f"✅ Computed similarity index of shape {self.neighbor_indices.shape}")
             
         except Exception as e:
             print(f"❌ Error computing similarity matrix: {str(e)}")
             raise
     
+    @staticmethod
+    def create_vectorizer() -> TfidfVectorizer:
+        """
+        Create the TF-IDF vectorizer used for all movie features
+        TF-IDF converts text to numerical vectors based on term frequency and inverse document frequency
+        """
+        return TfidfVectorizer(
+            stop_words='english',  # Remove common English stop words
+            max_features=5000,     # Limit to top 5000 features for performance
+            ngram_range=(1, 2),    # Use both single words and bigrams
+            min_df=2,              # Ignore terms that appear in less than 2 documents
+            max_df=0.8             # Ignore terms that appear in more than 80% of documents
+        )
+    
+    def load_bundle(self, bundle_dir: str):
+        """
+        Load a prebuilt model bundle written by save_bundle
+        Arrays are memory-mapped read-only, so worker processes share one page-cache copy;
+        lookup indexes and records are unpickled instead of rebuilt from the catalog
+        
+        Args:
+            bundle_dir: Root directory of the model bundle
+        """
+        try:
+            bundle = model_store.load_bundle(bundle_dir)
+            
+            self.df = bundle['catalog']
+            self.tfidf_matrix = bundle['tfidf_matrix']
+            self.embeddings = bundle['embeddings']
+            self.svd_components = bundle['svd_components']
+            self.embedding_dim = self.embeddings.shape[1] if self.embeddings is not None else None
+            self.item_vectors = self.tfidf_matrix if self.embeddings is None else self.embeddings
+            self.neighbor_indices = bundle['neighbor_indices']
+            self.neighbor_scores = bundle['neighbor_scores']
+            self.num_neighbors = self.neighbor_indices.shape[1]
+            self.dataset_path = bundle['manifest']['dataset_path']
+            self.bundle_version = bundle['manifest']['version']
+            # Bundles written before the backend was recorded keep the configured one
+            self.similarity_backend = bundle['manifest'].get('similarity_backend', self.similarity_backend)
+            
+            # Restore the fitted vectorizer without refitting it
+            self.vectorizer = self.create_vectorizer()
+            self.vectorizer.vocabulary_ = bundle['vocabulary']
+            self.vectorizer.idf_ = np.asarray(bundle['idf'])
+            
+            if bundle['lookup_indexes'] is not None:
+                self.__dict__.update(bundle['lookup_indexes'])
+            else:
+                self.build_lookup_indexes()
+            
+            # The LSH index is cheap to hash, so it is rebuilt on load rather than stored
+            if self.similarity_backend == 'lsh':
+                self.ann_index = LSHIndex(self.item_vectors)
+            self.measure_vocabulary_baseline()
+            
+            # Bundles written before statistics were persisted compute them once here
+            if bundle['stats'] is not None:
+                self.stats = DatasetStats.from_state(bundle['stats'])
+            else:
+                self.stats = DatasetStats.from_frame(self.df)
+            
+            print(f"✅ Loaded model bundle {self.bundle_version} with {len(self.df)} movies")
+            
+        except Exception as e:
+            print(f"❌ Error loading model bundle: {str(e)}")
+            raise
+    
+    def save_bundle(self, bundle_dir: str) -> str:
+        """
+        Persist the fitted model as a new bundle version
+        
+        Args:
+            bundle_dir: Root directory of the model bundle
+        
+        Returns:
+            Path of the version directory that was written
+        """
+        return model_store.save_bundle(self, bundle_dir)
+    
+    @staticmethod
+    def lookup_indexes(df: pd.DataFrame) -> Dict:
+        """
+        Build the title to index mapping, the trigram title search index,
+        the autocomplete index, the columnar filter index and the movie records of a catalog
+        
+        Args:
+            df: Prepared catalog frame
+        
+        Returns:
+            Dictionary mapping engine attribute names to the new structures
+        """
+        titles = df['title']
+        movie_indices = {title.lower(): idx for idx, title in enumerate(titles)}
+        filter_index = CatalogFilter(df)
+        return {
+            'records': build_records(df),
+            'movie_indices': movie_indices,
+            'title_index': TrigramIndex(movie_indices.keys()),
+            'filter_index': filter_index,
+            # Suggestions are ranked by rating, highest first
+            'autocomplete_index': AutocompleteIndex(titles, filter_index.rating),
+        }
+    
+    def build_lookup_indexes(self):
+        """Build the lookup indexes and movie records of the current catalog"""
+        for name, value in self.lookup_indexes(self.df).items():
+            setattr(self, name, value)
+    
+    def add_movies(self, movies) -> List[int]:
+        """
+        Add movies to the catalog without refitting the model
+        
+        New rows are transformed with the fitted vectorizer (and SVD projection) and appended
+        to the TF-IDF matrix. The neighbour index only scores the new movies against the catalog.
+        The LSH index, title lookups, filter columns, autocomplete and statistics are extended
+        in place. When the new movies' vocabulary drifts too far from the fitted one, a full
+        refit is scheduled in the background.
+        
+        Args:
+            movies: DataFrame or list of dicts with at least a title column
+        
+        Returns:
+            Dataset indices of the added movies
+        """
+        new_rows = self.prepare_catalog(pd.DataFrame(movies).reset_index(drop=True))
+        if new_rows.empty:
+            return []
+        
+        with self._update_lock:
+            start = len(self.df)
+            
+            new_tfidf = self.vectorizer.transform(new_rows['combined_features']).astype(self.tfidf_matrix.dtype)
+            tfidf_matrix = sp.vstack([self.tfidf_matrix, new_tfidf], format='csr')
+            embeddings = None
+            if self.embeddings is not None:
+                embeddings = np.vstack([self.embeddings, project_embeddings(new_tfidf, self.svd_components)])
+            item_vectors = tfidf_matrix if embeddings is None else embeddings
+            
+            neighbor_indices, neighbor_scores = extend_neighbor_index(
+                item_vectors, self.neighbor_indices, self.neighbor_scores
+            )
+            
+            # Readers do not take the lock, so the grown catalog and matrices are published in
+            # one dict update; the indexes that can return the new ids are extended afterwards
+            self.__dict__.update({
+                'df': append_rows(self.df, new_rows),
+                'records': self.records + build_records(new_rows),
+                'tfidf_matrix': tfidf_matrix,
+                'embeddings': embeddings,
+                'item_vectors': item_vectors,
+                'neighbor_indices': neighbor_indices,
+                'neighbor_scores': neighbor_scores,
+            })
+            
+            if self.ann_index is not None:
+                self.ann_index.add(item_vectors)
+            self.filter_index.add(new_rows)
+            self.autocomplete_index.add(new_rows['title'], self.filter_index.rating[start:])
+            for idx, title in enumerate(new_rows['title'], start):
+                key = title.lower()
+                if key not in self.movie_indices:
+                    self.title_index.add(key)
+                self.movie_indices[key] = idx
+            self.stats.add(new_rows)
+            self.catalog_version += 1
+            self.model_version += 1
+            
+            total_terms, oov_terms = self.vocabulary_coverage(self.vectorizer, new_rows['combined_features'])
+            self.excess_oov_terms += oov_terms - self.oov_baseline * total_terms
+            if self.vocabulary_drift() > REFIT_DRIFT_THRESHOLD:
+                self.schedule_refit()
+        
+        print(f"✅ Added {len(new_rows)} movies (vocabulary drift {self.vocabulary_drift():.3f})")
+        return list(range(start, start + len(new_rows)))
+    
+    def remove_movies(self, movie_titles: List[str]) -> int:
+        """
+        Remove movies from the catalog without refitting the model
+        
+        Titles must match exactly (case-insensitive); every row with that title is removed.
+        Remaining movies are renumbered, neighbour lists that pointed at a removed movie are
+        scored again, and the lookup indexes are rebuilt. The new catalog, matrices and indexes
+        replace the old ones together once they are all built.
+        
+        Args:
+            movie_titles: Titles of the movies to remove
+        
+        Returns:
+            Number of removed movies
+        """
+        targets = {str(title).lower().strip() for title in movie_titles}
+        
+        with self._update_lock:
+            keep = ~self.df['title'].str.lower().isin(targets).to_numpy()
+            if keep.all():
+                return 0
+            
+            removed = self.df[~keep]
+            tfidf_matrix = self.tfidf_matrix[keep]
+            embeddings = None if self.embeddings is None else np.ascontiguousarray(self.embeddings[keep])
+            item_vectors = tfidf_matrix if embeddings is None else embeddings
+            
+            neighbor_indices, neighbor_scores = compact_neighbor_index(
+                item_vectors, self.neighbor_indices, self.neighbor_scores, keep
+            )
+            
+            # Readers do not take the lock, so every renumbered structure is built on the side
+            # and published in one dict update; they never see new ids against old arrays
+            df = self.df[keep].reset_index(drop=True)
+            ann_index = None
+            if self.ann_index is not None:
+                ann_index = self.ann_index.copy()
+                ann_index.remove(item_vectors, keep)
+            
+            state = self.lookup_indexes(df)
+            state.update({
+                'df': df,
+                'tfidf_matrix': tfidf_matrix,
+                'embeddings': embeddings,
+                'item_vectors': item_vectors,
+                'ann_index': ann_index,
+                'neighbor_indices': neighbor_indices,
+                'neighbor_scores': neighbor_scores,
+            })
+            self.__dict__.update(state)
+            
+            self.stats.remove(removed)
+            self.catalog_version += 1
+            self.model_version += 1
+        
+        print(f"✅ Removed {len(removed)} movies")
+        return len(removed)
+    
+    @staticmethod
+    def vocabulary_coverage(vectorizer: TfidfVectorizer, texts) -> Tuple[int, int]:
+        """
+        Count the term occurrences of some documents and how many the vocabulary misses
+        
+        Args:
+            vectorizer: Fitted vectorizer
+            texts: Combined feature strings
+        
+        Returns:
+            Tuple of (total terms, out-of-vocabulary terms)
+        """
+        analyze = vectorizer.build_analyzer()
+        vocabulary = vectorizer.vocabulary_
+        total_terms = oov_terms = 0
+        for text in texts:
+            terms = analyze(text)
+            total_terms += len(terms)
+            oov_terms += sum(term not in vocabulary for term in terms)
+        return total_terms, oov_terms
+    
+    def measure_vocabulary_baseline(self):
+        """
+        Measure how much of the catalog the fitted vocabulary covers, on an evenly spaced sample
+        max_features and min_df leave some terms out even for the movies the model was fitted on
+        """
+        features = self.df['combined_features']
+        sample = features.iloc[::max(1, len(features) // VOCABULARY_SAMPLE_SIZE)]
+        total_terms, oov_terms = self.vocabulary_coverage(self.vectorizer, sample)
+        
+        self.oov_baseline = oov_terms / total_terms if total_terms else 0.0
+        self.terms_per_movie = total_terms / len(sample) if len(sample) else 0.0
+        self.excess_oov_terms = 0.0
+    
+    def vocabulary_drift(self) -> float:
+        """
+        Share of the catalog's term occurrences that the fitted vocabulary misses beyond its
+        fit-time baseline, accumulated over the movies added since the last fit
+        """
+        catalog_terms = self.terms_per_movie * len(self.df)
+        return max(0.0, self.excess_oov_terms / catalog_terms) if catalog_terms else 0.0
+    
+    def schedule_refit(self) -> bool:
+        """
+        Start a full refit in a background thread unless one is already running
+        
+        Returns:
+            True if a refit was started
+        """
+        with self._update_lock:
+            if self._refit_thread is not None and self._refit_thread.is_alive():
+                return False
+            self._refit_thread = threading.Thread(target=self._refit, name='catalog-refit', daemon=True)
+            self._refit_thread.start()
+            return True
+    
+    def _refit(self):
+        """Refit vectorizer and similarity index on a snapshot of the catalog, then swap them in"""
+        while True:
+            with self._update_lock:
+                version = self.catalog_version
+                snapshot = copy.copy(self)
+                snapshot.df = self.df.copy()
+            
+            print(f"🔄 Refitting the model on {len(snapshot.df)} movies in the background")
+            try:
+                snapshot.compute_similarity_matrix()
+            except Exception as e:
+                print(f"❌ Background refit failed: {str(e)}")
+                return
+            
+            with self._update_lock:
+                # Movies added or removed meanwhile are missing from the snapshot, so fit again
+                if version != self.catalog_version:
+                    continue
+                # One dict update, so readers never pair the new vectors with the old neighbour index
+                self.__dict__.update({name: getattr(snapshot, name) for name in MODEL_ATTRIBUTES})
+                self.model_version += 1
+            
+            print("✅ Background refit finished")
+            return
+    
     def find_movie_match(self, input_title: str) -> Tuple[Optional[str], Optional[int]]:
         """
         Find the best matching movie title from the dataset
@@ -125,39 +553,91 @@ class MovieRecommendationEngine:
         # Direct match
         if input_title_clean in self.movie_indices:
             idx = self.movie_indices[input_title_clean]
-            return self.df.iloc[idx]['title'], idx
+            return self.records[idx].title, idx
         
         # Fuzzy matching for partial titles and misspellings
-        all_titles = list(self.movie_indices.keys())
-        
-        # Find close matches using difflib
-        close_matches = difflib.get_close_matches(
-            input_title_clean, 
-            all_titles, 
-            n=1, 
+        # Only titles sharing the most trigrams with the input are scored
+        key_id = self.title_index.close_match(
+            input_title_clean,
             cutoff=0.6  # 60% similarity threshold
         )
         
-        if close_matches:
-            matched_title = close_matches[0]
-            idx = self.movie_indices[matched_title]
-            return self.df.iloc[idx]['title'], idx
-        
         # Try partial matching
-        for title in all_titles:
-            if input_title_clean in title or title in input_title_clean:
-                idx = self.movie_indices[title]
-                return self.df.iloc[idx]['title'], idx
+        if key_id is None:
+            key_id = self.title_index.find_substring(input_title_clean)
+        
+        if key_id is not None:
+            idx = self.movie_indices[self.title_index.keys[key_id]]
+            return self.records[idx].title, idx
         
         return None, None
     
-    def get_movie_recommendations(self, movie_title: str, num_recommendations: int = 10) -> List[Dict]:
+    def get_similar_movies(self, movie_idx: int, num_recommendations: int = 10) -> List[Tuple[int, float]]:
+        """
+        Get the most similar movies for a movie index from the neighbour index,
+        falling back to the LSH index or an exact scan when more are requested than precomputed
+        
+        Args:
+            movie_idx: Index of the input movie
+            num_recommendations: Number of similar movies to return
+        
+        Returns:
+            List of (movie_index, similarity_score) tuples sorted by descending similarity
+        """
+        # A negative count would slice [:-n] off the neighbour row instead of returning nothing
+        num_recommendations = max(0, num_recommendations)
+        if num_recommendations <= self.neighbor_indices.shape[1]:
+            indices = self.neighbor_indices[movie_idx, :num_recommendations]
+            scores = self.neighbor_scores[movie_idx, :num_recommendations]
+        elif self.ann_index is not None:
+            indices, scores = self.ann_index.query(self.item_vectors[movie_idx], num_recommendations, exclude=movie_idx)
+        else:
+            # More results requested than precomputed: score this one row on the fly
+            scores = similarity_block(self.item_vectors, [movie_idx]).ravel()
+            indices = top_n_indices(scores, num_recommendations, exclude=movie_idx)
+            scores = scores[indices]
+        
+        return [(int(idx), float(score)) for idx, score in zip(indices, scores)]
+    
+    def get_similar_movies_batch(self, movie_idxs: np.ndarray,
+                                 num_recommendations: int = 10) -> Tuple[Sequence[np.ndarray], Sequence[np.ndarray]]:
+        """
+        Get the most similar movies for several movie indices at once
+        
+        Args:
+            movie_idxs: Indices of the input movies
+            num_recommendations: Number of similar movies per input movie
+        
+        Returns:
+            Tuple of (indices, scores) with one row per input movie, sorted by descending similarity.
+            Arrays of shape (len(movie_idxs), n), except with the LSH backend, where rows are separate
+            arrays that may hold fewer than n movies
+        """
+        num_recommendations = max(0, num_recommendations)
+        if num_recommendations <= self.neighbor_indices.shape[1]:
+            return (self.neighbor_indices[movie_idxs, :num_recommendations],
+                    self.neighbor_scores[movie_idxs, :num_recommendations])
+        
+        if self.ann_index is not None:
+            results = [
+                self.ann_index.query(self.item_vectors[movie_idx], num_recommendations, exclude=movie_idx)
+                for movie_idx in movie_idxs
+            ]
+            return [indices for indices, _ in results], [scores for _, scores in results]
+        
+        # More results requested than precomputed: one matrix product scores every seed
+        scores = similarity_block(self.item_vectors, movie_idxs)
+        return top_n_rows(scores, num_recommendations, exclude=movie_idxs)
+    
+    def get_movie_recommendations(self, movie_title: str, num_recommendations: int = 10,
+                                  fetch_posters: bool = True) -> List[Dict]:
         """
         Get movie recommendations based on input movie title
         
         Args:
             movie_title: Input movie title
             num_recommendations: Number of recommendations to return
+            fetch_posters: Resolve poster URLs; when False poster_url is None and the caller fills it in
             
         Returns:
             List of dictionaries containing movie details and recommendation reasons
@@ -168,51 +648,211 @@ class MovieRecommendationEngine:
         if movie_idx is None:
             return []
         
-        # Get similarity scores for the input movie with all other movies
-        sim_scores = list(enumerate(self.cosine_sim[movie_idx]))
+        return self.get_recommendations_for_index(movie_idx, num_recommendations, fetch_posters)
+    
+    def get_recommendations_for_index(self, movie_idx: int, num_recommendations: int = 10,
+                                      fetch_posters: bool = True) -> List[Dict]:
+        """
+        Get movie recommendations for a movie already resolved with find_movie_match
         
-        # Sort movies by similarity score (descending order)
-        sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
+        Args:
+            movie_idx: Dataset index of the input movie
+            num_recommendations: Number of recommendations to return
+            fetch_posters: Resolve poster URLs; when False poster_url is None and the caller fills it in
         
-        # Get top N similar movies (excluding the input movie itself)
-        similar_movies = sim_scores[1:num_recommendations + 1]
+        Returns:
+            List of dictionaries containing movie details and recommendation reasons
+        """
+        # Get top N similar movies (the input movie is never in its own neighbour list)
+        similar_movies = self.get_similar_movies(movie_idx, num_recommendations)
         
         recommendations = []
-        input_movie = self.df.iloc[movie_idx]
+        input_movie = self.records[movie_idx]
         
-        for movie_idx, similarity_score in similar_movies:
-            movie = self.df.iloc[movie_idx]
-            
-            # Generate recommendation explanation
-            reason = self.generate_recommendation_reason(input_movie, movie, similarity_score)
-            
-            # Get movie poster from OMDb API
-            poster_url = self.get_movie_poster(movie['title'])
-            
-            recommendation = {
-                'title': movie['title'],
-                'language': movie['language'],
-                'genres': movie['genres'],
-                'director': movie['director'],
-                'main_actors': movie['main_actors'],
-                'year': movie['year'],
-                'rating': movie['rating'],
-                'poster_url': poster_url,
-                'similarity_score': round(similarity_score, 3),
-                'reason': reason
-            }
-            
-            recommendations.append(recommendation)
+        # Records hold native Python values, so responses serialize to JSON without touching pandas
+        rows = [self.records[idx] for idx, _ in similar_movies]
+        
+        # Fetch all posters of the result set concurrently from OMDb API
+        posters = {}
+        if fetch_posters:
+            posters = self.poster_service.get_posters(movie.title for movie in rows)
+        
+        for movie, (_, similarity_score) in zip(rows, similar_movies):
+            recommendations.append(
+                self.build_recommendation(input_movie, movie, similarity_score, posters.get(movie.title))
+            )
         
         return recommendations
     
-    def generate_recommendation_reason(self, input_movie: pd.Series, recommended_movie: pd.Series, similarity_score: float) -> str:
+    def get_profile_recommendations(self, liked_titles: List[str], disliked_titles: Optional[List[str]] = None,
+                                    num_recommendations: int = 10, dislike_weight: float = 0.5,
+                                    fetch_posters: bool = True) -> Dict:
+        """
+        Get recommendations for a taste profile built from several liked (and disliked) titles
+        
+        The liked and disliked rows (TF-IDF or embeddings) are combined into one weighted centroid
+        and the whole catalog is scored against it with a single matrix-vector product.
+        Seed movies are never recommended.
+        
+        Args:
+            liked_titles: Titles the user liked
+            disliked_titles: Optional titles the user disliked
+            num_recommendations: Number of recommendations to return
+            dislike_weight: How strongly disliked titles pull the profile away
+            fetch_posters: Resolve poster URLs; when False poster_url is None and the caller fills it in
+        
+        Returns:
+            Dictionary with the matched liked and disliked titles and the recommendations
+        """
+        liked = self.resolve_titles(liked_titles)
+        disliked = self.resolve_titles(disliked_titles or [])
+        # A title both liked and disliked counts as liked
+        disliked = {idx: title for idx, title in disliked.items() if idx not in liked}
+        
+        result = {
+            'liked': list(liked.values()),
+            'disliked': list(disliked.values()),
+            'recommendations': []
+        }
+        if not liked:
+            return result
+        
+        liked_idx = np.array(list(liked))
+        profile = profile_vector(self.item_vectors, liked_idx, np.array(list(disliked), dtype=np.intp), dislike_weight)
+        scores = profile_scores(self.item_vectors, profile)
+        
+        # Seeds can never be recommended
+        scores[liked_idx] = -np.inf
+        scores[list(disliked)] = -np.inf
+        indices = [idx for idx in top_n_indices(scores, num_recommendations) if np.isfinite(scores[idx])]
+        if not indices:
+            return result
+        
+        # Explain each result by the liked seed it is closest to
+        closest = similarity_block(self.item_vectors, indices, liked_idx).argmax(axis=1)
+        
+        rows = [self.records[idx] for idx in indices]
+        posters = {}
+        if fetch_posters:
+            posters = self.poster_service.get_posters(movie.title for movie in rows)
+        
+        for movie, idx, seed in zip(rows, indices, closest):
+            input_movie = self.records[liked_idx[seed]]
+            recommendation = self.build_recommendation(
+                input_movie, movie, float(scores[idx]), posters.get(movie.title)
+            )
+            recommendation['because_you_liked'] = input_movie.title
+            result['recommendations'].append(recommendation)
+        
+        return result
+    
+    def resolve_titles(self, movie_titles: List[str]) -> Dict[int, str]:
+        """
+        Resolve titles to dataset indices, dropping unknown titles and duplicates
+        
+        Args:
+            movie_titles: Input movie titles
+        
+        Returns:
+            Dictionary mapping movie index to matched title, in input order
+        """
+        resolved = {}
+        for movie_title in movie_titles:
+            matched_title, movie_idx = self.find_movie_match(movie_title)
+            if movie_idx is not None:
+                resolved.setdefault(movie_idx, matched_title)
+        return resolved
+    
+    def get_recommendations_batch(self, movie_titles: List[str], num_recommendations: int = 10,
+                                  fetch_posters: bool = True) -> List[Dict]:
+        """
+        Get recommendations for several seed titles in one pass
+        
+        All seeds are resolved first, then scored together: rows are gathered from the
+        neighbour index, or one matrix product scores every seed against the catalog
+        when more results are requested than were precomputed. Posters are fetched once
+        for the distinct titles of the whole batch.
+        
+        Args:
+            movie_titles: Input movie titles
+            num_recommendations: Number of recommendations per title
+            fetch_posters: Resolve poster URLs; when False poster_url is None and the caller fills it in
+        
+        Returns:
+            One dictionary per input title, in input order, with input_movie, matched_title
+            (None if the title was not found) and recommendations
+        """
+        matches = [self.find_movie_match(title) for title in movie_titles]
+        seeds = sorted({movie_idx for _, movie_idx in matches if movie_idx is not None})
+        
+        neighbors = {}
+        if seeds:
+            indices, scores = self.get_similar_movies_batch(np.array(seeds), num_recommendations)
+            neighbors = {seed: (indices[row], scores[row]) for row, seed in enumerate(seeds)}
+        
+        # Distinct result movies of the whole batch
+        result_indices = sorted({int(idx) for indices, _ in neighbors.values() for idx in indices})
+        rows = {idx: self.records[idx] for idx in result_indices}
+        
+        posters = {}
+        if fetch_posters:
+            posters = self.poster_service.get_posters(movie.title for movie in rows.values())
+        
+        results = []
+        for movie_title, (matched_title, movie_idx) in zip(movie_titles, matches):
+            recommendations = []
+            if movie_idx is not None:
+                input_movie = self.records[movie_idx]
+                for idx, score in zip(*neighbors[movie_idx]):
+                    movie = rows[int(idx)]
+                    recommendations.append(
+                        self.build_recommendation(input_movie, movie, float(score), posters.get(movie.title))
+                    )
+            
+            results.append({
+                'input_movie': movie_title,
+                'matched_title': matched_title,
+                'recommendations': recommendations
+            })
+        
+        return results
+    
+    def build_recommendation(self, input_movie: MovieRecord, movie: MovieRecord, similarity_score: float,
+                             poster_url: Optional[str]) -> Dict:
+        """
+        Build the response dictionary of one recommended movie
+        
+        Args:
+            input_movie: The input movie record
+            movie: The recommended movie record
+            similarity_score: Similarity score between the movies
+            poster_url: Poster URL of the recommended movie
+        
+        Returns:
+            Dictionary with movie details, poster, similarity score and recommendation reason
+        """
+        return {
+            'title': movie.title,
+            'language': movie.language,
+            'genres': movie.genres,
+            'director': movie.director,
+            'main_actors': movie.main_actors,
+            'year': movie.year,
+            'rating': movie.rating,
+            'poster_url': poster_url,
+            'similarity_score': round(similarity_score, 3),
+            'reason': self.generate_recommendation_reason(input_movie, movie, similarity_score)
+        }
+    
+    def generate_recommendation_reason(self, input_movie: MovieRecord, recommended_movie: MovieRecord,
+                                       similarity_score: float) -> str:
         """
         Generate a human-readable explanation for why a movie is recommended
+        Genre and actor sets and the lower-cased keys were computed when the records were built
         
         Args:
-            input_movie: The input movie data
-            recommended_movie: The recommended movie data
+            input_movie: The input movie record
+            recommended_movie: The recommended movie record
             similarity_score: Similarity score between the movies
             
         Returns:
@@ -221,26 +861,22 @@ class MovieRecommendationEngine:
         reasons = []
         
         # Check for common genres
-        input_genres = set(input_movie['genres'].lower().split(','))
-        rec_genres = set(recommended_movie['genres'].lower().split(','))
-        common_genres = input_genres.intersection(rec_genres)
+        common_genres = input_movie.genre_set & recommended_movie.genre_set
         if common_genres:
             reasons.append(f"Similar genres: {', '.join(common_genres)}")
         
         # Check for same director
-        if input_movie['director'].lower() == recommended_movie['director'].lower() and input_movie['director']:
-            reasons.append(f"Same director: {input_movie['director']}")
+        if input_movie.director_key == recommended_movie.director_key and input_movie.director:
+            reasons.append(f"Same director: {input_movie.director}")
         
         # Check for common actors
-        input_actors = set(input_movie['main_actors'].lower().split(','))
-        rec_actors = set(recommended_movie['main_actors'].lower().split(','))
-        common_actors = input_actors.intersection(rec_actors)
+        common_actors = input_movie.actor_set & recommended_movie.actor_set
         if common_actors:
             reasons.append(f"Common actors: {', '.join(common_actors)}")
         
         # Check for same language
-        if input_movie['language'].lower() == recommended_movie['language'].lower():
-            reasons.append(f"Same language: {input_movie['language']}")
+        if input_movie.language_key == recommended_movie.language_key:
+            reasons.append(f"Same language: {input_movie.language}")
         
         # If no specific reasons found, use similarity score
         if not reasons:
@@ -263,24 +899,7 @@ class MovieRecommendationEngine:
         Returns:
             Poster URL or placeholder URL if not found
         """
-        if not self.omdb_api_key:
-            return "https://via.placeholder.com/300x450/333/fff?text=No+Poster"
-        
-        try:
-            # Make request to OMDb API
-            url = f"http://www.omdbapi.com/?t={movie_title}&apikey={self.omdb_api_key}"
-            response = requests.get(url, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('Response') == 'True' and data.get('Poster') != 'N/A':
-                    return data['Poster']
-            
-        except Exception as e:
-            print(f"Error fetching poster for {movie_title}: {str(e)}")
-        
-        # Return placeholder if poster not found
-        return "https://via.placeholder.com/300x450/333/fff?text=No+Poster"
+        return self.poster_service.fetch_poster(movie_title)
     
     def get_autocomplete_suggestions(self, partial_title: str, max_suggestions: int = 5) -> List[str]:
         """
@@ -291,23 +910,13 @@ class MovieRecommendationEngine:
             max_suggestions: Maximum number of suggestions to return
             
         Returns:
-            List of movie title suggestions
+            List of movie title suggestions, titles with a word starting with the input first,
+            then titles containing it anywhere, each ranked by rating
         """
-        if len(partial_title) < 2:
-            return []
-        
-        partial_title_lower = partial_title.lower()
-        suggestions = []
-        
-        for title in self.df['title']:
-            if partial_title_lower in title.lower():
-                suggestions.append(title)
-                if len(suggestions) >= max_suggestions:
-                    break
-        
-        return suggestions
+        return self.autocomplete_index.suggest(partial_title, max_suggestions)
     
-    def get_movies_by_filters(self, language: str = None, genre: str = None, min_rating: float = None) -> List[Dict]:
+    def get_movies_by_filters(self, language: str = None, genre: str = None, min_rating: float = None,
+                              page: int = 1, per_page: int = 20) -> List[Dict]:
         """
         Get movies filtered by language, genre, or rating
         
@@ -315,55 +924,79 @@ class MovieRecommendationEngine:
             language: Filter by language
             genre: Filter by genre
             min_rating: Minimum rating filter
+            page: 1-based page number
+            per_page: Number of movies per page
             
         Returns:
-            List of filtered movies
+            List of filtered movies on the requested page
+        """
+        return self.get_filtered_page(language, genre, min_rating, page, per_page)['movies']
+    
+    def get_filtered_page(self, language: str = None, genre: str = None, min_rating: float = None,
+                          page: int = 1, per_page: int = 20, fetch_posters: bool = True) -> Dict:
         """
-        filtered_df = self.df.copy()
+        Get one page of movies filtered by language, genre, or rating
         
-        if language:
-            filtered_df = filtered_df[filtered_df['language'].str.lower() == language.lower()]
+        Args:
+            language: Filter by language
+            genre: Filter by genre
+            min_rating: Minimum rating filter
+            page: 1-based page number
+            per_page: Number of movies per page
+            fetch_posters: Resolve poster URLs; when False poster_url is None and the caller fills it in
         
-        if genre:
-            filtered_df = filtered_df[filtered_df['genres'].str.lower().str.contains(genre.lower(), na=False)]
+        Returns:
+            Dictionary with the page's movies, total matches, page, per_page and total_pages
+        """
+        page = max(1, int(page))
+        per_page = max(1, int(per_page))
         
-        if min_rating:
-            filtered_df = filtered_df[pd.to_numeric(filtered_df['rating'], errors='coerce') >= min_rating]
+        # Mask intersection over the pre-normalized columns; only the page's rows are materialized
+        page_indices, total = self.filter_index.filter(
+            language=language,
+            genre=genre,
+            min_rating=min_rating,
+            offset=(page - 1) * per_page,
+            limit=per_page
+        )
+        rows = [self.records[idx] for idx in page_indices]
+        posters = self.poster_service.get_posters(movie.title for movie in rows) if fetch_posters else {}
         
         movies = []
-        for _, movie in filtered_df.head(20).iterrows():  # Limit to 20 results
-            movies.append({
-                'title': movie['title'],
-                'language': movie['language'],
-                'genres': movie['genres'],
-                'director': movie['director'],
-                'main_actors': movie['main_actors'],
-                'year': movie['year'],
-                'rating': movie['rating'],
-                'poster_url': self.get_movie_poster(movie['title'])
-            })
+        for movie in rows:
+            movie_dict = movie.to_dict()
+            movie_dict['poster_url'] = posters.get(movie.title)
+            movies.append(movie_dict)
         
-        return movies
+        return {
+            'movies': movies,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'total_pages': -(-total // per_page)
+        }
     
     def get_dataset_stats(self) -> Dict:
         """
         Get statistics about the dataset
+        Served from counters computed when the model was built, not recomputed per call
         
         Returns:
             Dictionary containing dataset statistics
         """
-        if self.df is None:
+        if self.stats is None:
             return {}
         
-        stats = {
-            'total_movies': len(self.df),
-            'languages': self.df['language'].value_counts().to_dict(),
-            'top_directors': self.df['director'].value_counts().head(10).to_dict(),
-            'year_range': f"{self.df['year'].min()} - {self.df['year'].max()}",
-            'average_rating': round(pd.to_numeric(self.df['rating'], errors='coerce').mean(), 2)
-        }
+        return self.stats.to_dict()
+    
+    def get_dataset_stats_payload(self) -> Tuple[bytes, str]:
+        """
+        Get the serialized /api/stats response body and its ETag
         
-        return stats
+        Returns:
+            Tuple of (JSON bytes, ETag), rebuilt only after the statistics change
+        """
+        return self.stats.payload()
 
 # Example usage and testing
 if __name__ == "__main__":
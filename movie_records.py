@@ -0,0 +1,110 @@
+"""
+Movie Record Store
+One slotted Python object per movie, built once when the catalog is loaded, so hot paths
+assemble response dictionaries and recommendation reasons from plain attributes instead of
+materializing a pandas Series (df.iloc) or a records frame (df.take(...).to_dict) per request
+"""
+
+import gc
+from typing import Dict, FrozenSet, Iterable, List
+import numpy as np
+import pandas as pd
+
+# Catalog columns every response carries, in response order
+RECORD_FIELDS = ('title', 'language', 'genres', 'director', 'main_actors', 'year', 'rating')
+
+class MovieRecord:
+    """
+    Display fields of one movie plus the lower-cased keys the recommendation reason compares
+    
+    - genre_set / actor_set: lower-cased comma-separated values, split once at load
+    - director_key / language_key: lower-cased director and language
+    """
+    
+    __slots__ = RECORD_FIELDS + ('genre_set', 'actor_set', 'director_key', 'language_key')
+    
+    def __init__(self, title, language, genres, director, main_actors, year, rating,
+                 genre_set: FrozenSet[str], actor_set: FrozenSet[str], director_key: str, language_key: str):
+        self.title = title
+        self.language = language
+        self.genres = genres
+        self.director = director
+        self.main_actors = main_actors
+        self.year = year
+        self.rating = rating
+        self.genre_set = genre_set
+        self.actor_set = actor_set
+        self.director_key = director_key
+        self.language_key = language_key
+    
+    def to_dict(self) -> Dict:
+        """Display fields as a new dictionary of native Python values"""
+        return {
+            'title': self.title,
+            'language': self.language,
+            'genres': self.genres,
+            'director': self.director,
+            'main_actors': self.main_actors,
+            'year': self.year,
+            'rating': self.rating
+        }
+
+def build_records(df: pd.DataFrame) -> List[MovieRecord]:
+    """
+    Build the records of a cleaned catalog frame (see MovieRecommendationEngine.prepare_catalog)
+    
+    Values are native Python str, int and float, like to_dict('records'). Records with the same
+    language, genres, director, year or rating share one object for it, derived keys and sets
+    are computed once per distinct value, and actor names are shared across actor sets.
+    
+    Args:
+        df: Catalog rows with the RECORD_FIELDS columns
+    
+    Returns:
+        One record per row, in frame order
+    """
+    titles = df['title'].tolist()
+    actors = df['main_actors'].tolist()
+    languages, genres, directors, years, ratings = (
+        shared_values(df[field]) for field in ('language', 'genres', 'director', 'year', 'rating')
+    )
+    
+    # Millions of new containers would trigger repeated full garbage collections, none of which
+    # can free anything while the records are still being built
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        genre_sets = split_values(set(genres), {})
+        actor_sets = split_values(actors, {})
+        language_keys = {language: language.lower() for language in set(languages)}
+        director_keys = {director: director.lower() for director in set(directors)}
+        return [
+            MovieRecord(title, language, genre, director, actor, year, rating, genre_sets[genre],
+                        actor_sets[actor], director_keys[director], language_keys[language])
+            for title, language, genre, director, actor, year, rating
+            in zip(titles, languages, genres, directors, actors, years, ratings)
+        ]
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+def shared_values(values: pd.Series) -> list:
+    """Column values as a list in which equal values are the same Python object"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return np.asarray(uniques.tolist(), dtype=object)[codes].tolist()
+
+def split_values(values: Iterable[str], names: Dict[str, str]) -> Dict[str, FrozenSet[str]]:
+    """
+    Lower-cased comma-separated value set of every distinct string
+    
+    Args:
+        values: Comma-separated strings
+        names: Already seen names; equal names in different sets share one string
+    
+    Returns:
+        Dictionary mapping each distinct string to its set
+    """
+    return {
+        value: frozenset(names.setdefault(name, name) for name in value.lower().split(','))
+        for value in values
+    }
@@ -0,0 +1,407 @@
+"""
+Shared Poster / Metadata Cache
+Two-tier cache for OMDb lookups: a bounded in-process LRU in front of an on-disk SQLite store,
+with TTLs and negative caching, shared by the Flask and Streamlit front ends.
+Concurrent misses of the same title share one in-flight OMDb request (single-flight).
+"""
+
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import requests
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Overridable so load tests can point at a local stub
+OMDB_URL = os.getenv('OMDB_URL', "http://www.omdbapi.com/")
+
+DEFAULT_CACHE_PATH = os.getenv(
+    'OMDB_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'omdb_cache.sqlite3')
+)
+
+POSITIVE_TTL = 30 * 24 * 3600   # Posters and ratings rarely change
+NEGATIVE_TTL = 24 * 3600        # Retry "not found" / "N/A" titles once a day
+
+# Only these OMDb fields are kept, which keeps cache rows small
+METADATA_FIELDS = ('Title', 'Year', 'Poster', 'imdbRating', 'Ratings')
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded in-memory LRU cache with per-entry expiry
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, value); expired entries count as misses"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return False, None
+            
+            self._data.move_to_end(key)
+            return True, value
+    
+    def set(self, key: str, value: Any, expires_at: float):
+        """Store a value until the given absolute expiry time"""
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+class SQLiteCache:
+    """
+    Persistent key/value store backed by SQLite
+    
+    Values are stored as JSON with an absolute expiry time. WAL mode lets several
+    processes (gunicorn workers, Streamlit) read and write the same file.
+    """
+    
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT, expires_at REAL NOT NULL)'
+        )
+        self._conn.commit()
+    
+    def get(self, key: str) -> Tuple[bool, Any, float]:
+        """Return (hit, value, expires_at); expired rows count as misses"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+        
+        if row is None or row[1] < time.time():
+            return False, None, 0.0
+        return True, json.loads(row[0]), row[1]
+    
+    def set(self, key: str, value: Any, expires_at: float):
+        """Insert or replace a value"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), expires_at)
+            )
+            self._conn.commit()
+    
+    def purge_expired(self) -> int:
+        """Delete expired rows and return how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM cache WHERE expires_at < ?', (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+class TwoTierCache:
+    """
+    In-process LRU in front of a persistent SQLite store
+    
+    Reads check the LRU first and promote disk hits into it; writes go to both tiers.
+    A value of None is a valid cached result (negative caching).
+    """
+    
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, maxsize: int = 4096):
+        self.memory = LRUCache(maxsize)
+        self.disk = SQLiteCache(path)
+        self.hits = 0
+        self.misses = 0
+        # Guards the counters; every server thread (and asyncio.to_thread) reads through one cache
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, value) from the fastest tier that has the key"""
+        hit, value = self.memory.get(key)
+        if not hit:
+            hit, value, expires_at = self.disk.get(key)
+            if hit:
+                self.memory.set(key, value, expires_at)
+        
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return hit, value
+    
+    def get_memory(self, key: str) -> Tuple[bool, Any]:
+        """
+        Return (hit, value) from the in-process LRU only, without touching SQLite
+        Misses are not counted: the caller follows up with get() (see cache_get_async)
+        """
+        hit, value = self.memory.get(key)
+        if hit:
+            with self._lock:
+                self.hits += 1
+        return hit, value
+    
+    def set(self, key: str, value: Any, ttl: float):
+        """Store a value in both tiers for ttl seconds"""
+        expires_at = time.time() + ttl
+        self.memory.set(key, value, expires_at)
+        self.disk.set(key, value, expires_at)
+
+async def cache_get_async(cache: TwoTierCache, key: str) -> Tuple[bool, Any]:
+    """Non-blocking TwoTierCache.get: LRU hits are served inline, the SQLite read runs in a thread"""
+    hit, value = cache.get_memory(key)
+    if hit:
+        return hit, value
+    return await asyncio.to_thread(cache.get, key)
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache() -> TwoTierCache:
+    """Return the process-wide cache, creating it on first use"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = TwoTierCache()
+    return _default_cache
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time across threads
+    
+    Callers arriving while a call for their key is running wait for it and share its
+    result (or exception) instead of making the same call again.
+    """
+    
+    def __init__(self):
+        self.calls = 0
+        self.suppressed = 0
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Return func(), or the result of the running call of the same key"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                self.calls += 1
+                future = self._in_flight[key] = Future()
+            else:
+                self.suppressed += 1
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return result
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines of one event loop
+    
+    The shared call runs as its own task, so a waiter being cancelled (e.g. by a batch
+    deadline) does not cancel the call the other waiters depend on.
+    """
+    
+    def __init__(self):
+        self.calls = 0
+        self.suppressed = 0
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+    
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Return await func(), or the result of the running call of the same key"""
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = self._in_flight[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.suppressed += 1
+        return await asyncio.shield(task)
+
+# Process-wide, so lookups from every thread, Streamlit session and engine share in-flight requests
+_omdb_flights = SingleFlight()
+_omdb_async_flights = AsyncSingleFlight()
+
+def omdb_flight_stats() -> Dict:
+    """OMDb lookups that reached the network path and duplicates that waited on one of them instead"""
+    calls = _omdb_flights.calls + _omdb_async_flights.calls
+    suppressed = _omdb_flights.suppressed + _omdb_async_flights.suppressed
+    return {
+        'lookups': calls,
+        'suppressed': suppressed,
+        'suppressed_rate': round(suppressed / (calls + suppressed), 3) if calls + suppressed else 0.0,
+    }
+
+def normalize_title(title: str) -> str:
+    """Normalize a title for cache keys: case, punctuation and whitespace insensitive"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', title.lower()).split())
+
+def omdb_cache_key(title: str, year: Optional[int] = None) -> str:
+    """Build the cache key of an OMDb title lookup"""
+    return f"omdb:{normalize_title(title)}:{year or ''}"
+
+def lookup_omdb_metadata(title: str, api_key: Optional[str], year: Optional[int] = None,
+                         session: Optional[requests.Session] = None, timeout: float = 5.0,
+                         cache: Optional[TwoTierCache] = None) -> Optional[Dict]:
+    """
+    Look up OMDb metadata for a title through the shared cache
+    
+    Found titles are cached for POSITIVE_TTL; "not found" answers and titles
+    without a poster are cached for NEGATIVE_TTL. Network errors are not cached.
+    Concurrent misses of the same title and year wait for one request and share its answer.
+    
+    Args:
+        title: Movie title to search for
+        api_key: OMDb API key
+        year: Optional release year to disambiguate remakes
+        session: Optional requests session to reuse connections
+        timeout: Request timeout in seconds
+        cache: Cache to use, defaults to the process-wide cache
+    
+    Returns:
+        Dictionary with Title, Year, Poster, imdbRating and Ratings, or None if not found
+    """
+    cache = cache or get_default_cache()
+    key = omdb_cache_key(title, year)
+    
+    hit, metadata = cache.get(key)
+    if hit:
+        return metadata
+    
+    if not api_key:
+        return None
+    
+    return _omdb_flights.do(
+        (id(cache), key),
+        lambda: fetch_omdb_metadata(title, api_key, year, session, timeout, cache, key)
+    )
+
+def fetch_omdb_metadata(title: str, api_key: str, year: Optional[int], session: Optional[requests.Session],
+                        timeout: float, cache: TwoTierCache, key: str) -> Optional[Dict]:
+    """Request OMDb metadata for a cache miss and store the answer (see lookup_omdb_metadata)"""
+    # A call that finished just before this one started may have stored it already
+    hit, metadata = cache.get(key)
+    if hit:
+        return metadata
+    
+    try:
+        response = (session or requests).get(OMDB_URL, params=omdb_params(title, api_key, year), timeout=timeout)
+        
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        
+    except Exception as e:
+        print(f"Error fetching OMDb data for {title}: {str(e)}")
+        return None
+    
+    return store_omdb_response(cache, key, data)
+
+async def lookup_omdb_metadata_async(title: str, api_key: Optional[str], client, year: Optional[int] = None,
+                                     timeout: float = 5.0, cache: Optional[TwoTierCache] = None) -> Optional[Dict]:
+    """
+    Non-blocking variant of lookup_omdb_metadata for asyncio servers
+    Concurrent misses of the same title on one event loop share one request.
+    
+    Args:
+        title: Movie title to search for
+        api_key: OMDb API key
+        client: Async HTTP client with an awaitable get() (e.g. httpx.AsyncClient)
+        year: Optional release year to disambiguate remakes
+        timeout: Request timeout in seconds
+        cache: Cache to use, defaults to the process-wide cache
+    
+    Returns:
+        Dictionary with Title, Year, Poster, imdbRating and Ratings, or None if not found
+    """
+    cache = cache or get_default_cache()
+    key = omdb_cache_key(title, year)
+    
+    hit, metadata = await cache_get_async(cache, key)
+    if hit:
+        return metadata
+    
+    if not api_key:
+        return None
+    
+    return await _omdb_async_flights.do(
+        (id(asyncio.get_running_loop()), id(cache), key),
+        lambda: fetch_omdb_metadata_async(title, api_key, client, year, timeout, cache, key)
+    )
+
+async def fetch_omdb_metadata_async(title: str, api_key: str, client, year: Optional[int], timeout: float,
+                                    cache: TwoTierCache, key: str) -> Optional[Dict]:
+    """Non-blocking variant of fetch_omdb_metadata"""
+    hit, metadata = await cache_get_async(cache, key)
+    if hit:
+        return metadata
+    
+    try:
+        response = await client.get(OMDB_URL, params=omdb_params(title, api_key, year), timeout=timeout)
+        
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        
+    except Exception as e:
+        print(f"Error fetching OMDb data for {title}: {str(e)}")
+        return None
+    
+    # The SQLite write commits to disk, so keep it off the event loop
+    return await asyncio.to_thread(store_omdb_response, cache, key, data)
+
+def omdb_params(title: str, api_key: str, year: Optional[int] = None) -> Dict:
+    """Query parameters of an OMDb title lookup"""
+    # Without the type filter a bare title can match a series or an episode
+    params = {'t': title, 'type': 'movie', 'apikey': api_key}
+    if year:
+        params['y'] = year
+    return params
+
+def store_omdb_response(cache: TwoTierCache, key: str, data: Dict) -> Optional[Dict]:
+    """Cache an OMDb response under key and return its metadata (None if not found)"""
+    if data.get('Response') == 'True':
+        metadata = {field: data.get(field) for field in METADATA_FIELDS}
+        has_poster = metadata.get('Poster') not in (None, '', 'N/A')
+        cache.set(key, metadata, POSITIVE_TTL if has_poster else NEGATIVE_TTL)
+        return metadata
+    
+    cache.set(key, None, NEGATIVE_TTL)
+    return None
+
+def poster_from_metadata(metadata: Optional[Dict]) -> Optional[str]:
+    """Extract a usable poster URL from cached OMDb metadata"""
+    if metadata and metadata.get('Poster') not in (None, '', 'N/A'):
+        return metadata['Poster']
+    return None
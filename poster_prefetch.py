@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Poster Prefetch
+Warms the persistent poster cache for the whole catalog ahead of traffic: every title of the
+dataset, the generated movie database and the curated poster list is looked up on OMDb with
+bounded concurrency and a request rate limit, so request-time lookups are local cache reads
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Set, Tuple
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from poster_cache import TwoTierCache, get_default_cache, lookup_omdb_metadata, omdb_cache_key
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'poster_prefetch.json')
+
+# The free OMDb tier allows 1,000 requests a day; paid keys allow far more
+DEFAULT_RATE_LIMIT = 5.0
+
+# Completed lookups between checkpoint writes
+CHECKPOINT_INTERVAL = 100
+
+class RateLimiter:
+    """Spaces calls at least 1 / rate seconds apart across all threads"""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until the caller may send its request"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def catalog_titles(dataset_path: Optional[str] = 'indian_movies_dataset.csv', generated: bool = True,
+                   curated: bool = True) -> List[Tuple[str, Optional[int]]]:
+    """
+    Collect the (title, year) lookups the apps make, each cache key once
+    
+    Dataset and curated titles are looked up without a year, like the Flask and Streamlit
+    recommenders do; generated movies with their year, like ai_movie_app_clean. Generated
+    years come from a fixed seed, so they match the years the app looks up.
+    
+    Args:
+        dataset_path: Movie dataset (CSV, Parquet or Arrow); None skips it
+        generated: Include the generated catalog of movie_database_generator
+        curated: Include the titles of movie_posters.MOVIE_POSTERS
+    
+    Returns:
+        (title, year) pairs in source order
+    """
+    entries = []
+    
+    if dataset_path:
+        from catalog_store import load_catalog
+        try:
+            titles = load_catalog(dataset_path, ['title'])['title'].dropna()
+            entries.extend((str(title), None) for title in titles)
+        except (OSError, KeyError, pd.errors.EmptyDataError) as e:
+            print(f"⚠️  Skipping dataset {dataset_path}: {str(e)}")
+    
+    if generated:
+        from movie_database_generator import get_catalog
+        entries.extend((movie['title'], movie['year']) for movie in get_catalog())
+    
+    if curated:
+        from movie_posters import MOVIE_POSTERS
+        entries.extend((title, None) for title in MOVIE_POSTERS)
+    
+    unique = {}
+    for title, year in entries:
+        unique.setdefault(omdb_cache_key(title, year), (title, year))
+    return list(unique.values())
+
+def load_checkpoint(path: str) -> Set[str]:
+    """Cache keys an unfinished previous run already looked up (found or definitively not found)"""
+    try:
+        with open(path) as f:
+            return set(json.load(f)['completed'])
+    except (OSError, ValueError, KeyError):
+        return set()
+
+def save_checkpoint(path: str, completed: Set[str]):
+    """Write the finished cache keys atomically"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'completed': sorted(completed), 'updated_at': time.time()}, f)
+    os.replace(tmp_path, path)
+
+def prefetch_posters(entries: List[Tuple[str, Optional[int]]], api_key: str, max_workers: int = 4,
+                     rate_limit: float = DEFAULT_RATE_LIMIT, checkpoint_path: Optional[str] = DEFAULT_CHECKPOINT_PATH,
+                     cache: Optional[TwoTierCache] = None,
+                     session: Optional[requests.Session] = None, timeout: float = 10.0) -> Dict[str, int]:
+    """
+    Look up every entry on OMDb and store the answers in the persistent cache
+    
+    Entries still in the on-disk cache are skipped. Finished keys are checkpointed while the
+    run goes on, so an interrupted run resumes where it stopped even with another cache file.
+    Lookups that fail with a network error are not checkpointed, and the checkpoint is kept
+    until a run finishes without failures, so the next run retries them.
+    
+    Args:
+        entries: (title, year) lookups, e.g. from catalog_titles
+        api_key: OMDb API key
+        max_workers: Maximum number of concurrent OMDb requests
+        rate_limit: Maximum OMDb requests per second; 0 disables the limit
+        checkpoint_path: File recording finished keys so an interrupted run resumes; None disables it
+        cache: Poster cache, defaults to the process-wide shared cache
+        session: HTTP session, defaults to a keep-alive session sized to max_workers
+        timeout: Timeout of a single OMDb request in seconds
+    
+    Returns:
+        Counts of fetched, not_found, failed and skipped entries
+    """
+    cache = cache or get_default_cache()
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    
+    completed = load_checkpoint(checkpoint_path) if checkpoint_path else set()
+    counts = {'fetched': 0, 'not_found': 0, 'failed': 0, 'skipped': 0}
+    
+    pending = []
+    for title, year in entries:
+        key = omdb_cache_key(title, year)
+        # The disk tier is read directly so the check does not fill the in-memory LRU
+        if key in completed or cache.disk.get(key)[0]:
+            counts['skipped'] += 1
+        else:
+            pending.append((title, year, key))
+    
+    print(f"📥 Prefetching {len(pending)} posters ({counts['skipped']} already cached) "
+          f"with {max_workers} workers at {rate_limit or 'unlimited'} requests/s")
+    
+    limiter = RateLimiter(rate_limit)
+    
+    def fetch(title: str, year: Optional[int], key: str) -> str:
+        limiter.acquire()
+        metadata = lookup_omdb_metadata(title, api_key, year=year, session=session, timeout=timeout, cache=cache)
+        if metadata is not None:
+            return 'fetched'
+        # Network errors are the only misses that leave nothing in the cache
+        return 'not_found' if cache.disk.get(key)[0] else 'failed'
+    
+    start = time.perf_counter()
+    since_checkpoint = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='poster-prefetch') as executor:
+            # At most two lookups per worker are queued, so huge catalogs do not queue every future up front
+            queue = iter(pending)
+            in_flight = {}
+            while True:
+                for title, year, key in queue:
+                    in_flight[executor.submit(fetch, title, year, key)] = key
+                    if len(in_flight) >= 2 * max_workers:
+                        break
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = in_flight.pop(future)
+                    outcome = future.result()
+                    counts[outcome] += 1
+                    if outcome != 'failed':
+                        completed.add(key)
+                        since_checkpoint += 1
+                
+                finished = counts['fetched'] + counts['not_found'] + counts['failed']
+                if checkpoint_path and since_checkpoint >= CHECKPOINT_INTERVAL:
+                    save_checkpoint(checkpoint_path, completed)
+                    since_checkpoint = 0
+                    print(f"   {finished}/{len(pending)} done in {time.perf_counter() - start:.0f}s")
+    finally:
+        # Also written when interrupted, so the next run resumes from here
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, completed)
+    
+    # A finished run needs no resume point; expired cache entries are looked up again next time
+    if checkpoint_path and not counts['failed']:
+        os.remove(checkpoint_path)
+    return counts
+
+def main():
+    """Command line entry point: warm the poster cache for the whole catalog"""
+    parser = argparse.ArgumentParser(description='Prefetch OMDb posters of the whole catalog into the poster cache')
+    parser.add_argument('--dataset', default='indian_movies_dataset.csv', help='Path to the movie dataset')
+    parser.add_argument('--no-generated', action='store_true', help='Skip the generated movie database')
+    parser.add_argument('--no-curated', action='store_true', help='Skip the curated movie_posters titles')
+    parser.add_argument('--workers', type=int, default=4, help='Maximum concurrent OMDb requests')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_LIMIT,
+                        help='Maximum OMDb requests per second (0 for no limit)')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT_PATH, help='Checkpoint file used to resume')
+    
+    args = parser.parse_args()
+    
+    api_key = os.getenv('OMDB_API_KEY', '7f7c782e-0051-449b-8636-94d0a0719c05')
+    entries = catalog_titles(args.dataset, generated=not args.no_generated, curated=not args.no_curated)
+    
+    start = time.perf_counter()
+    counts = prefetch_posters(entries, api_key, max_workers=args.workers, rate_limit=args.rate,
+                              checkpoint_path=args.checkpoint)
+    print(f"✅ Prefetched {len(entries)} titles in {time.perf_counter() - start:.1f}s: "
+          f"{counts['fetched']} found, {counts['not_found']} not found, {counts['failed']} failed, "
+          f"{counts['skipped']} already cached")
+    if counts['failed']:
+        print("⚠️  Run the command again to retry the failed lookups")
+
+if __name__ == "__main__":
+    main()
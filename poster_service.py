@@ -0,0 +1,142 @@
+"""
+OMDb Poster Service
+Resolves movie posters for a whole result set concurrently through a bounded thread pool,
+one shared keep-alive HTTP session and a total deadline per batch.
+Lookups go through the shared two-tier poster cache, so repeat titles never hit the network.
+"""
+
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterable, Optional
+from poster_cache import TwoTierCache, get_default_cache, lookup_omdb_metadata, omdb_cache_key, poster_from_metadata
+
+PLACEHOLDER_POSTER = "https://via.placeholder.com/300x450/333/fff?text=No+Poster"
+
+class PosterService:
+    """
+    Fetches poster URLs from the OMDb API
+    
+    A single service instance is meant to be shared by all requests of a process,
+    so the HTTP connections and worker threads are reused between batches.
+    """
+    
+    def __init__(self, api_key: Optional[str], max_workers: int = 8, request_timeout: float = 5.0,
+                 batch_deadline: float = 3.0, placeholder: str = PLACEHOLDER_POSTER,
+                 cache: Optional[TwoTierCache] = None):
+        """
+        Initialize the poster service
+        
+        Args:
+            api_key: OMDb API key; without one every lookup returns the placeholder
+            max_workers: Maximum number of concurrent OMDb requests
+            request_timeout: Timeout of a single OMDb request in seconds
+            batch_deadline: Total time budget for resolving one batch in seconds
+            placeholder: URL returned for titles without a poster
+            cache: Poster cache, defaults to the process-wide shared cache
+        """
+        self.api_key = api_key
+        self.request_timeout = request_timeout
+        self.batch_deadline = batch_deadline
+        self.placeholder = placeholder
+        self.cache = cache or get_default_cache()
+        
+        # One keep-alive session whose connection pool matches the worker count
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='omdb-poster')
+    
+    def fetch_poster(self, movie_title: str) -> str:
+        """
+        Fetch one poster URL from OMDb
+        
+        Args:
+            movie_title: Movie title to search for
+        
+        Returns:
+            Poster URL or the placeholder URL if not found
+        """
+        metadata = lookup_omdb_metadata(
+            movie_title,
+            self.api_key,
+            session=self.session,
+            timeout=self.request_timeout,
+            cache=self.cache
+        )
+        return poster_from_metadata(metadata) or self.placeholder
+    
+    def cached_poster(self, movie_title: str, year: Optional[int] = None) -> Optional[str]:
+        """
+        Return the cached poster URL of a title without waiting for the network
+        
+        A miss schedules the OMDb lookup on the thread pool and returns None, so the
+        poster is a cache hit on a later render. Concurrent misses of one title share a
+        single request.
+        
+        Args:
+            movie_title: Movie title to look up
+            year: Release year to disambiguate remakes
+        
+        Returns:
+            Poster URL, or None if it is not cached (yet) or the movie has no poster
+        """
+        hit, metadata = self.cache.get(omdb_cache_key(movie_title, year))
+        if hit:
+            return poster_from_metadata(metadata)
+        
+        if self.api_key:
+            self.executor.submit(
+                lookup_omdb_metadata,
+                movie_title,
+                self.api_key,
+                year=year,
+                session=self.session,
+                timeout=self.request_timeout,
+                cache=self.cache
+            )
+        return None
+    
+    def get_posters(self, titles: Iterable[str], deadline: Optional[float] = None) -> Dict[str, str]:
+        """
+        Fetch posters for several titles concurrently
+        
+        Titles that are not resolved before the deadline get the placeholder;
+        their requests finish in the background instead of stalling the response.
+        
+        Args:
+            titles: Movie titles to resolve (duplicates are fetched once)
+            deadline: Total time budget in seconds, defaults to batch_deadline
+        
+        Returns:
+            Dictionary mapping every requested title to a poster URL
+        """
+        posters = {}
+        missing = []
+        
+        # Serve cached titles directly; only misses go to the thread pool
+        for title in dict.fromkeys(titles):
+            hit, metadata = self.cache.get(omdb_cache_key(title))
+            if hit:
+                posters[title] = poster_from_metadata(metadata) or self.placeholder
+            elif not self.api_key:
+                posters[title] = self.placeholder
+            else:
+                missing.append(title)
+        
+        if not missing:
+            return posters
+        
+        futures = {self.executor.submit(self.fetch_poster, title): title for title in missing}
+        done, not_done = wait(futures, timeout=self.batch_deadline if deadline is None else deadline)
+        
+        for future, title in futures.items():
+            posters[title] = future.result() if future in done else self.placeholder
+        
+        # Drop lookups that never started; running ones cannot be interrupted
+        for future in not_done:
+            future.cancel()
+        
+        return posters
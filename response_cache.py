@@ -0,0 +1,121 @@
+"""
+Response Cache
+Bounded, model-versioned cache of computed API results with request coalescing: concurrent
+misses on the same key wait for the one request computing it instead of computing it again
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+from poster_cache import LRUCache
+
+class ResponseCache:
+    """
+    Results of expensive calls keyed per model version
+    
+    Entries live in an LRU bounded by maxsize and expire after ttl seconds. Results should
+    not carry per-request failures (e.g. placeholder posters), since every hit within the ttl
+    serves them again.
+    Versions only move forward: a newer model version empties the cache, while requests
+    still computing with an older model (e.g. during a hot swap) bypass the cache.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 600):
+        """
+        Args:
+            maxsize: Maximum number of cached results; 0 disables caching (calls still coalesce)
+            ttl: Seconds a cached result stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = None
+        
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.stale = 0
+        
+        self._entries = LRUCache(maxsize)
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+    
+    def get_or_compute(self, version: Hashable, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result of key, computing it once on a miss
+        
+        Args:
+            version: Version of the model the result is computed from; versions must be
+                comparable and increase with every model change, e.g. (registry version, model version)
+            key: Cache key of the result within that version
+            compute: Called without arguments on a miss; exceptions propagate to every waiter
+        
+        Returns:
+            The cached or freshly computed result
+        """
+        with self._lock:
+            if self.version is not None and version < self.version:
+                # Computed from an outdated model (e.g. during a hot swap): neither served nor stored
+                self.stale += 1
+                future = None
+            else:
+                if version != self.version:
+                    # In-flight computations of the old version finish but are not stored
+                    self._entries.clear()
+                    self._in_flight = {}
+                    if self.version is not None:
+                        self.invalidations += 1
+                    self.version = version
+                
+                hit, value = self._entries.get(key)
+                if hit:
+                    self.hits += 1
+                    return value
+                
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    self.misses += 1
+                    future = self._in_flight[key] = Future()
+                else:
+                    self.coalesced += 1
+        
+        if future is None:
+            return compute()
+        if not leader:
+            return future.result()
+        
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._finish(key, future)
+            future.set_exception(e)
+            raise
+        
+        with self._lock:
+            self._finish(key, future)
+            if version == self.version and self.maxsize > 0:
+                self._entries.set(key, value, time.time() + self.ttl)
+        future.set_result(value)
+        return value
+    
+    def _finish(self, key: Hashable, future: Future):
+        """Stop routing new misses of key to future; call with the lock held"""
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+    
+    def stats(self) -> Dict:
+        """Counters for the admin endpoint; hit_rate counts coalesced requests as hits"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'hit_rate': round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'stale': self.stale,
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+        }
@@ -0,0 +1,182 @@
+"""
+Movie Search Index
+Token-level inverted index over several movie fields with sorted integer postings, AND / OR
+queries, prefix matching and per-field boosts, so a search merges a few postings lists
+instead of lower-casing every field of every movie
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Mapping, Optional
+import numpy as np
+
+TOKEN = re.compile(r'[^\W_]+')
+
+# A title hit outranks a director hit, which outranks a cast, genre or language hit
+FIELD_BOOSTS = {
+    'title': 8.0,
+    'director': 3.0,
+    'cast': 2.0,
+    'genre': 1.0,
+    'language': 1.0,
+}
+
+# A token merely starting with the query term scores this fraction of an exact token match
+PREFIX_WEIGHT = 0.5
+
+# Shorter terms only match whole tokens; a one-letter prefix would match most of the catalog
+MIN_PREFIX_LENGTH = 2
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased alphanumeric tokens of a string"""
+    return TOKEN.findall(text.lower())
+
+class SearchIndex:
+    """
+    Inverted index from the tokens of each field to the ids of the documents containing them
+    
+    Every field keeps its own postings (sorted np.int32 document ids) and a sorted vocabulary,
+    so a prefix is a contiguous vocabulary range found with one bisect. A document's score is
+    the sum over query terms of the boosts of the fields the term matches, each divided by the
+    square root of the field's token count. Results are ranked by score, then by the
+    documents' own score (e.g. rating), then by id.
+    """
+    
+    def __init__(self, documents: Iterable[Mapping], boosts: Optional[Dict[str, float]] = None,
+                 scores: Optional[Iterable[float]] = None):
+        """
+        Build the index
+        
+        Args:
+            documents: Mappings with a string value for every boosted field; ids are positions
+            boosts: Boost per indexed field, defaults to FIELD_BOOSTS
+            scores: Tie-break score per document, higher first; defaults to document order
+        """
+        self.boosts = dict(boosts or FIELD_BOOSTS)
+        
+        postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in self.boosts}
+        lengths: Dict[str, List[int]] = {field: [] for field in self.boosts}
+        num_documents = 0
+        for doc_id, document in enumerate(documents):
+            for field, field_postings in postings.items():
+                tokens = tokenize(str(document[field]))
+                lengths[field].append(len(tokens))
+                for token in set(tokens):
+                    field_postings.setdefault(token, []).append(doc_id)
+            num_documents = doc_id + 1
+        
+        # Ids are appended in increasing order, so every postings list is already sorted
+        self.postings = {
+            field: {token: np.array(ids, dtype=np.int32) for token, ids in field_postings.items()}
+            for field, field_postings in postings.items()
+        }
+        self.vocabularies = {field: sorted(field_postings) for field, field_postings in postings.items()}
+        
+        # A hit in a short field counts more: "dangal" ranks "Dangal" above "Dangal 2"
+        self.norms = {
+            field: 1.0 / np.sqrt(np.maximum(np.array(field_lengths, dtype=np.float64), 1.0))
+            for field, field_lengths in lengths.items()
+        }
+        
+        if scores is None:
+            self.scores = np.zeros(num_documents, dtype=np.float64)
+        else:
+            self.scores = np.nan_to_num(np.asarray(list(scores), dtype=np.float64), nan=-np.inf)
+        self.size = num_documents
+    
+    def _prefix_ids(self, field: str, term: str) -> np.ndarray:
+        """Sorted ids of documents with a token in field that starts with term but is not term"""
+        vocabulary = self.vocabularies[field]
+        start = bisect_left(vocabulary, term)
+        if start < len(vocabulary) and vocabulary[start] == term:
+            start += 1
+        
+        matches = []
+        for token in vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            matches.append(self.postings[field][token])
+        if not matches:
+            return np.empty(0, dtype=np.int32)
+        return matches[0] if len(matches) == 1 else np.unique(np.concatenate(matches))
+    
+    def term_scores(self, term: str, prefix: bool = True):
+        """
+        Documents matching one query term and their summed, length-normalized field boosts
+        
+        Args:
+            term: Lower-cased query token
+            prefix: Also match tokens starting with the term
+        
+        Returns:
+            (ids, scores): sorted document ids and the score of each
+        """
+        ids, weights = [], []
+        for field, boost in self.boosts.items():
+            exact = self.postings[field].get(term)
+            if exact is not None:
+                ids.append(exact)
+                weights.append(boost * self.norms[field][exact])
+            
+            if prefix and len(term) >= MIN_PREFIX_LENGTH:
+                prefixed = self._prefix_ids(field, term)
+                if exact is not None:
+                    # An exact match of the same field already scores the full boost
+                    prefixed = np.setdiff1d(prefixed, exact, assume_unique=True)
+                ids.append(prefixed)
+                weights.append(boost * PREFIX_WEIGHT * self.norms[field][prefixed])
+        
+        if not ids:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+        
+        # Sum the boosts of every field the term matches in
+        ids, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+        return ids, np.bincount(inverse, weights=np.concatenate(weights), minlength=len(ids))
+    
+    def search_ids(self, query: str, limit: int = 10, mode: str = 'and', prefix: bool = True) -> List[int]:
+        """
+        Return up to limit document ids matching the query, best first
+        
+        Args:
+            query: Free text; split into lower-cased tokens
+            limit: Maximum number of results
+            mode: 'and' requires every term to match, 'or' any of them
+            prefix: Also match tokens starting with a term (terms of MIN_PREFIX_LENGTH or more)
+        
+        Returns:
+            Document ids ranked by relevance, then document score, then id
+        """
+        if mode not in ('and', 'or'):
+            raise ValueError(f"Unknown search mode: {mode} (use 'and' or 'or')")
+        
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        
+        matches = [self.term_scores(term, prefix) for term in terms]
+        
+        if mode == 'and':
+            # Intersect from the shortest postings, so the candidate set only shrinks
+            matches.sort(key=lambda match: len(match[0]))
+            ids, scores = matches[0]
+            for term_ids, term_scores in matches[1:]:
+                if not len(ids):
+                    break
+                ids, left, right = np.intersect1d(ids, term_ids, assume_unique=True, return_indices=True)
+                scores = scores[left] + term_scores[right]
+        else:
+            ids, inverse = np.unique(np.concatenate([term_ids for term_ids, _ in matches]), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate([term_scores for _, term_scores in matches]),
+                                 minlength=len(ids))
+        
+        if not len(ids):
+            return []
+        
+        # Rank every match instead of stopping at the first limit ids, which favoured low ids
+        if len(ids) > limit:
+            # Keep the candidates scoring at least the limit-th best, ties included, before sorting
+            threshold = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            keep = scores >= threshold
+            ids, scores = ids[keep], scores[keep]
+        order = np.lexsort((ids, -self.scores[ids], -scores))
+        return ids[order[:limit]].tolist()
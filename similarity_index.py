@@ -0,0 +1,277 @@
+"""
+Top-K Similarity Index
+Stores only the K nearest neighbours of every movie instead of a dense N×N cosine similarity matrix
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from typing import Optional, Tuple
+
+
+def build_neighbor_index(tfidf_matrix, k: int = 50, chunk_size: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build a top-K neighbour index from an L2-normalized sparse TF-IDF matrix
+    
+    Rows are scored in chunks (chunk_size × N at a time) so peak memory stays
+    bounded, and only the best K neighbours of each movie are kept.
+    TfidfVectorizer L2-normalizes its rows, so the dot product is the cosine similarity.
+    Dense L2-normalized embeddings work the same way.
+    
+    Args:
+        tfidf_matrix: Sparse TF-IDF matrix of shape (N, F), or dense embeddings of shape (N, d)
+        k: Number of neighbours to keep per movie
+        chunk_size: Number of rows scored per chunk
+    
+    Returns:
+        Tuple of (neighbor_indices, neighbor_scores), both of shape (N, K),
+        sorted by descending similarity. The movie itself is never its own neighbour.
+    """
+    n_movies = tfidf_matrix.shape[0]
+    k = max(0, min(k, n_movies - 1))
+    
+    neighbor_indices = np.empty((n_movies, k), dtype=np.int32)
+    neighbor_scores = np.empty((n_movies, k), dtype=np.float32)
+    
+    if k == 0:
+        return neighbor_indices, neighbor_scores
+    
+    matrix_t = tfidf_matrix.T.tocsc() if sp.issparse(tfidf_matrix) else tfidf_matrix.T
+    
+    for start in range(0, n_movies, chunk_size):
+        end = min(start + chunk_size, n_movies)
+        rows = np.arange(end - start)
+        
+        # Dense (chunk × N) block of cosine similarities
+        sims = to_dense(tfidf_matrix[start:end] @ matrix_t).astype(np.float32, copy=False)
+        
+        # Exclude each movie from its own neighbour list
+        sims[rows, rows + start] = -np.inf
+        
+        # Partial selection of the K best columns, then a small sort within them
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        
+        neighbor_indices[start:end] = np.take_along_axis(top, order, axis=1)
+        neighbor_scores[start:end] = np.take_along_axis(top_scores, order, axis=1)
+    
+    return neighbor_indices, neighbor_scores
+
+
+def top_n_indices(scores: np.ndarray, n: int, exclude: Optional[int] = None) -> np.ndarray:
+    """
+    Select the indices of the N highest scores without sorting the whole row
+    
+    Uses argpartition for an O(N) partial selection followed by a small sort of
+    the candidates, which are ordered by descending score and then ascending index.
+    
+    Args:
+        scores: 1-D array of similarity scores
+        n: Number of indices to return
+        exclude: Index to leave out of the result (typically the query movie)
+    
+    Returns:
+        Array of up to N indices sorted by descending score
+    """
+    scores = np.asarray(scores)
+    num_scores = scores.shape[0]
+    k = min(n + (1 if exclude is not None else 0), num_scores)
+    
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    
+    if k < num_scores:
+        candidates = np.argpartition(scores, num_scores - k)[num_scores - k:]
+    else:
+        candidates = np.arange(num_scores)
+    
+    # Sort only the K candidates: descending score, then ascending index
+    candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+    
+    if exclude is not None:
+        candidates = candidates[candidates != exclude]
+    
+    return candidates[:n]
+
+
+def top_n_rows(scores: np.ndarray, n: int, exclude: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized top-N selection for every row of a 2-D score matrix
+    
+    One argpartition over all rows, then a sort of the N candidates per row
+    (descending score, then ascending index).
+    
+    Args:
+        scores: Array of shape (S, N), one row of similarity scores per seed
+        n: Number of indices to return per row
+        exclude: Optional column index per row to leave out (typically the seed movie itself)
+    
+    Returns:
+        Tuple of (indices, scores), both of shape (S, min(n, available columns))
+    """
+    scores = np.array(scores, dtype=np.float32)
+    num_rows, num_scores = scores.shape
+    
+    if exclude is not None:
+        scores[np.arange(num_rows), exclude] = -np.inf
+        num_scores -= 1
+    
+    k = max(0, min(n, num_scores))
+    if k == 0:
+        return np.empty((num_rows, 0), dtype=np.intp), np.empty((num_rows, 0), dtype=np.float32)
+    
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.lexsort((top, -top_scores), axis=1)
+    
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def profile_vector(tfidf_matrix, liked: np.ndarray, disliked: Optional[np.ndarray] = None,
+                   dislike_weight: float = 0.5) -> np.ndarray:
+    """
+    Build an L2-normalized taste profile from liked and disliked movies
+    
+    The profile is the mean of the liked rows minus dislike_weight times the mean of
+    the disliked rows (a Rocchio-style centroid), as a dense vector of length F.
+    
+    Args:
+        tfidf_matrix: Sparse TF-IDF matrix of shape (N, F), or dense embeddings
+        liked: Indices of liked movies (at least one)
+        disliked: Optional indices of disliked movies
+        dislike_weight: Weight of the disliked centroid
+    
+    Returns:
+        Dense float32 profile vector of shape (F,)
+    """
+    profile = np.asarray(tfidf_matrix[liked].mean(axis=0), dtype=np.float32).ravel()
+    
+    if disliked is not None and len(disliked):
+        profile -= dislike_weight * np.asarray(tfidf_matrix[disliked].mean(axis=0), dtype=np.float32).ravel()
+    
+    norm = np.linalg.norm(profile)
+    if norm > 0:
+        profile /= norm
+    return profile
+
+
+def profile_scores(tfidf_matrix, profile: np.ndarray) -> np.ndarray:
+    """
+    Score every movie against a profile vector with one matrix-vector product
+    
+    Args:
+        tfidf_matrix: Sparse TF-IDF matrix of shape (N, F) with L2-normalized rows, or dense embeddings
+        profile: Dense L2-normalized vector of shape (F,)
+    
+    Returns:
+        Cosine similarity of every movie to the profile, shape (N,)
+    """
+    return np.asarray(tfidf_matrix @ profile, dtype=np.float32).ravel()
+
+
+def similarity_block(vectors, rows, cols=None) -> np.ndarray:
+    """
+    Dense cosine similarities between some movies and all (or some other) movies
+    
+    Args:
+        vectors: L2-normalized sparse TF-IDF matrix or dense embeddings of shape (N, F)
+        rows: Indices of the query movies
+        cols: Optional indices of the movies to compare against, defaults to all
+    
+    Returns:
+        Array of shape (len(rows), len(cols) or N)
+    """
+    targets = vectors if cols is None else vectors[cols]
+    return to_dense(vectors[rows] @ targets.T)
+
+
+def to_dense(scores) -> np.ndarray:
+    """Turn the result of a sparse or dense product into a NumPy array"""
+    return scores.toarray() if sp.issparse(scores) else np.asarray(scores)
+
+
+def extend_neighbor_index(vectors, neighbor_indices: np.ndarray, neighbor_scores: np.ndarray,
+                          chunk_size: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Add rows for movies appended to vectors since the neighbour index was built
+    
+    New movies get their top-K over the whole catalog. Existing movies take a new movie
+    into their list only where it beats their current K-th neighbour, so the N × N
+    scoring of a rebuild is replaced by (new × N).
+    
+    Args:
+        vectors: L2-normalized vectors of all movies, the new ones last
+        neighbor_indices: Current (N_old, K) neighbour indices
+        neighbor_scores: Current (N_old, K) neighbour scores
+        chunk_size: Number of new rows scored per chunk
+    
+    Returns:
+        Tuple of (neighbor_indices, neighbor_scores) of shape (N, K)
+    """
+    num_old, k = neighbor_indices.shape
+    num_movies = vectors.shape[0]
+    
+    indices = np.empty((num_movies, k), dtype=np.int32)
+    scores = np.empty((num_movies, k), dtype=np.float32)
+    indices[:num_old] = neighbor_indices
+    scores[:num_old] = neighbor_scores
+    
+    if k == 0:
+        return indices, scores
+    
+    for start in range(num_old, num_movies, chunk_size):
+        rows = np.arange(start, min(start + chunk_size, num_movies))
+        sims = similarity_block(vectors, rows).astype(np.float32, copy=False)
+        
+        indices[rows], scores[rows] = top_n_rows(sims, k, exclude=rows)
+        
+        # Existing movies whose K-th neighbour is beaten by one of the new movies
+        old_sims = sims[:, :num_old]
+        improved = np.flatnonzero((old_sims > scores[:num_old, -1]).any(axis=0))
+        if improved.size:
+            candidates = np.concatenate([indices[improved], np.broadcast_to(rows, (improved.size, rows.size))], axis=1)
+            candidate_scores = np.concatenate([scores[improved], old_sims[:, improved].T], axis=1)
+            order = np.lexsort((candidates, -candidate_scores), axis=1)[:, :k]
+            indices[improved] = np.take_along_axis(candidates, order, axis=1)
+            scores[improved] = np.take_along_axis(candidate_scores, order, axis=1)
+    
+    return indices, scores
+
+
+def compact_neighbor_index(vectors, neighbor_indices: np.ndarray, neighbor_scores: np.ndarray,
+                           keep: np.ndarray, chunk_size: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drop removed movies from a neighbour index
+    
+    Surviving ids are renumbered. Only the lists that contained a removed movie
+    are scored again, against the remaining catalog.
+    
+    Args:
+        vectors: L2-normalized vectors of the remaining movies
+        neighbor_indices: Current (N_old, K) neighbour indices
+        neighbor_scores: Current (N_old, K) neighbour scores
+        keep: Boolean mask of length N_old, True for movies that stay
+        chunk_size: Number of rows scored per chunk
+    
+    Returns:
+        Tuple of (neighbor_indices, neighbor_scores) of shape (N, min(K, N - 1))
+    """
+    id_map = np.full(len(keep), -1, dtype=np.int32)
+    id_map[keep] = np.arange(int(keep.sum()), dtype=np.int32)
+    
+    indices = id_map[neighbor_indices[keep]]
+    scores = np.array(neighbor_scores[keep], dtype=np.float32)
+    
+    num_movies = indices.shape[0]
+    k = max(0, min(indices.shape[1], num_movies - 1))
+    broken = np.flatnonzero((indices[:, :k] < 0).any(axis=1))
+    indices, scores = indices[:, :k], scores[:, :k]
+    
+    if k == 0:
+        return indices, scores
+    
+    for start in range(0, broken.size, chunk_size):
+        rows = broken[start:start + chunk_size]
+        indices[rows], scores[rows] = top_n_rows(similarity_block(vectors, rows), k, exclude=rows)
+    
+    return indices, scores
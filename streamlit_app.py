@@ -9,6 +9,7 @@ import json
 import random
 from typing import List, Dict, Optional
 import google.generativeai as genai
+from similarity_index import top_n_indices
 
 # Configure Streamlit page
 st.set_page_config(
@@ -350,9 +351,9 @@ class AIMovieRecommender:
         if movie_idx is None:
             return []
         
-        sim_scores = list(enumerate(self.cosine_sim[movie_idx]))
-        sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-        similar_movies = sim_scores[1:num_recs + 1]
+        sim_scores = self.cosine_sim[movie_idx]
+        top_indices = top_n_indices(sim_scores, num_recs, exclude=movie_idx)
+        similar_movies = [(int(idx), float(sim_scores[idx])) for idx in top_indices]
         
         recommendations = []
         input_movie = self.df.iloc[movie_idx]
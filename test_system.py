@@ -69,6 +69,823 @@ def test_recommendation_engine():
         print(f"\n❌ Recommendation engine test failed: {str(e)}")
         return False
 
+def test_similarity_index():
+    """Test the top-K neighbour index and top-N selection against a brute-force sort"""
+    print("\n🧮 Testing Similarity Index...")
+    print("=" * 50)
+    
+    try:
+        import numpy as np
+        from scipy.sparse import random as sparse_random
+        from sklearn.preprocessing import normalize
+        from similarity_index import build_neighbor_index, top_n_indices
+        
+        matrix = normalize(sparse_random(300, 40, density=0.2, format='csr', random_state=7))
+        dense_sim = (matrix @ matrix.T).toarray()
+        
+        neighbor_indices, neighbor_scores = build_neighbor_index(matrix, k=10, chunk_size=64)
+        
+        for idx in range(matrix.shape[0]):
+            expected = sorted((i for i in range(matrix.shape[0]) if i != idx), key=lambda i: -dense_sim[idx, i])[:10]
+            if not np.allclose(neighbor_scores[idx], dense_sim[idx, expected], atol=1e-6):
+                print(f"❌ Neighbour scores differ for movie {idx}")
+                return False
+            if idx in neighbor_indices[idx]:
+                print(f"❌ Movie {idx} is listed as its own neighbour")
+                return False
+            
+            top = top_n_indices(dense_sim[idx], 10, exclude=idx)
+            if not np.allclose(dense_sim[idx, top], dense_sim[idx, expected]) or idx in top:
+                print(f"❌ Top-N selection differs for movie {idx}")
+                return False
+        
+        print(f"✅ Neighbour index matches brute force for {matrix.shape[0]} movies")
+        
+        # Dense vectors (SVD embeddings) go through the same neighbour index code
+        dense_indices, dense_scores = build_neighbor_index(matrix.toarray(), k=10, chunk_size=64)
+        if not np.allclose(dense_scores, neighbor_scores, atol=1e-5):
+            print(f"❌ Dense neighbour index differs from the sparse one")
+            return False
+        
+        from embeddings import fit_embeddings
+        embeddings, components = fit_embeddings(matrix, dim=16)
+        if embeddings.dtype != np.float32 or not np.allclose(np.linalg.norm(embeddings, axis=1), 1, atol=1e-5):
+            print(f"❌ Embeddings are not L2-normalized float32 rows")
+            return False
+        
+        print(f"✅ Dense neighbour index and SVD embeddings check out")
+        
+        # Probing every bucket makes the LSH index exhaustive, so it must agree exactly
+        from ann_index import LSHIndex
+        ann_index = LSHIndex(matrix, num_tables=2, num_bits=1, num_probes=1)
+        for idx in range(matrix.shape[0]):
+            indices, scores = ann_index.query(matrix[idx], 10, exclude=idx)
+            if not np.allclose(scores, neighbor_scores[idx], atol=1e-6) or idx in indices:
+                print(f"❌ LSH results differ for movie {idx}")
+                return False
+        
+        print(f"✅ Exhaustive LSH probing matches the neighbour index")
+        
+        # Growing and shrinking the index incrementally must match a rebuild
+        from similarity_index import compact_neighbor_index, extend_neighbor_index
+        partial_indices, partial_scores = build_neighbor_index(matrix[:250], k=10)
+        grown_indices, grown_scores = extend_neighbor_index(matrix, partial_indices, partial_scores, chunk_size=16)
+        if not np.allclose(grown_scores, neighbor_scores, atol=1e-6):
+            print(f"❌ Extended neighbour index differs from a rebuild")
+            return False
+        
+        keep = np.ones(matrix.shape[0], dtype=bool)
+        keep[::7] = False
+        _, compact_scores = compact_neighbor_index(matrix[keep], neighbor_indices, neighbor_scores, keep)
+        _, rebuilt_scores = build_neighbor_index(matrix[keep], k=10)
+        if not np.allclose(compact_scores, rebuilt_scores, atol=1e-6):
+            print(f"❌ Compacted neighbour index differs from a rebuild")
+            return False
+        
+        print(f"✅ Incremental neighbour index updates match a rebuild")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Similarity index test failed: {str(e)}")
+        return False
+
+def test_title_index():
+    """Test trigram title matching against the difflib scan it replaces"""
+    print("\n🔤 Testing Title Index...")
+    print("=" * 50)
+    
+    try:
+        import difflib
+        from title_index import TrigramIndex
+        
+        titles = ['dangal', 'baahubali', '3 idiots', 'pk', 'kgf chapter 2', 'rrr', 'andhadhun', 'piku']
+        index = TrigramIndex(titles)
+        
+        for query in ['dangl', 'bahubali', '3 idiot', 'kgf', 'pk 2', 'andhadun', 'piku story', 'zzzz']:
+            close = difflib.get_close_matches(query, titles, n=1, cutoff=0.6)
+            expected = close[0] if close else next((t for t in titles if query in t or t in query), None)
+            
+            key_id = index.close_match(query, cutoff=0.6)
+            if key_id is None:
+                key_id = index.find_substring(query)
+            found = titles[key_id] if key_id is not None else None
+            
+            if found != expected:
+                print(f"❌ '{query}' matched {found}, expected {expected}")
+                return False
+        
+        print(f"✅ Trigram index matches difflib for {len(titles)} titles")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Title index test failed: {str(e)}")
+        return False
+
+def test_model_registry():
+    """Test background rebuilds, the atomic swap and file-change detection of the model registry"""
+    print("\n🔄 Testing Model Registry...")
+    print("=" * 50)
+    
+    try:
+        import gc
+        import tempfile
+        import time
+        from model_registry import ModelRegistry
+        
+        class Engine:
+            built = 0
+            
+            def __init__(self):
+                Engine.built += 1
+                self.generation = Engine.built
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset_path = os.path.join(tmp_dir, 'movies.csv')
+            with open(dataset_path, 'w') as f:
+                f.write('title\n')
+            
+            registry = ModelRegistry(Engine, watch_paths=[dataset_path], poll_interval=0.05)
+            in_flight = registry.current
+            
+            registry.reload(wait=True)
+            if registry.version != 2 or registry.current.generation != 2 or in_flight.generation != 1:
+                print(f"❌ Reload did not swap in a new engine")
+                return False
+            
+            del in_flight
+            gc.collect()
+            if registry.released_engines != 1:
+                print(f"❌ Old engine was not released after its last request finished")
+                return False
+            
+            with open(dataset_path, 'a') as f:
+                f.write('Dangal\n')
+            deadline = time.time() + 5
+            while registry.version < 3 and time.time() < deadline:
+                time.sleep(0.05)
+            registry.close()
+            if registry.version != 3:
+                print(f"❌ Dataset change did not trigger a rebuild")
+                return False
+        
+        print(f"✅ Rebuilds swap in new engines and release old ones")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Model registry test failed: {str(e)}")
+        return False
+
+def test_model_bundle():
+    """Test that model bundles round-trip, back-to-back saves get their own versions and a newer dataset wins"""
+    print("\n📦 Testing Model Bundle...")
+    print("=" * 50)
+    
+    try:
+        import tempfile
+        import numpy as np
+        from benchmark import write_synthetic_catalog
+        from model_store import CURRENT_POINTER, bundle_is_current, current_version_dir
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset_path = os.path.join(tmp_dir, 'movies.csv')
+            write_synthetic_catalog(dataset_path, 300, np.random.default_rng(7))
+            bundle_dir = os.path.join(tmp_dir, 'bundle')
+            
+            engine = MovieRecommendationEngine(dataset_path=dataset_path, num_neighbors=10)
+            
+            # Two saves within the same second, like a background refit right after a build
+            first = engine.save_bundle(bundle_dir)
+            second = engine.save_bundle(bundle_dir)
+            if first == second or current_version_dir(bundle_dir) != second:
+                print(f"❌ Second save did not write and point CURRENT at a new version")
+                return False
+            
+            # A dataset edited after the build must not be shadowed by the bundle
+            pointer = os.path.join(bundle_dir, CURRENT_POINTER)
+            os.utime(dataset_path, (os.path.getmtime(pointer) + 1,) * 2)
+            if bundle_is_current(bundle_dir, dataset_path):
+                print(f"❌ Bundle older than the dataset is still used")
+                return False
+            os.utime(pointer, (os.path.getmtime(dataset_path) + 1,) * 2)
+            if not bundle_is_current(bundle_dir, dataset_path):
+                print(f"❌ Bundle newer than the dataset is not used")
+                return False
+            
+            loaded = MovieRecommendationEngine(bundle_dir=bundle_dir, num_neighbors=10)
+            if len(loaded.df) != len(engine.df) or not np.array_equal(loaded.neighbor_indices, engine.neighbor_indices):
+                print(f"❌ Loaded bundle differs from the saved engine")
+                return False
+            
+            # Lookup indexes are unpickled from the bundle rather than rebuilt
+            title = engine.df['title'].iloc[5]
+            if (loaded.find_movie_match(title.lower()) != engine.find_movie_match(title.lower())
+                    or [record.to_dict() for record in loaded.records] != [record.to_dict() for record in engine.records]):
+                print(f"❌ Loaded lookup indexes differ from the saved engine")
+                return False
+            
+            # An LSH bundle has no neighbour index, so its backend wins over the configured one
+            lsh_engine = MovieRecommendationEngine(dataset_path=dataset_path, similarity_backend='lsh')
+            lsh_engine.save_bundle(bundle_dir)
+            loaded = MovieRecommendationEngine(bundle_dir=bundle_dir, similarity_backend='exact')
+            if loaded.similarity_backend != 'lsh' or loaded.ann_index is None:
+                print(f"❌ Loaded bundle did not keep the LSH backend it was built with")
+                return False
+        
+        print(f"✅ Bundles round-trip with their lookup indexes and backend, and consecutive saves get distinct versions")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Model bundle test failed: {str(e)}")
+        return False
+
+def test_batch_recommendations():
+    """Test that batch recommendations match one single-title call per seed"""
+    print("\n📚 Testing Batch Recommendations...")
+    print("=" * 50)
+    
+    try:
+        import tempfile
+        import numpy as np
+        from benchmark import write_synthetic_catalog
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset_path = os.path.join(tmp_dir, 'movies.csv')
+            write_synthetic_catalog(dataset_path, 300, np.random.default_rng(11))
+            engine = MovieRecommendationEngine(dataset_path=dataset_path, num_neighbors=10)
+        
+        # Exact, duplicate, lower-cased, partial and unknown seeds
+        titles = engine.df['title'].tolist()
+        seeds = [titles[0], titles[1], titles[0], titles[2].lower(), titles[3][:-1], 'Zzzz Qqqq']
+        
+        # Within the precomputed neighbours and beyond them (scored with one matrix product)
+        for num_recommendations in (5, 20):
+            batch = engine.get_recommendations_batch(seeds, num_recommendations, fetch_posters=False)
+            if [result['input_movie'] for result in batch] != seeds or batch[-1]['matched_title'] is not None:
+                print(f"❌ Batch results are not one per input title in order")
+                return False
+            for movie, result in zip(seeds, batch):
+                single = engine.get_movie_recommendations(movie, num_recommendations, fetch_posters=False)
+                if result['recommendations'] != single:
+                    print(f"❌ Batch result differs for '{movie}' with {num_recommendations} recommendations")
+                    return False
+        
+        # A negative count must not slice the neighbour rows from the end
+        if engine.get_similar_movies(0, -1) or any(len(row) for row in engine.get_similar_movies_batch(np.array([0, 1]), -1)[0]):
+            print(f"❌ Negative num_recommendations returned movies")
+            return False
+        
+        print(f"✅ {len(seeds)} seeds match single recommendations")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Batch recommendations test failed: {str(e)}")
+        return False
+
+def test_profile_recommendations():
+    """Test that taste-profile recommendations exclude the seeds and rank by the liked centroid"""
+    print("\n💞 Testing Taste Profile...")
+    print("=" * 50)
+    
+    try:
+        import tempfile
+        import numpy as np
+        from benchmark import write_synthetic_catalog
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset_path = os.path.join(tmp_dir, 'movies.csv')
+            write_synthetic_catalog(dataset_path, 300, np.random.default_rng(13))
+            engine = MovieRecommendationEngine(dataset_path=dataset_path, num_neighbors=10)
+        
+        titles = engine.df['title'].tolist()
+        profile = engine.get_profile_recommendations(titles[:3], titles[3:4], 5, fetch_posters=False)
+        recommended = [movie['title'] for movie in profile['recommendations']]
+        if len(recommended) != 5 or set(recommended) & set(profile['liked'] + profile['disliked']):
+            print(f"❌ Profile recommendations missing or include a seed movie")
+            return False
+        
+        # Score the catalog against the Rocchio centroid independently of the engine
+        vectors = engine.tfidf_matrix.toarray()
+        centroid = vectors[:3].mean(axis=0) - 0.5 * vectors[3]
+        scores = vectors @ centroid
+        candidates = np.delete(scores, [0, 1, 2, 3])
+        top = scores[engine.movie_indices[recommended[0].lower()]]
+        if top < candidates.max() - 1e-6 or top <= np.median(candidates):
+            print(f"❌ Top recommendation is not the closest movie to the liked centroid")
+            return False
+        
+        ranked = [scores[engine.movie_indices[title.lower()]] for title in recommended]
+        if any(later > earlier + 1e-6 for earlier, later in zip(ranked, ranked[1:])):
+            print(f"❌ Profile recommendations are not ranked by centroid similarity")
+            return False
+        
+        print(f"✅ {len(recommended)} recommendations for liked {profile['liked']}")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Taste profile test failed: {str(e)}")
+        return False
+
+def test_movie_records():
+    """Test that the movie records match the catalog frame after loading, adding and removing movies"""
+    print("\n🗂️  Testing Movie Records...")
+    print("=" * 50)
+    
+    try:
+        import tempfile
+        import numpy as np
+        from benchmark import synthetic_catalog, write_synthetic_catalog
+        
+        rng = np.random.default_rng(17)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset_path = os.path.join(tmp_dir, 'movies.csv')
+            write_synthetic_catalog(dataset_path, 300, rng)
+            engine = MovieRecommendationEngine(dataset_path=dataset_path, num_neighbors=10)
+        
+        def records_match(stage):
+            expected = engine.df.to_dict('records')
+            if len(engine.records) != len(expected):
+                print(f"❌ {len(engine.records)} records for {len(expected)} movies after {stage}")
+                return False
+            for idx, movie in enumerate(expected):
+                record = engine.records[idx].to_dict()
+                if record != {field: movie[field] for field in record}:
+                    print(f"❌ Record {idx} differs from the catalog row after {stage}")
+                    return False
+            return True
+        
+        if not records_match('loading'):
+            return False
+        
+        new_movies = synthetic_catalog(5, rng)
+        new_movies['title'] = [f'Added Movie {i}' for i in range(5)]
+        engine.add_movies(new_movies.to_dict('records'))
+        if not records_match('add_movies') or engine.records[-1].title != 'Added Movie 4':
+            return False
+        
+        removed = engine.df['title'].iloc[[0, 150, 302]].tolist()
+        engine.remove_movies(removed)
+        if not records_match('remove_movies') or {record.title for record in engine.records} & set(removed):
+            return False
+        
+        print(f"✅ {len(engine.records)} records match the catalog after adding and removing movies")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Movie records test failed: {str(e)}")
+        return False
+
+def test_lsh_recall():
+    """Test that the LSH backend with its default settings keeps a recall floor against exact top-N"""
+    print("\n🪣 Testing LSH Recall...")
+    print("=" * 50)
+    
+    try:
+        import tempfile
+        import numpy as np
+        from ann_index import LSHIndex
+        from benchmark import clustered_tfidf, write_synthetic_catalog
+        from similarity_index import similarity_block, top_n_indices
+        
+        def recall(query, vectors, queries):
+            """Share of the returned movies scoring at least the exact 10th best (ties count)"""
+            hits = 0
+            for idx in queries:
+                scores = similarity_block(vectors, [idx]).ravel()
+                threshold = scores[top_n_indices(scores, 10, exclude=idx)[-1]]
+                hits += sum(score >= threshold - 1e-6 for score in query(idx))
+            return hits / (10 * len(queries))
+        
+        # The engine's LSH backend keeps no neighbour index, so every query goes through the LSH tables
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset_path = os.path.join(tmp_dir, 'movies.csv')
+            write_synthetic_catalog(dataset_path, 2000, np.random.default_rng(17))
+            engine = MovieRecommendationEngine(dataset_path=dataset_path, similarity_backend='lsh')
+        
+        queries = np.random.default_rng(0).choice(len(engine.df), 100, replace=False)
+        engine_recall = recall(lambda idx: [score for _, score in engine.get_similar_movies(int(idx), 10)],
+                               engine.item_vectors, queries)
+        if engine.neighbor_indices.shape[1] != 0 or engine_recall < 0.9:
+            print(f"❌ LSH backend recall@10 is {engine_recall:.3f}")
+            return False
+        
+        # Small catalogs get one or two bits, so also check a size where the default tables prune
+        rng = np.random.default_rng(5)
+        matrix = clustered_tfidf(100_000, rng)
+        ann_index = LSHIndex(matrix)
+        queries = rng.choice(matrix.shape[0], 100, replace=False)
+        probed = np.mean([len(ann_index.candidates(matrix[idx])) for idx in queries]) / matrix.shape[0]
+        index_recall = recall(lambda idx: ann_index.query(matrix[idx], 10, exclude=idx)[1], matrix, queries)
+        if probed > 0.75 or index_recall < 0.85:
+            print(f"❌ Default LSH settings scored {probed:.0%} of the catalog for recall@10 {index_recall:.3f}")
+            return False
+        
+        print(f"✅ LSH recall@10: {engine_recall:.3f} through the engine, {index_recall:.3f} "
+              f"at 100,000 movies scoring {probed:.0%} of them")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ LSH recall test failed: {str(e)}")
+        return False
+
+def test_response_cache():
+    """Test hits, request coalescing and version invalidation of the response cache"""
+    print("\n🗃️  Testing Response Cache...")
+    print("=" * 50)
+    
+    try:
+        import threading
+        from response_cache import ResponseCache
+        
+        cache = ResponseCache(maxsize=8)
+        calls = []
+        release = threading.Event()
+        
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return ['Baahubali', 'RRR']
+        
+        # Identical concurrent misses wait for the first one instead of computing again
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute(1, ('Dangal', 5), compute)))
+                   for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        while cache.misses + cache.coalesced < len(threads):
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        if len(calls) != 1 or cache.coalesced != 5 or results != [['Baahubali', 'RRR']] * 6:
+            print(f"❌ Concurrent misses were computed {len(calls)} times")
+            return False
+        
+        cache.get_or_compute(1, ('Dangal', 5), compute)
+        if cache.hits != 1 or len(calls) != 1:
+            print(f"❌ Cached result was not served")
+            return False
+        
+        cache.get_or_compute(2, ('Dangal', 5), compute)
+        if len(calls) != 2 or cache.invalidations != 1:
+            print(f"❌ A new model version did not invalidate the cache")
+            return False
+        
+        # A request still on the old model during a hot swap bypasses the cache instead of rolling it back
+        cache.get_or_compute(1, ('Dangal', 5), compute)
+        cache.get_or_compute(2, ('Dangal', 5), compute)
+        if len(calls) != 3 or cache.stale != 1 or cache.invalidations != 1 or cache.hits != 2:
+            print(f"❌ A stale model version invalidated the cache")
+            return False
+        
+        print(f"✅ Response cache stats: {cache.stats()}")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Response cache test failed: {str(e)}")
+        return False
+
+def test_omdb_single_flight():
+    """Test that concurrent OMDb lookups of the same title send one request, and async lookups read disk off the loop"""
+    print("\n🎞️  Testing OMDb Single-Flight...")
+    print("=" * 50)
+    
+    try:
+        import tempfile
+        import asyncio
+        import threading
+        from poster_cache import TwoTierCache, lookup_omdb_metadata, lookup_omdb_metadata_async, omdb_flight_stats
+        
+        requests_sent = []
+        
+        class Response:
+            status_code = 200
+            
+            def json(self):
+                return {'Response': 'True', 'Title': 'Dangal', 'Poster': 'https://example.com/dangal.jpg'}
+        
+        class Session:
+            def get(self, *args, **kwargs):
+                requests_sent.append(kwargs['params'])
+                time.sleep(0.2)
+                return Response()
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = TwoTierCache(os.path.join(tmp_dir, 'omdb.sqlite3'))
+            suppressed = omdb_flight_stats()['suppressed']
+            
+            results = []
+            titles = ['Dangal', 'dangal', 'Dangal!'] * 3
+            threads = [threading.Thread(target=lambda title=title: results.append(
+                lookup_omdb_metadata(title, 'key', session=Session(), cache=cache))) for title in titles]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            # A new process finds the answer on disk; async lookups read SQLite off the event loop
+            cache = TwoTierCache(os.path.join(tmp_dir, 'omdb.sqlite3'))
+            disk_get, disk_threads = cache.disk.get, []
+            cache.disk.get = lambda key: disk_threads.append(threading.current_thread()) or disk_get(key)
+            metadata = asyncio.run(lookup_omdb_metadata_async('Dangal', None, None, cache=cache))
+            if metadata is None or threading.main_thread() in disk_threads:
+                print(f"❌ Async lookup read the disk cache on the event loop thread")
+                return False
+        
+        if len(requests_sent) != 1 or any(result['Poster'] != 'https://example.com/dangal.jpg' for result in results):
+            print(f"❌ {len(requests_sent)} OMDb requests sent for one title")
+            return False
+        if {**requests_sent[0], 't': 'Dangal'} != {'t': 'Dangal', 'type': 'movie', 'apikey': 'key'}:
+            print(f"❌ Unexpected OMDb request parameters {requests_sent[0]}")
+            return False
+        if omdb_flight_stats()['suppressed'] - suppressed != len(titles) - 1:
+            print(f"❌ Suppressed duplicate lookups were not counted")
+            return False
+        
+        print(f"✅ {len(titles)} concurrent lookups sent 1 request: {omdb_flight_stats()}")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ OMDb single-flight test failed: {str(e)}")
+        return False
+
+def test_poster_prefetch():
+    """Test that the poster prefetch fills the cache, rate limits and resumes failed lookups"""
+    print("\n🖼️  Testing Poster Prefetch...")
+    print("=" * 50)
+    
+    try:
+        import tempfile
+        from poster_cache import TwoTierCache, omdb_cache_key
+        from poster_prefetch import prefetch_posters
+        
+        requests_sent = []
+        offline = {'Lagaan'}
+        
+        class Response:
+            status_code = 200
+            
+            def __init__(self, title):
+                self.title = title
+            
+            def json(self):
+                if self.title == 'Unknown Movie':
+                    return {'Response': 'False'}
+                return {'Response': 'True', 'Title': self.title, 'Poster': f'https://example.com/{self.title}.jpg'}
+        
+        class Session:
+            def get(self, url, params, timeout):
+                requests_sent.append(params['t'])
+                if params['t'] in offline:
+                    raise requests.ConnectionError('offline')
+                return Response(params['t'])
+        
+        entries = [('Dangal', None), ('Lagaan', None), ('Unknown Movie', None), ('Dangal', 2016)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = TwoTierCache(os.path.join(tmp_dir, 'omdb.sqlite3'))
+            checkpoint_path = os.path.join(tmp_dir, 'prefetch.json')
+            
+            start = time.perf_counter()
+            counts = prefetch_posters(entries, 'key', max_workers=2, rate_limit=20,
+                                      checkpoint_path=checkpoint_path, cache=cache, session=Session())
+            if counts != {'fetched': 2, 'not_found': 1, 'failed': 1, 'skipped': 0}:
+                print(f"❌ Unexpected prefetch counts {counts}")
+                return False
+            if time.perf_counter() - start < 3 / 20 or not os.path.exists(checkpoint_path):
+                print(f"❌ Requests were not rate limited or no checkpoint was kept for the failure")
+                return False
+            
+            # The second run only retries the lookup that failed
+            offline.clear()
+            requests_sent.clear()
+            counts = prefetch_posters(entries, 'key', checkpoint_path=checkpoint_path, cache=cache, session=Session())
+            if requests_sent != ['Lagaan'] or counts['skipped'] != 3 or os.path.exists(checkpoint_path):
+                print(f"❌ Resumed run sent {requests_sent}")
+                return False
+            if not cache.disk.get(omdb_cache_key('Lagaan'))[0]:
+                print(f"❌ Prefetched poster missing from the persistent cache")
+                return False
+        
+        print(f"✅ Prefetch filled the persistent cache and resumed the failed lookup")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Poster prefetch test failed: {str(e)}")
+        return False
+
+def test_generated_catalog():
+    """Test that the generated movie database is built lazily and deterministically"""
+    print("\n🎲 Testing Generated Catalog...")
+    print("=" * 50)
+    
+    try:
+        import subprocess
+        
+        # Importing must not generate (or print) anything, nor load numpy for the search index
+        script = "import sys, movie_database_generator as m; print(m._catalog is None and 'numpy' not in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', script],
+                                capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        if output.strip() != 'True':
+            print(f"❌ Import generated the catalog: {output!r}")
+            return False
+        
+        import movie_database_generator
+        from movie_database_generator import generate_comprehensive_database, get_movies_by_genre
+        
+        catalog = movie_database_generator.COMPREHENSIVE_MOVIE_DATABASE
+        if catalog != generate_comprehensive_database() or get_movies_by_genre('Drama', 3) != movie_database_generator.GENRE_INDEX['Drama'][:3]:
+            print(f"❌ Generated catalog is not deterministic")
+            return False
+        
+        print(f"✅ {len(catalog)} movies generated on first use from a fixed seed")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Generated catalog test failed: {str(e)}")
+        return False
+
+def test_search_index():
+    """Test AND/OR, prefix matching, field boosts and ranking of the movie search index"""
+    print("\n🔎 Testing Search Index...")
+    print("=" * 50)
+    
+    try:
+        from search_index import SearchIndex
+        
+        movies = [
+            {'title': 'Dangal 2', 'genre': 'Drama', 'language': 'Hindi', 'cast': 'Aamir Khan', 'director': 'Nitesh Tiwari'},
+            {'title': 'PK', 'genre': 'Comedy', 'language': 'Hindi', 'cast': 'Aamir Khan', 'director': 'Rajkumar Hirani'},
+            {'title': 'Khan Market', 'genre': 'Drama', 'language': 'Hindi', 'cast': 'Nobody', 'director': 'Someone'},
+            {'title': 'Dangal', 'genre': 'Drama', 'language': 'Hindi', 'cast': 'Aamir Khan', 'director': 'Nitesh Tiwari'},
+            {'title': 'Kaithi', 'genre': 'Action', 'language': 'Tamil', 'cast': 'Karthi', 'director': 'Lokesh Kanagaraj'},
+        ]
+        index = SearchIndex(movies, scores=[7.0, 8.0, 6.0, 8.5, 9.0])
+        
+        checks = {
+            # Title hits rank above cast hits; otherwise the higher rating wins, not the lower id
+            'khan': index.search_ids('khan') == [2, 3, 1, 0],
+            'dangal': index.search_ids('Dangal') == [3, 0],
+            'and': index.search_ids('aamir comedy') == [1],
+            'or': index.search_ids('tamil comedy', mode='or') == [4, 1],
+            'prefix': index.search_ids('kai') == [4] and index.search_ids('kai', prefix=False) == [],
+            'limit': index.search_ids('hindi', limit=2) == [3, 1],
+            'miss': index.search_ids('xyzzy') == [] and index.search_ids('aamir xyzzy') == [],
+        }
+        failed = [name for name, passed in checks.items() if not passed]
+        if failed:
+            print(f"❌ Search checks failed: {failed}")
+            return False
+        
+        from movie_database_generator import search_movies
+        results = search_movies('aamir khan drama', limit=5)
+        if not results or any(movie['genre'] != 'Drama' or 'Aamir Khan' not in movie['cast'] for movie in results):
+            print(f"❌ Generated catalog search returned non-matching movies")
+            return False
+        
+        print(f"✅ Inverted index search ranks by field boost and rating ({len(checks)} checks)")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Search index test failed: {str(e)}")
+        return False
+
+def test_poster_lookup():
+    """Test the normalized curated poster table and the non-blocking cached poster lookup"""
+    print("\n🎨 Testing Poster Lookup...")
+    print("=" * 50)
+    
+    try:
+        import tempfile
+        from movie_posters import build_poster_index, find_poster_url
+        from poster_cache import TwoTierCache, omdb_cache_key
+        from poster_service import PosterService
+        
+        if not find_poster_url('Uri: The Surgical Strike') or find_poster_url('uri the surgical strike') != find_poster_url('Uri: The Surgical Strike'):
+            print(f"❌ Curated lookup is not case/punctuation insensitive")
+            return False
+        
+        index = build_poster_index({'Don (1978)': 'old.jpg', 'Don (2006)': 'new.jpg', 'Kahaani': 'kahaani.jpg'})
+        if index['don'] != {1978: 'old.jpg', 2006: 'new.jpg'} or index['kahaani'] != {None: 'kahaani.jpg'}:
+            print(f"❌ Unexpected poster index {index}")
+            return False
+        
+        requests_sent = []
+        
+        class Response:
+            status_code = 200
+            
+            def json(self):
+                return {'Response': 'True', 'Title': 'Lagaan', 'Poster': 'https://example.com/lagaan.jpg'}
+        
+        class Session:
+            def get(self, url, params, timeout):
+                requests_sent.append((params['t'], params.get('y')))
+                return Response()
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = TwoTierCache(os.path.join(tmp_dir, 'omdb.sqlite3'))
+            service = PosterService('key', max_workers=1, cache=cache)
+            service.session = Session()
+            
+            # A miss returns at once and fills the cache in the background
+            if service.cached_poster('Lagaan', 2001) is not None:
+                print(f"❌ Uncached poster did not fall back to None")
+                return False
+            service.executor.shutdown(wait=True)
+            if requests_sent != [('Lagaan', 2001)] or not cache.get(omdb_cache_key('Lagaan', 2001))[0]:
+                print(f"❌ Background lookup sent {requests_sent}")
+                return False
+            if service.cached_poster('lagaan', 2001) != 'https://example.com/lagaan.jpg':
+                print(f"❌ Cached poster not served")
+                return False
+        
+        print(f"✅ Curated and cached posters resolved without blocking")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Poster lookup test failed: {str(e)}")
+        return False
+
+def test_catalog_ingest():
+    """Test chunked CSV loading, two-pass TF-IDF fitting and columnar catalogs against the whole-file path"""
+    print("\n📥 Testing Chunked Ingestion...")
+    print("=" * 50)
+    
+    try:
+        import tempfile
+        import numpy as np
+        import pandas as pd
+        from catalog_ingest import fit_tfidf_chunked, read_catalog
+        from movie_recommender import MovieRecommendationEngine
+        
+        rows = [
+            ('Dangal', 'Hindi', 'Biography,Drama,Sports', 'Nitesh Tiwari', 'Aamir Khan,Sakshi Tanwar', 'wrestling father daughters', 2016, 8.4),
+            ('Baahubali', 'Telugu', 'Action,Drama', 'S.S. Rajamouli', 'Prabhas,Rana Daggubati', 'kingdom epic war', 2015, 8.0),
+            ('3 Idiots', 'Hindi', 'Comedy,Drama', 'Rajkumar Hirani', 'Aamir Khan,R. Madhavan', 'college friendship', 2009, 8.4),
+            ('Drishyam', 'Malayalam', 'Crime,Drama,Thriller', 'Jeethu Joseph', 'Mohanlal,Meena', 'family police cover up', 2013, 8.3),
+            ('KGF Chapter 1', None, 'Action,Crime', 'Prashanth Neel', 'Yash,Srinidhi Shetty', 'gold mines mafia', 2018, 8.2),
+            ('RRR', 'Telugu', 'Action,Drama', 'S.S. Rajamouli', None, 'friendship revolution war', 2022, 7.8),
+            ('PK', 'Hindi', 'Comedy,Drama', 'Rajkumar Hirani', 'Aamir Khan,Anushka Sharma', 'alien religion satire', 2014, 8.1),
+        ]
+        columns = ['title', 'language', 'genres', 'director', 'main_actors', 'keywords', 'year', 'rating']
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset_path = os.path.join(tmp_dir, 'movies.csv')
+            pd.DataFrame(rows, columns=columns).to_csv(dataset_path, index=False)
+            
+            expected = MovieRecommendationEngine.prepare_catalog(pd.read_csv(dataset_path))
+            catalog = read_catalog(dataset_path, MovieRecommendationEngine.prepare_catalog, chunk_size=3)
+        
+        if not catalog.astype(str).equals(expected.astype(str)) or catalog['language'].dtype != 'category':
+            print(f"❌ Chunked catalog differs from the whole-file catalog")
+            return False
+        
+        # Small limits so that min_df, max_df and max_features all prune terms
+        whole = MovieRecommendationEngine.create_vectorizer().set_params(max_features=12, max_df=0.5)
+        chunked = MovieRecommendationEngine.create_vectorizer().set_params(max_features=12, max_df=0.5)
+        expected_matrix = whole.fit_transform(expected['combined_features'])
+        matrix = fit_tfidf_chunked(chunked, catalog['combined_features'], chunk_size=2)
+        
+        if whole.vocabulary_ != chunked.vocabulary_ or not np.allclose(whole.idf_, chunked.idf_):
+            print(f"❌ Two-pass vocabulary differs from TfidfVectorizer.fit")
+            return False
+        if abs(matrix - expected_matrix).max() > 1e-12:
+            print(f"❌ Chunked TF-IDF matrix differs from fit_transform")
+            return False
+        
+        print(f"✅ Chunked ingestion matches the whole-file path ({len(chunked.vocabulary_)} terms)")
+        
+        # Columnar catalogs hold the same data, categoricals for the dictionary-encoded columns
+        import importlib.util
+        if importlib.util.find_spec('pyarrow') is None:
+            print(f"⏭️  pyarrow not installed, skipped Parquet/Arrow catalogs")
+            return True
+        
+        from catalog_store import convert_catalog, load_catalog
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset_path = os.path.join(tmp_dir, 'movies.csv')
+            pd.DataFrame(rows, columns=columns).to_csv(dataset_path, index=False)
+            
+            for extension in ('parquet', 'arrow'):
+                catalog_path = os.path.join(tmp_dir, f'movies.{extension}')
+                convert_catalog(dataset_path, catalog_path)
+                columnar = MovieRecommendationEngine.prepare_catalog(load_catalog(catalog_path))
+                
+                if not columnar.astype(str).equals(expected.astype(str)) or columnar['director'].dtype != 'category':
+                    print(f"❌ {extension} catalog differs from the CSV catalog")
+                    return False
+                if load_catalog(catalog_path, ['title', 'unknown']).columns.tolist() != ['title']:
+                    print(f"❌ {extension} projection loaded unrequested columns")
+                    return False
+        
+        print(f"✅ Parquet and Arrow catalogs match the CSV catalog")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Chunked ingestion test failed: {str(e)}")
+        return False
+
 def test_flask_api():
     """Test Flask API endpoints"""
     print("\n🌐 Testing Flask API...")
@@ -238,6 +1055,66 @@ def main():
     if not test_file_structure():
         all_tests_passed = False
     
+    # Test similarity index
+    if not test_similarity_index():
+        all_tests_passed = False
+    
+    # Test title index
+    if not test_title_index():
+        all_tests_passed = False
+    
+    # Test chunked ingestion
+    if not test_catalog_ingest():
+        all_tests_passed = False
+    
+    # Test model registry
+    if not test_model_registry():
+        all_tests_passed = False
+    
+    # Test model bundle
+    if not test_model_bundle():
+        all_tests_passed = False
+    
+    # Test batch recommendations
+    if not test_batch_recommendations():
+        all_tests_passed = False
+    
+    # Test taste-profile recommendations
+    if not test_profile_recommendations():
+        all_tests_passed = False
+    
+    # Test movie records
+    if not test_movie_records():
+        all_tests_passed = False
+    
+    # Test LSH recall
+    if not test_lsh_recall():
+        all_tests_passed = False
+    
+    # Test response cache
+    if not test_response_cache():
+        all_tests_passed = False
+    
+    # Test OMDb single-flight
+    if not test_omdb_single_flight():
+        all_tests_passed = False
+    
+    # Test poster prefetch
+    if not test_poster_prefetch():
+        all_tests_passed = False
+    
+    # Test generated catalog
+    if not test_generated_catalog():
+        all_tests_passed = False
+    
+    # Test search index
+    if not test_search_index():
+        all_tests_passed = False
+    
+    # Test poster lookup
+    if not test_poster_lookup():
+        all_tests_passed = False
+    
     # Test recommendation engine
     if not test_recommendation_engine():
         all_tests_passed = False
@@ -0,0 +1,130 @@
+"""
+Title Search Indexes
+Character-trigram inverted index used to resolve misspelled and partial movie titles
+without scanning the whole catalog on every request
+"""
+
+import difflib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+# Padding characters that never occur in titles, so word starts and ends get their own trigrams
+START_PAD = '\x02\x02'
+END_PAD = '\x03'
+
+def trigrams(text: str) -> Set[str]:
+    """Distinct character trigrams of a string (no padding)"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def padded_trigrams(text: str) -> Set[str]:
+    """Distinct character trigrams of a string padded at both ends"""
+    return trigrams(START_PAD + text + END_PAD)
+
+class TrigramIndex:
+    """
+    Inverted index from character trigrams to the keys containing them
+    
+    Keys are expected to be normalized already (e.g. lower-cased titles).
+    Postings lists hold key ids in insertion order, so the first match of a
+    scan over the keys is the match with the smallest id.
+    """
+    
+    def __init__(self, keys: Iterable[str] = ()):
+        self.keys: List[str] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.inner_counts: List[int] = []
+        self.short_keys: List[int] = []
+        
+        for key in keys:
+            self.add(key)
+    
+    def add(self, key: str) -> int:
+        """Index a new key and return its id"""
+        key_id = len(self.keys)
+        self.keys.append(key)
+        
+        for gram in padded_trigrams(key):
+            self.postings.setdefault(gram, []).append(key_id)
+        
+        inner = trigrams(key)
+        self.inner_counts.append(len(inner))
+        if not inner:
+            self.short_keys.append(key_id)
+        
+        return key_id
+    
+    def find_containing(self, query: str) -> Optional[int]:
+        """Return the first key id whose key contains the query as a substring"""
+        grams = trigrams(query)
+        if not grams:
+            # Queries shorter than a trigram cannot use the index
+            return next((i for i, key in enumerate(self.keys) if query in key), None)
+        
+        postings = sorted((self.postings.get(gram, []) for gram in grams), key=len)
+        if not postings[0]:
+            return None
+        
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return None
+        
+        return next((i for i in sorted(candidates) if query in self.keys[i]), None)
+    
+    def find_contained(self, query: str) -> Optional[int]:
+        """Return the first key id whose key is a substring of the query"""
+        matches = [i for i in self.short_keys if self.keys[i] in query]
+        
+        # A key can only be inside the query if every one of its trigrams is
+        shared = Counter()
+        for gram in trigrams(query):
+            shared.update(self.postings.get(gram, ()))
+        matches.extend(
+            i for i, count in shared.items()
+            if count == self.inner_counts[i] and self.keys[i] in query
+        )
+        
+        return min(matches) if matches else None
+    
+    def find_substring(self, query: str) -> Optional[int]:
+        """Return the first key id that contains the query or is contained in it"""
+        matches = [i for i in (self.find_containing(query), self.find_contained(query)) if i is not None]
+        return min(matches) if matches else None
+    
+    def candidates(self, query: str, limit: int = 64) -> List[int]:
+        """Return up to limit key ids sharing the most trigrams with the query"""
+        shared = Counter()
+        for gram in padded_trigrams(query):
+            shared.update(self.postings.get(gram, ()))
+        return [key_id for key_id, _ in shared.most_common(limit)]
+    
+    def close_match(self, query: str, cutoff: float = 0.6, limit: int = 64) -> Optional[int]:
+        """
+        Return the key id most similar to the query, like difflib.get_close_matches(n=1)
+        
+        Only the trigram candidates are scored with SequenceMatcher, instead of every key.
+        
+        Args:
+            query: Normalized query string
+            cutoff: Minimum SequenceMatcher ratio for a match
+            limit: Maximum number of candidates to score
+        
+        Returns:
+            Best matching key id or None if no candidate reaches the cutoff
+        """
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        
+        best = None
+        for key_id in self.candidates(query, limit):
+            matcher.set_seq1(self.keys[key_id])
+            if (matcher.real_quick_ratio() >= cutoff and
+                    matcher.quick_ratio() >= cutoff and
+                    matcher.ratio() >= cutoff):
+                # Same tie-break as get_close_matches: higher ratio, then larger string
+                score = (matcher.ratio(), self.keys[key_id])
+                if best is None or score > best[0]:
+                    best = (score, key_id)
+        
+        return best[1] if best else None